@@ -92,6 +92,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'main.middleware.ServerTimingMiddleware',  # First, so it times the whole stack
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # Add WhiteNoise for static files
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -185,6 +186,17 @@ else:
         }
     }
 
+# Optional separate database for request logs and other telemetry tables.
+# When LOGS_DATABASE_URL is set, main.routers.TelemetryRouter sends RequestLog
+# reads, writes and migrations to the 'logs' alias
+# (run `python manage.py migrate --database logs` to create its tables).
+LOGS_DATABASE_URL = config('LOGS_DATABASE_URL', default='')
+if LOGS_DATABASE_URL:
+    DATABASES['logs'] = dj_database_url.parse(LOGS_DATABASE_URL)
+REQUEST_LOG_DATABASE = 'logs' if 'logs' in DATABASES else 'default'
+
+DATABASE_ROUTERS = ['main.routers.TelemetryRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -258,4 +270,152 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'main.tasks.send_daily_report',
         'schedule': 86400.0,  # 24 hours
     },
+    'rollup-request-logs': {
+        'task': 'main.tasks.rollup_request_logs_task',
+        'schedule': 60.0,  # every minute
+    },
 }
+
+# Request logging
+# When buffered, RequestLoggingMiddleware queues log rows in-process and writes
+# them with bulk_create once REQUEST_LOG_BATCH_SIZE rows are queued or
+# REQUEST_LOG_FLUSH_INTERVAL seconds have passed (and on worker shutdown).
+REQUEST_LOG_BUFFERED = config('REQUEST_LOG_BUFFERED', default=False, cast=bool)
+REQUEST_LOG_BATCH_SIZE = config('REQUEST_LOG_BATCH_SIZE', default=100, cast=int)
+REQUEST_LOG_FLUSH_INTERVAL = config('REQUEST_LOG_FLUSH_INTERVAL', default=5.0, cast=float)
+# Rollups only fold log rows older than REQUEST_LOG_ROLLUP_LAG seconds, so
+# rows whose flush has not committed yet are not skipped. Keep it well above
+# REQUEST_LOG_FLUSH_INTERVAL plus the slowest request.
+REQUEST_LOG_ROLLUP_LAG = config('REQUEST_LOG_ROLLUP_LAG', default=120, cast=int)
+
+# Request logging policy
+# Paths starting with an excluded prefix or matching an excluded regex are
+# never logged. Error responses (status >= 400) and requests slower than
+# REQUEST_LOG_SLOW_THRESHOLD_MS are always logged. Other requests are sampled
+# using REQUEST_LOG_SAMPLE_RATES, keyed by path prefix ('/api/') or URL name
+# ('main:cv_list'), and the rate is scaled down when traffic exceeds
+# REQUEST_LOG_ADAPTIVE_THRESHOLD requests per second (0 disables it).
+REQUEST_LOG_EXCLUDE_PATHS = ['/static/', '/health/', '/metrics/', '/favicon.ico']
+REQUEST_LOG_EXCLUDE_PATTERNS = []
+REQUEST_LOG_SAMPLE_RATES = {}
+REQUEST_LOG_DEFAULT_SAMPLE_RATE = config('REQUEST_LOG_DEFAULT_SAMPLE_RATE', default=1.0, cast=float)
+REQUEST_LOG_ALWAYS_LOG_ERRORS = True
+REQUEST_LOG_SLOW_THRESHOLD_MS = config('REQUEST_LOG_SLOW_THRESHOLD_MS', default=1000, cast=int)
+REQUEST_LOG_ADAPTIVE_THRESHOLD = config('REQUEST_LOG_ADAPTIVE_THRESHOLD', default=0, cast=float)
+
+# Time-partitioned request log storage
+# Set REQUEST_LOG_PARTITION_PERIOD to 'day' or 'week' to store request logs in
+# native PostgreSQL time partitions, maintained by
+# `python manage.py manage_log_partitions` and the maintain-log-partitions beat
+# task. Expired partitions are dropped whole. Other databases are not
+# supported; use purge_request_logs for retention there.
+REQUEST_LOG_PARTITION_PERIOD = config('REQUEST_LOG_PARTITION_PERIOD', default='')
+REQUEST_LOG_PARTITION_PREMAKE = config('REQUEST_LOG_PARTITION_PREMAKE', default=3, cast=int)
+REQUEST_LOG_PARTITION_RETAIN = config('REQUEST_LOG_PARTITION_RETAIN', default=30, cast=int)
+if REQUEST_LOG_PARTITION_PERIOD:
+    CELERY_BEAT_SCHEDULE['maintain-log-partitions'] = {
+        'task': 'main.tasks.maintain_log_partitions_task',
+        'schedule': 3600.0,  # hourly
+    }
+
+# In-process request metrics exposed on /metrics/ in Prometheus text format.
+# Set METRICS_MULTIPROCESS_DIR to a directory shared by all gunicorn workers
+# to aggregate their metrics; each worker writes its snapshot there at most
+# every METRICS_WRITE_INTERVAL seconds. railway_startup.py empties it before
+# starting gunicorn; other launchers must do the same, or counts from the
+# previous run are added to the new ones.
+METRICS_ENABLED = config('METRICS_ENABLED', default=True, cast=bool)
+METRICS_MULTIPROCESS_DIR = config('METRICS_MULTIPROCESS_DIR', default='')
+METRICS_WRITE_INTERVAL = config('METRICS_WRITE_INTERVAL', default=5.0, cast=float)
+
+# Request log retention (cleanup_old_logs_task and `manage.py purge_request_logs`)
+# Logs older than REQUEST_LOG_RETENTION_DAYS are deleted when it is set,
+# otherwise only the newest REQUEST_LOG_KEEP_LATEST rows are kept. Deleted
+# batches are first written to gzip JSON Lines files in REQUEST_LOG_ARCHIVE_DIR
+# when it is set.
+REQUEST_LOG_RETENTION_DAYS = config('REQUEST_LOG_RETENTION_DAYS', default=0, cast=int)
+REQUEST_LOG_KEEP_LATEST = config('REQUEST_LOG_KEEP_LATEST', default=1000, cast=int)
+REQUEST_LOG_PURGE_BATCH_SIZE = config('REQUEST_LOG_PURGE_BATCH_SIZE', default=5000, cast=int)
+REQUEST_LOG_ARCHIVE_DIR = config('REQUEST_LOG_ARCHIVE_DIR', default='')
+
+# Per-request instrumentation
+# Record the number of DB queries, DB time and template rendering time of each
+# request on its RequestLog row.
+REQUEST_INSTRUMENTATION_ENABLED = config('REQUEST_INSTRUMENTATION_ENABLED', default=True, cast=bool)
+
+# Slow-request profiling
+# When enabled, REQUEST_PROFILE_SAMPLE_RATE of the requests to
+# REQUEST_PROFILE_VIEWS (URL names; empty means every view) run under cProfile.
+# Profiles of requests slower than REQUEST_PROFILE_THRESHOLD_MS are stored as
+# RequestProfile rows and can be downloaded from the admin as pstats data or
+# collapsed stacks for flamegraphs.
+REQUEST_PROFILING_ENABLED = config('REQUEST_PROFILING_ENABLED', default=False, cast=bool)
+REQUEST_PROFILE_SAMPLE_RATE = config('REQUEST_PROFILE_SAMPLE_RATE', default=0.05, cast=float)
+REQUEST_PROFILE_THRESHOLD_MS = config('REQUEST_PROFILE_THRESHOLD_MS', default=500, cast=int)
+REQUEST_PROFILE_VIEWS = ['main:cv_pdf_download', 'main:translate_cv']
+
+# Server-Timing header and request tracing
+# SERVER_TIMING_ENABLED adds a Server-Timing header with middleware, view, db,
+# template, cache, external (OpenAI) and pdf phases to every response. It
+# exposes internal timings, so keep it off on public deployments unless needed.
+# REQUEST_TRACE_SAMPLE_RATE is the fraction of logged requests whose individual
+# spans are stored in RequestLog.trace.
+SERVER_TIMING_ENABLED = config('SERVER_TIMING_ENABLED', default=DEBUG, cast=bool)
+REQUEST_TRACE_SAMPLE_RATE = config('REQUEST_TRACE_SAMPLE_RATE', default=0.0, cast=float)
+
+# Rendered CV PDF cache
+# PDF_CACHE_BACKEND is 'filesystem' (files in PDF_CACHE_DIR), 'cache' (the
+# Django cache PDF_CACHE_ALIAS, entries kept for PDF_CACHE_TIMEOUT seconds) or
+# empty to render every download. Entries are keyed by CV id and updated_at,
+# so edits never serve a stale PDF.
+PDF_CACHE_BACKEND = config('PDF_CACHE_BACKEND', default='filesystem')
+PDF_CACHE_DIR = config('PDF_CACHE_DIR', default=str(BASE_DIR / 'pdf_cache'))
+PDF_CACHE_ALIAS = config('PDF_CACHE_ALIAS', default='default')
+PDF_CACHE_TIMEOUT = config('PDF_CACHE_TIMEOUT', default=7 * 24 * 3600, cast=int)
+# Rendered PDFs are spooled in memory up to this many bytes, then to a temp file
+PDF_SPOOL_MAX_SIZE = config('PDF_SPOOL_MAX_SIZE', default=1024 * 1024, cast=int)
+
+# Bulk PDF export (admin action and export_cv_pdfs command)
+# Number of render processes; 0 uses one per CPU core.
+PDF_BULK_WORKERS = config('PDF_BULK_WORKERS', default=0, cast=int)
+
+# Pre-render PDFs when a CV is saved
+# Every saved version queues a Celery job PDF_PRERENDER_DELAY seconds later;
+# jobs for versions that were saved over in the meantime do nothing, so a burst
+# of saves renders once. The job renders PDF_PRERENDER_LAYOUTS (empty means the
+# default layout) and warms the translations in PDF_PRERENDER_LANGUAGES.
+PDF_PRERENDER_ON_SAVE = config('PDF_PRERENDER_ON_SAVE', default=False, cast=bool)
+PDF_PRERENDER_DELAY = config('PDF_PRERENDER_DELAY', default=10, cast=int)
+PDF_PRERENDER_LAYOUTS = config('PDF_PRERENDER_LAYOUTS', default='',
+                               cast=lambda value: [item.strip() for item in value.split(',') if item.strip()])
+PDF_PRERENDER_LANGUAGES = config('PDF_PRERENDER_LANGUAGES', default='',
+                                 cast=lambda value: [item.strip() for item in value.split(',') if item.strip()])
+
+# CV translations
+# Translated sections are cached in TRANSLATION_CACHE_ALIAS under a hash of the
+# source text, language and model, for TRANSLATION_CACHE_TIMEOUT seconds (0
+# keeps them until evicted). Use a persistent cache such as Redis in production.
+OPENAI_TRANSLATION_MODEL = config('OPENAI_TRANSLATION_MODEL', default='gpt-3.5-turbo')
+TRANSLATION_CACHE_ALIAS = config('TRANSLATION_CACHE_ALIAS', default='default')
+TRANSLATION_CACHE_TIMEOUT = config('TRANSLATION_CACHE_TIMEOUT', default=0, cast=int) or None
+# Concurrent OpenAI requests when translating a CV into several languages
+TRANSLATION_MAX_CONCURRENCY = config('TRANSLATION_MAX_CONCURRENCY', default=8, cast=int)
+
+# Shared Django cache
+# Without CACHE_REDIS_URL every process has its own in-memory cache, so
+# cached translations and the single-flight entries of translation jobs are
+# not shared between web workers and Celery. Set it (e.g. to a Redis
+# database other than the Celery broker's) in production.
+CACHE_REDIS_URL = config('CACHE_REDIS_URL', default='')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+# Long sections are split at paragraph and sentence boundaries into requests
+# of about TRANSLATION_CHUNK_TOKENS input tokens, so translations fit in the
+# response limit. Failed requests are retried up to TRANSLATION_CHUNK_RETRIES times.
+TRANSLATION_CHUNK_TOKENS = config('TRANSLATION_CHUNK_TOKENS', default=500, cast=int)
+TRANSLATION_CHUNK_RETRIES = config('TRANSLATION_CHUNK_RETRIES', default=2, cast=int)
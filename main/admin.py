@@ -1,5 +1,9 @@
 from django.contrib import admin
-from .models import CV, RequestLog
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+from .models import CV, CVTranslation, RequestLog, RequestProfile
 
 
 @admin.register(CV)
@@ -9,6 +13,7 @@ class CVAdmin(admin.ModelAdmin):
     list_filter = ('created_at', 'updated_at')
     search_fields = ('firstname', 'lastname', 'skills', 'bio')
     readonly_fields = ('created_at', 'updated_at')
+    actions = ('download_pdfs',)
     fieldsets = (
         ('Personal Information', {
             'fields': ('firstname', 'lastname')
@@ -25,15 +30,37 @@ class CVAdmin(admin.ModelAdmin):
         }),
     )
 
+    @admin.action(description='Download selected CVs as PDFs (ZIP)')
+    def download_pdfs(self, request, queryset):
+        """Stream a ZIP of the selected CVs' PDFs, rendering them in parallel."""
+        from .pdf_bulk import iter_pdf_zip
+        response = StreamingHttpResponse(iter_pdf_zip(queryset.order_by('pk')), content_type='application/zip')
+        filename = f"cvs_{timezone.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+@admin.register(CVTranslation)
+class CVTranslationAdmin(admin.ModelAdmin):
+    """Admin configuration for CVTranslation model."""
+    list_display = ('cv', 'language', 'section', 'model', 'updated_at')
+    list_filter = ('language', 'section', 'model')
+    search_fields = ('cv__firstname', 'cv__lastname', 'translated_text')
+    readonly_fields = ('cv', 'language', 'section', 'source_hash', 'model', 'updated_at')
+    list_select_related = ('cv',)
+
 
 @admin.register(RequestLog)
 class RequestLogAdmin(admin.ModelAdmin):
     """Admin configuration for RequestLog model."""
-    list_display = ('method', 'path', 'response_status', 'response_time', 'timestamp', 'remote_ip', 'is_authenticated')
+    list_display = ('method', 'path', 'response_status', 'response_time', 'db_query_count', 'db_time', 'template_time', 'timestamp', 'remote_ip', 'is_authenticated')
     list_filter = ('method', 'response_status', 'is_authenticated', 'timestamp')
     search_fields = ('path', 'remote_ip', 'user_agent')
-    readonly_fields = ('timestamp', 'method', 'path', 'query_string', 'remote_ip', 'user_agent', 'response_status', 'response_time', 'user', 'is_authenticated')
+    readonly_fields = ('timestamp', 'method', 'path', 'query_string', 'remote_ip', 'user_agent', 'response_status', 'response_time', 'db_query_count', 'db_time', 'template_time', 'trace', 'user', 'is_authenticated')
     ordering = ('-timestamp',)
+    # Drill down by date so list queries carry a timestamp range
+    date_hierarchy = 'timestamp'
+    show_full_result_count = False
     
     fieldsets = (
         ('Request Information', {
@@ -42,6 +69,9 @@ class RequestLogAdmin(admin.ModelAdmin):
         ('Response Information', {
             'fields': ('response_status', 'response_time')
         }),
+        ('Timing Breakdown', {
+            'fields': ('db_query_count', 'db_time', 'template_time', 'trace')
+        }),
         ('User Information', {
             'fields': ('user', 'is_authenticated')
         }),
@@ -57,3 +87,30 @@ class RequestLogAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         """Disable editing RequestLog entries."""
         return False
+
+
+@admin.register(RequestProfile)
+class RequestProfileAdmin(admin.ModelAdmin):
+    """Admin configuration for RequestProfile model."""
+    list_display = ('request_log', 'duration', 'created_at', 'downloads')
+    readonly_fields = ('request_log', 'duration', 'created_at', 'downloads', 'summary')
+    exclude = ('stats_data',)
+    ordering = ('-created_at',)
+    list_select_related = ('request_log',)
+    
+    def downloads(self, obj):
+        """Links to the pstats and collapsed-stack downloads."""
+        return format_html(
+            '<a href="{}">pstats</a> | <a href="{}">collapsed stacks</a>',
+            reverse('main:request_profile_download', args=[obj.pk, 'pstats']),
+            reverse('main:request_profile_download', args=[obj.pk, 'collapsed']),
+        )
+    downloads.short_description = "Download"
+    
+    def has_add_permission(self, request):
+        """Disable adding RequestProfile entries manually."""
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        """Disable editing RequestProfile entries."""
+        return False
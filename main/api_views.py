@@ -1,11 +1,26 @@
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.generics import ListAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.exceptions import ValidationError
+from django.core.cache import cache
+from django.http import FileResponse
 from django.shortcuts import get_object_or_404
-from .models import CV
-from .serializers import CVSerializer, CVListSerializer
+from django.urls import reverse
+from celery.result import AsyncResult
+import uuid
+from django.utils import timezone
+from datetime import timedelta
+from .models import CV, RequestLog
+from .log_export import filter_request_logs, parse_log_filters, parse_log_sort
+from .pagination import KeysetPagination
+from .pdf_cache import NullPDFCache, get_pdf_cache, open_cached_cv_pdf, pdf_etag
+from .tasks import check_broker, generate_cv_pdf_task, translate_cv_task, translation_job_key
+from .rollups import GRANULARITIES, get_request_stats
+from .serializers import CVSerializer, CVListSerializer, RequestLogSerializer
+from .translation_service import TranslationService
 
 
 class CVListCreateView(ListCreateAPIView):
@@ -63,4 +78,230 @@ def cv_detail_api(request, pk):
     
     elif request.method == 'DELETE':
         cv.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT) 
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT) 
+
+
+@api_view(['GET'])
+def request_stats_api(request):
+    """API view for request metrics read from the pre-aggregated rollups."""
+    granularity = request.query_params.get('granularity', 'hour')
+    if granularity not in GRANULARITIES:
+        return Response(
+            {'error': f'granularity must be one of {", ".join(GRANULARITIES)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        hours = float(request.query_params.get('hours', 24))
+    except ValueError:
+        return Response({'error': 'hours must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+    until = timezone.now()
+    return Response(get_request_stats(granularity, since=until - timedelta(hours=hours), until=until))
+
+
+class RequestLogListAPIView(ListAPIView):
+    """
+    API view for browsing request logs, newest first.
+
+    Accepts the same filters as the logs page (since, until, status, path,
+    method, authenticated, min_latency), a ``sort`` column and pages with an
+    opaque ``cursor``. Staff only.
+    """
+    
+    serializer_class = RequestLogSerializer
+    pagination_class = KeysetPagination
+    permission_classes = [IsAdminUser]
+    
+    def get_queryset(self):
+        """Return request logs matching the query parameters."""
+        try:
+            filters = parse_log_filters(self.request.query_params)
+            # Read by KeysetPagination
+            self.order_field = parse_log_sort(self.request.query_params)
+        except ValueError as e:
+            raise ValidationError({'detail': str(e)})
+        return filter_request_logs(RequestLog.objects.all(), **filters)
+
+
+# How long the CV behind a PDF task id is remembered for status lookups
+PDF_TASK_TTL = 24 * 3600
+
+
+def _pdf_download_url(request, cv_id, layout):
+    url = reverse('main:cv_pdf_artifact_api', args=[cv_id])
+    if layout:
+        url += f'?layout={layout}'
+    return request.build_absolute_uri(url)
+
+
+@api_view(['POST'])
+def cv_pdf_generate_api(request, pk):
+    """
+    Queue rendering of a CV PDF in the background.
+
+    Returns 200 with a download URL when the current version is already
+    rendered, otherwise 202 with the task id and a status URL.
+    """
+    cv = get_object_or_404(CV, pk=pk)
+    layout = request.data.get('layout') or request.query_params.get('layout') or None
+    if isinstance(get_pdf_cache(), NullPDFCache):
+        return Response(
+            {'error': 'PDF cache is disabled, background rendering is unavailable'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    try:
+        cached = open_cached_cv_pdf(cv, layout)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if cached is not None:
+        cached.close()
+        return Response({'status': 'ready', 'download_url': _pdf_download_url(request, cv.pk, layout)})
+
+    try:
+        # Fail fast instead of retrying for seconds when the broker is down
+        check_broker()
+        result = generate_cv_pdf_task.apply_async(args=[cv.pk, layout], retry=False)
+    except Exception as e:
+        return Response(
+            {'error': f'Task queue unavailable: {e}'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    cache.set(f'pdf_task:{result.id}', {'cv_id': cv.pk, 'layout': layout}, PDF_TASK_TTL)
+    return Response({
+        'status': 'queued',
+        'task_id': result.id,
+        'status_url': request.build_absolute_uri(reverse('main:pdf_task_status_api', args=[result.id])),
+        'download_url': _pdf_download_url(request, cv.pk, layout),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+def pdf_task_status_api(request, task_id):
+    """
+    Report the state of a PDF generation task and, once done, where to download it.
+
+    ``ready`` is only true for a successful render; a task that raised is
+    reported with ``failed`` and its ``error`` instead of a download URL.
+    """
+    try:
+        result = AsyncResult(task_id)
+        state = result.state
+        output = str(result.result) if result.ready() else None
+    except Exception as e:
+        return Response(
+            {'error': f'Task result backend unavailable: {e}'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    data = {
+        'task_id': task_id,
+        'state': state,
+        'ready': state == 'SUCCESS',
+        'failed': state == 'FAILURE',
+        'result': output,
+    }
+    if state == 'FAILURE':
+        data['error'] = output
+    task = cache.get(f'pdf_task:{task_id}')
+    if task is not None and state == 'SUCCESS':
+        data['download_url'] = _pdf_download_url(request, task['cv_id'], task['layout'])
+    return Response(data)
+
+
+@api_view(['GET'])
+def cv_pdf_artifact_api(request, pk):
+    """
+    Download a PDF rendered by the background task.
+
+    Only serves the cached PDF of the CV's current version and never renders
+    on the request path; returns 404 until the task has finished.
+    """
+    cv = get_object_or_404(CV, pk=pk)
+    layout = request.query_params.get('layout') or None
+    try:
+        pdf = open_cached_cv_pdf(cv, layout)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if pdf is None:
+        return Response(
+            {'status': 'not_ready', 'error': 'PDF has not been generated for the current version of this CV'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    response = FileResponse(pdf, as_attachment=True, filename=f"{cv.get_full_name()}_CV.pdf",
+                            content_type='application/pdf')
+    response['ETag'] = pdf_etag(cv, layout)
+    return response
+
+
+# How long identical translation requests attach to the same job
+TRANSLATION_JOB_TTL = 3600
+
+
+def _translation_job_response(request, job_id, deduplicated):
+    return Response({
+        'status': 'queued',
+        'job_id': job_id,
+        'deduplicated': deduplicated,
+        'status_url': request.build_absolute_uri(reverse('main:translation_job_status_api', args=[job_id])),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['POST'])
+def translation_job_create_api(request):
+    """
+    Start translating a CV in a background task and return the job id.
+
+    Identical requests for the same CV version and language while a job is
+    queued or running (single-flight) get that job's id instead of a new
+    OpenAI call. Results are polled from the status endpoint.
+    """
+    cv_id = request.data.get('cv_id')
+    language = request.data.get('language')
+    if not cv_id or not language:
+        return Response({'error': 'CV ID and language are required'}, status=status.HTTP_400_BAD_REQUEST)
+    if language not in TranslationService.LANGUAGES:
+        return Response({'error': f'Language {language} is not supported'}, status=status.HTTP_400_BAD_REQUEST)
+    cv = get_object_or_404(CV, pk=cv_id)
+
+    job_key = translation_job_key(cv, language)
+    job_id = str(uuid.uuid4())
+    # The id is reserved before the task is queued, so concurrent requests see it
+    if not cache.add(job_key, job_id, TRANSLATION_JOB_TTL):
+        existing = cache.get(job_key)
+        if existing:
+            return _translation_job_response(request, existing, deduplicated=True)
+        # The entry expired in between; take it over
+        cache.set(job_key, job_id, TRANSLATION_JOB_TTL)
+
+    try:
+        # Fail fast instead of retrying for seconds when the broker is down
+        check_broker()
+        translate_cv_task.apply_async(args=[cv.pk, language, job_key], task_id=job_id, retry=False)
+    except Exception as e:
+        cache.delete(job_key)
+        return Response(
+            {'error': f'Task queue unavailable: {e}'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    return _translation_job_response(request, job_id, deduplicated=False)
+
+
+@api_view(['GET'])
+def translation_job_status_api(request, job_id):
+    """Report the state of a translation job and, once done, its result."""
+    try:
+        result = AsyncResult(job_id)
+        state = result.state
+        output = result.result if result.ready() else None
+    except Exception as e:
+        return Response(
+            {'error': f'Task result backend unavailable: {e}'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+    if state == 'FAILURE':
+        output = {'error': str(output), 'translated': False}
+    return Response({
+        'job_id': job_id,
+        'state': state,
+        'ready': state in ('SUCCESS', 'FAILURE'),
+        'result': output,
+    })
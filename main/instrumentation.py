@@ -0,0 +1,213 @@
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections
+from django.template.base import Template
+
+_current_stats = ContextVar('request_stats', default=None)
+
+_template_timing_installed = False
+
+# Cache methods timed by install_cache_timing()
+CACHE_METHODS = ('get', 'set', 'add', 'delete', 'get_many', 'set_many', 'delete_many', 'incr', 'has_key')
+
+# Sampled traces keep at most this many spans
+MAX_TRACE_SPANS = 500
+
+
+class RequestStats:
+    """
+    Timings collected while handling one request.
+
+    Time is summed per phase ('db', 'template', 'cache', 'external', 'pdf',
+    'view', ...). When ``trace`` is set, every span is also recorded with its
+    offset from the start of the request.
+    """
+
+    def __init__(self, trace=False):
+        """Initialize empty counters."""
+        self.started = time.perf_counter()
+        self.db_query_count = 0
+        self.phases = {}
+        self.spans = [] if trace else None
+        self.dropped_spans = 0
+        self._template_depth = 0
+        self._cache_depth = 0
+
+    @property
+    def db_time(self):
+        return self.phases.get('db', 0.0)
+
+    @property
+    def template_time(self):
+        return self.phases.get('template', 0.0)
+
+    def add_span(self, name, start, end):
+        """Record a span between two perf_counter() values."""
+        self.phases[name] = self.phases.get(name, 0.0) + end - start
+        if self.spans is None:
+            return
+        if len(self.spans) >= MAX_TRACE_SPANS:
+            self.dropped_spans += 1
+            return
+        self.spans.append({
+            'name': name,
+            'start': round((start - self.started) * 1000, 3),
+            'duration': round((end - start) * 1000, 3),
+        })
+
+    def get_trace(self):
+        """Return the recorded spans as a JSON-serializable dict, or None if not tracing."""
+        if self.spans is None:
+            return None
+        return {
+            'total': round((time.perf_counter() - self.started) * 1000, 3),
+            'spans': self.spans,
+            'dropped_spans': self.dropped_spans,
+        }
+
+
+def get_current_stats():
+    """Return the RequestStats of the request being handled, or None."""
+    return _current_stats.get()
+
+
+@contextmanager
+def span(name):
+    """
+    Time the enclosed block as phase ``name`` of the current request.
+
+    Does nothing outside a request. Can also be used as a decorator.
+    """
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.add_span(name, start, time.perf_counter())
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    """Connection execute wrapper that counts and times queries."""
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.db_query_count += 1
+        stats.add_span('db', start, time.perf_counter())
+
+
+def install_template_timing():
+    """
+    Patch Template.render once so template rendering time is recorded.
+
+    Only the outermost render of a request is timed; included templates run
+    inside it and are not counted twice.
+    """
+    global _template_timing_installed
+    if _template_timing_installed:
+        return
+    _template_timing_installed = True
+    original_render = Template.render
+
+    def render(self, context):
+        stats = _current_stats.get()
+        if stats is None or stats._template_depth:
+            return original_render(self, context)
+        stats._template_depth += 1
+        start = time.perf_counter()
+        try:
+            return original_render(self, context)
+        finally:
+            stats._template_depth -= 1
+            stats.add_span('template', start, time.perf_counter())
+
+    Template.render = render
+
+
+def _timed_cache_method(method):
+    @wraps(method)
+    def timed(*args, **kwargs):
+        stats = _current_stats.get()
+        if stats is None or stats._cache_depth:
+            # Backends implement some methods on top of others; time only the outer call
+            return method(*args, **kwargs)
+        stats._cache_depth += 1
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stats._cache_depth -= 1
+            stats.add_span('cache', start, time.perf_counter())
+    timed._request_timed = True
+    return timed
+
+
+def install_cache_timing():
+    """Wrap the main methods of every configured cache backend class in a 'cache' span."""
+    for alias in settings.CACHES:
+        backend_class = type(caches[alias])
+        for name in CACHE_METHODS:
+            method = backend_class.__dict__.get(name)
+            if method is not None and not getattr(method, '_request_timed', False):
+                setattr(backend_class, name, _timed_cache_method(method))
+
+
+def sample_trace():
+    """Return True if the next request should record a full trace."""
+    rate = getattr(settings, 'REQUEST_TRACE_SAMPLE_RATE', 0.0)
+    return rate > 0 and random.random() < rate
+
+
+@contextmanager
+def track_request(trace=False):
+    """
+    Collect RequestStats for the code run inside the block.
+
+    Query timing uses ``execute_wrapper`` on every configured connection, so
+    it works with DEBUG off and does not keep the SQL text around.
+    """
+    stats = RequestStats(trace=trace)
+    token = _current_stats.set(stats)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(db_execute_wrapper))
+            yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def format_server_timing(stats, total):
+    """
+    Build a Server-Timing header value from request stats.
+
+    ``total`` is the handling time in seconds; the 'middleware' entry is the
+    part of it spent outside the view.
+    """
+    phases = dict(stats.phases)
+    entries = [('total', total, None)]
+    view = phases.pop('view', None)
+    if view is not None:
+        entries.append(('view', view, None))
+        entries.append(('middleware', max(total - view, 0.0), None))
+    entries.append(('db', phases.pop('db', 0.0), f'{stats.db_query_count} queries'))
+    for name in sorted(phases):
+        entries.append((name, phases[name], None))
+    parts = []
+    for name, duration, description in entries:
+        part = f'{name};dur={duration * 1000:.1f}'
+        if description:
+            part += f';desc="{description}"'
+        parts.append(part)
+    return ', '.join(parts)
@@ -0,0 +1,100 @@
+import atexit
+import threading
+import time
+from django.conf import settings
+from .models import RequestLog
+
+
+class RequestLogBuffer:
+    """
+    In-process buffer that batches RequestLog rows and writes them with bulk_create.
+
+    Records are flushed when the buffer reaches ``batch_size`` entries, when
+    ``flush_interval`` seconds have passed since the last flush (a zero interval
+    disables time-based flushing), and on interpreter shutdown.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=5.0):
+        """Initialize an empty buffer."""
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._records = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flusher = None
+        self._stopped = threading.Event()
+
+    def add(self, log_entry):
+        """Queue an unsaved RequestLog instance, flushing if a limit is reached."""
+        with self._lock:
+            self._records.append(log_entry)
+            should_flush = (
+                len(self._records) >= self.batch_size
+                or self._interval_elapsed()
+            )
+        self._ensure_flusher()
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Write all queued records in a single bulk INSERT."""
+        with self._lock:
+            records, self._records = self._records, []
+            self._last_flush = time.monotonic()
+        if not records:
+            return 0
+        try:
+            RequestLog.objects.bulk_create(records, batch_size=self.batch_size)
+        except Exception as e:
+            # Log error but never let logging break the worker
+            print(f"Error flushing {len(records)} request logs: {e}")
+            return 0
+        return len(records)
+
+    def __len__(self):
+        return len(self._records)
+
+    def _ensure_flusher(self):
+        """Start the background thread that flushes idle buffers."""
+        if self._flusher is not None or self.flush_interval <= 0:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name='request-log-flusher', daemon=True
+            )
+            self._flusher.start()
+
+    def _run_flusher(self):
+        """Periodically flush records that would otherwise wait for more traffic."""
+        while not self._stopped.wait(self.flush_interval):
+            if self._records and self._interval_elapsed():
+                self.flush()
+
+    def _interval_elapsed(self):
+        """Return True if the time-based flush is due; a zero interval disables it."""
+        return 0 < self.flush_interval <= time.monotonic() - self._last_flush
+
+    def stop(self):
+        """Stop the background flusher and write any remaining records."""
+        self._stopped.set()
+        self.flush()
+
+
+_buffer = None
+_buffer_lock = threading.Lock()
+
+
+def get_request_log_buffer():
+    """Return the process-wide request log buffer, creating it on first use."""
+    global _buffer
+    if _buffer is None:
+        with _buffer_lock:
+            if _buffer is None:
+                _buffer = RequestLogBuffer(
+                    batch_size=getattr(settings, 'REQUEST_LOG_BATCH_SIZE', 100),
+                    flush_interval=getattr(settings, 'REQUEST_LOG_FLUSH_INTERVAL', 5.0),
+                )
+                atexit.register(_buffer.stop)
+    return _buffer
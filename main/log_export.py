@@ -0,0 +1,155 @@
+import csv
+import json
+from datetime import datetime
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .models import RequestLog
+
+EXPORT_FIELDS = (
+    'id', 'timestamp', 'method', 'path', 'query_string', 'remote_ip', 'user_agent',
+    'response_status', 'response_time', 'user_id', 'is_authenticated',
+    'db_query_count', 'db_time', 'template_time',
+)
+
+# Columns the log browser can sort by, newest/largest first
+LOG_SORT_FIELDS = ('timestamp', 'response_time', 'db_query_count', 'db_time', 'template_time')
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+EXPORT_CHUNK_SIZE = 2000
+
+
+def parse_timestamp(value):
+    """Parse an ISO date or datetime filter value into an aware datetime."""
+    if not value:
+        return None
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f"Invalid date or datetime: {value}")
+        moment = datetime.combine(day, datetime.min.time())
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def filter_request_logs(queryset, since=None, until=None, status=None, path=None, method=None,
+                        authenticated=None, min_latency=None):
+    """
+    Apply request log filters to a RequestLog queryset.
+
+    ``status`` is an exact code ("404") or a class ("4xx"); ``path`` is a
+    path prefix; ``min_latency`` is in milliseconds.
+    """
+    if since is not None:
+        queryset = queryset.filter(timestamp__gte=since)
+    if until is not None:
+        queryset = queryset.filter(timestamp__lt=until)
+    if status:
+        status = str(status).lower()
+        if len(status) == 3 and status.endswith('xx') and status[0].isdigit():
+            low = int(status[0]) * 100
+            queryset = queryset.filter(response_status__gte=low, response_status__lt=low + 100)
+        elif status.isdigit():
+            queryset = queryset.filter(response_status=int(status))
+        else:
+            raise ValueError(f"Invalid status filter: {status}")
+    if path:
+        queryset = queryset.filter(path__startswith=path)
+    if method:
+        queryset = queryset.filter(method=method.upper())
+    if authenticated is not None:
+        queryset = queryset.filter(is_authenticated=authenticated)
+    if min_latency is not None:
+        queryset = queryset.filter(response_time__gte=min_latency / 1000)
+    return queryset
+
+
+def parse_log_filters(params):
+    """
+    Read filter keyword arguments for filter_request_logs from query parameters.
+
+    Raises ValueError for malformed values.
+    """
+    authenticated = params.get('authenticated')
+    if authenticated in (None, ''):
+        authenticated = None
+    elif authenticated.lower() in ('1', 'true', 'yes'):
+        authenticated = True
+    elif authenticated.lower() in ('0', 'false', 'no'):
+        authenticated = False
+    else:
+        raise ValueError(f"Invalid authenticated filter: {authenticated}")
+
+    min_latency = params.get('min_latency')
+    try:
+        min_latency = float(min_latency) if min_latency else None
+    except ValueError:
+        raise ValueError(f"Invalid min_latency filter: {min_latency}")
+
+    return {
+        'since': parse_timestamp(params.get('since')),
+        'until': parse_timestamp(params.get('until')),
+        'status': params.get('status') or None,
+        'path': params.get('path') or None,
+        'method': params.get('method') or None,
+        'authenticated': authenticated,
+        'min_latency': min_latency,
+    }
+
+
+def parse_log_sort(params):
+    """Return the sort column from the ``sort`` query parameter."""
+    sort = params.get('sort') or 'timestamp'
+    if sort not in LOG_SORT_FIELDS:
+        raise ValueError(f"Invalid sort field: {sort}")
+    return sort
+
+
+def get_export_queryset(**filters):
+    """Return filtered request log rows as value tuples in timestamp order."""
+    queryset = filter_request_logs(RequestLog.objects.all(), **filters)
+    return queryset.order_by('timestamp', 'id').values_list(*EXPORT_FIELDS)
+
+
+class _Echo:
+    """File-like object whose write() returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(rows):
+    """Yield CSV lines for the header and each row."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if isinstance(value, datetime) else value for value in row
+        )
+
+
+def iter_ndjson(rows):
+    """Yield one JSON object per line for each row."""
+    for row in rows:
+        yield json.dumps(dict(zip(EXPORT_FIELDS, row)), cls=DjangoJSONEncoder) + '\n'
+
+
+def iter_export(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream a queryset in the requested format.
+
+    Rows are read with ``iterator(chunk_size=...)``, which uses a server-side
+    cursor on PostgreSQL, so memory stays flat regardless of export size.
+    """
+    rows = queryset.iterator(chunk_size=chunk_size)
+    if export_format == 'csv':
+        return iter_csv(rows)
+    if export_format == 'ndjson':
+        return iter_ndjson(rows)
+    raise ValueError(f"Unsupported export format: {export_format}")
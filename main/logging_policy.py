@@ -0,0 +1,101 @@
+import random
+import re
+import threading
+import time
+from django.conf import settings
+
+
+class RequestRateTracker:
+    """Track the request rate over a sliding window of one-second buckets."""
+
+    def __init__(self, window=10):
+        """Initialize the tracker with a window size in seconds."""
+        self.window = window
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def hit(self, now=None):
+        """Record one request and return the current rate in requests per second."""
+        second = int(now if now is not None else time.monotonic())
+        with self._lock:
+            self._buckets[second] = self._buckets.get(second, 0) + 1
+            oldest = second - self.window + 1
+            for key in [key for key in self._buckets if key < oldest]:
+                del self._buckets[key]
+            return sum(self._buckets.values()) / self.window
+
+
+class RequestLogPolicy:
+    """
+    Decide which requests RequestLoggingMiddleware should store.
+
+    Requests matching an excluded path prefix or pattern are never logged.
+    Error responses and slow requests are always logged. Everything else is
+    sampled with the rate of the longest matching path prefix or URL name,
+    scaled down when the request rate exceeds the adaptive threshold.
+    """
+
+    def __init__(self, exclude_paths=(), exclude_patterns=(), sample_rates=None,
+                 default_sample_rate=1.0, always_log_errors=True, slow_threshold_ms=None,
+                 adaptive_threshold=None, adaptive_window=10):
+        """Initialize the policy."""
+        self.exclude_paths = tuple(exclude_paths)
+        self.exclude_patterns = [re.compile(pattern) for pattern in exclude_patterns]
+        self.sample_rates = dict(sample_rates or {})
+        self.default_sample_rate = default_sample_rate
+        self.always_log_errors = always_log_errors
+        self.slow_threshold_ms = slow_threshold_ms
+        self.adaptive_threshold = adaptive_threshold
+        self.rate_tracker = RequestRateTracker(adaptive_window) if adaptive_threshold else None
+
+    @classmethod
+    def from_settings(cls):
+        """Build the policy from the REQUEST_LOG_* settings."""
+        return cls(
+            exclude_paths=getattr(settings, 'REQUEST_LOG_EXCLUDE_PATHS', ()),
+            exclude_patterns=getattr(settings, 'REQUEST_LOG_EXCLUDE_PATTERNS', ()),
+            sample_rates=getattr(settings, 'REQUEST_LOG_SAMPLE_RATES', {}),
+            default_sample_rate=getattr(settings, 'REQUEST_LOG_DEFAULT_SAMPLE_RATE', 1.0),
+            always_log_errors=getattr(settings, 'REQUEST_LOG_ALWAYS_LOG_ERRORS', True),
+            slow_threshold_ms=getattr(settings, 'REQUEST_LOG_SLOW_THRESHOLD_MS', None),
+            adaptive_threshold=getattr(settings, 'REQUEST_LOG_ADAPTIVE_THRESHOLD', None),
+        )
+
+    def is_excluded(self, path):
+        """Return True if the path must never be logged."""
+        if path.startswith(self.exclude_paths):
+            return True
+        return any(pattern.search(path) for pattern in self.exclude_patterns)
+
+    def get_sample_rate(self, request):
+        """Return the configured sample rate for the request's route."""
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.view_name in self.sample_rates:
+            return self.sample_rates[match.view_name]
+
+        rate = self.default_sample_rate
+        longest = -1
+        for prefix, prefix_rate in self.sample_rates.items():
+            if prefix.startswith('/') and request.path.startswith(prefix) and len(prefix) > longest:
+                rate, longest = prefix_rate, len(prefix)
+        return rate
+
+    def should_log(self, request, response, response_time):
+        """Return True if the request should be written to RequestLog."""
+        if self.is_excluded(request.path):
+            return False
+
+        # Keep the request rate up to date even for requests that are always logged
+        request_rate = self.rate_tracker.hit() if self.rate_tracker else 0
+
+        if self.always_log_errors and response.status_code >= 400:
+            return True
+        if self.slow_threshold_ms is not None and response_time * 1000 >= self.slow_threshold_ms:
+            return True
+
+        rate = self.get_sample_rate(request)
+        if self.adaptive_threshold and request_rate > self.adaptive_threshold:
+            rate *= self.adaptive_threshold / request_rate
+        if rate >= 1:
+            return True
+        return rate > 0 and random.random() < rate
@@ -0,0 +1,69 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from main.pdf import get_layout
+from main.pdf_benchmark import CV_SIZES, compare_to_baseline, run_benchmark
+
+
+class Command(BaseCommand):
+    help = 'Benchmark CV PDF rendering on synthetic CVs of increasing size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default=','.join(CV_SIZES),
+                            help=f"Comma-separated CV sizes ({', '.join(CV_SIZES)})")
+        parser.add_argument('--layouts', help='Comma-separated PDF layouts (defaults to the default layout)')
+        parser.add_argument('--iterations', type=int, default=20, help='Timed renders per case')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed renders before each case')
+        parser.add_argument('--seed', type=int, default=0, help='Seed for the synthetic CV content')
+        parser.add_argument('--tracemalloc', action='store_true',
+                            help='Also report peak Python allocations per render (slower)')
+        parser.add_argument('--json', help='Write the results as JSON to this file ("-" for stdout)')
+        parser.add_argument('--baseline', help='JSON results of an earlier run to compare against')
+        parser.add_argument('--max-regression', type=float, default=0.2,
+                            help='Fail when renders/sec drops by more than this fraction of the baseline')
+
+    def handle(self, *args, **options):
+        sizes = [size.strip() for size in options['sizes'].split(',') if size.strip()]
+        unknown = [size for size in sizes if size not in CV_SIZES]
+        if unknown:
+            raise CommandError(f"Unknown sizes: {', '.join(unknown)}")
+        layouts = [layout.strip() for layout in (options['layouts'] or '').split(',') if layout.strip()] or None
+        try:
+            for layout in layouts or []:
+                get_layout(layout)
+        except ValueError as e:
+            raise CommandError(str(e))
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+
+        report = run_benchmark(sizes, layouts, options['iterations'], options['warmup'],
+                               trace_memory=options['tracemalloc'], seed=options['seed'])
+
+        if options['json'] == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_table(report)
+            if options['json']:
+                with open(options['json'], 'w', encoding='utf-8') as handle:
+                    json.dump(report, handle, indent=2)
+                self.stdout.write(self.style.SUCCESS(f"Results written to {options['json']}"))
+
+        if options['baseline']:
+            try:
+                with open(options['baseline'], encoding='utf-8') as handle:
+                    baseline = json.load(handle)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Cannot read baseline: {e}")
+            regressions = compare_to_baseline(report, baseline, options['max_regression'])
+            if regressions:
+                raise CommandError('PDF rendering regressed:\n' + '\n'.join(regressions))
+            self.stderr.write(self.style.SUCCESS('No regressions against the baseline'))
+
+    def write_table(self, report):
+        header = f"{'size':<8} {'layout':<8} {'styles':<6} {'renders/s':>10} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'KiB':>8} {'RSS MiB':>8}"
+        self.stdout.write(header)
+        for r in report['results']:
+            self.stdout.write(
+                f"{r['size']:<8} {r['layout']:<8} {r['styles']:<6} {r['renders_per_sec']:>10} "
+                f"{r['p50_ms']:>9} {r['p90_ms']:>9} {r['p99_ms']:>9} "
+                f"{r['output_bytes'] / 1024:>8.1f} {r['peak_rss_mb']:>8}"
+            )
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from main.models import CV
+from main.pdf import get_layout
+from main.pdf_bulk import get_worker_count, write_pdf_zip
+
+
+class Command(BaseCommand):
+    help = 'Render CVs as PDFs in parallel and write them to a ZIP archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='ZIP file to write')
+        parser.add_argument('--ids', help='Comma-separated CV ids (defaults to all CVs)')
+        parser.add_argument('--layout', help='PDF layout name')
+        parser.add_argument('--workers', type=int, default=0,
+                            help='Render processes (defaults to PDF_BULK_WORKERS or the CPU count)')
+
+    def handle(self, *args, **options):
+        try:
+            layout = get_layout(options['layout']).name
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        queryset = CV.objects.order_by('pk')
+        if options['ids']:
+            try:
+                ids = [int(value) for value in options['ids'].split(',') if value.strip()]
+            except ValueError:
+                raise CommandError('--ids must be a comma-separated list of integers')
+            queryset = queryset.filter(pk__in=ids)
+
+        workers = get_worker_count(options['workers'])
+        count = write_pdf_zip(queryset.iterator(), options['output'], layout=layout, workers=workers)
+        self.stdout.write(self.style.SUCCESS(
+            f"Exported {count} CV PDFs to {options['output']} using {workers} workers"
+        ))
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+from main.log_export import EXPORT_FORMATS, get_export_queryset, iter_export, parse_log_filters
+
+
+class Command(BaseCommand):
+    help = 'Stream request logs as CSV or NDJSON to a file or stdout'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='csv',
+                            help='Output format')
+        parser.add_argument('--since', help='Only logs at or after this ISO date/datetime')
+        parser.add_argument('--until', help='Only logs before this ISO date/datetime')
+        parser.add_argument('--status', help='Exact status code (404) or class (5xx)')
+        parser.add_argument('--path', help='Path prefix')
+        parser.add_argument('--method', help='HTTP method')
+        parser.add_argument('--authenticated', help='true/false to filter by authentication')
+        parser.add_argument('--min-latency', help='Minimum response time in milliseconds')
+        parser.add_argument('--output', help='File to write to (defaults to stdout)')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows fetched per database round trip')
+
+    def handle(self, *args, **options):
+        try:
+            queryset = get_export_queryset(**parse_log_filters(options))
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        output = open(options['output'], 'w', newline='', encoding='utf-8') if options['output'] else None
+        if output is not None:
+            write = output.write
+        else:
+            def write(chunk):
+                self.stdout.write(chunk, ending='')
+        # The CSV stream starts with a header line
+        count = -1 if options['format'] == 'csv' else 0
+        try:
+            for chunk in iter_export(queryset, options['format'], chunk_size=options['chunk_size']):
+                write(chunk)
+                count += 1
+        finally:
+            if output is not None:
+                output.close()
+
+        if output is not None:
+            self.stdout.write(self.style.SUCCESS(f"Exported {count} request logs to {options['output']}"))
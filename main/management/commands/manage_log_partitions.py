@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from main.partitions import get_partition_backend, maintain_partitions
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming request log partitions and drop expired ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--install', action='store_true',
+                            help='Convert the request log table to a partitioned table first')
+        parser.add_argument('--premake', type=int, default=None,
+                            help='Number of future periods to create partitions for')
+        parser.add_argument('--retain', type=int, default=None,
+                            help='Number of most recent periods to keep (0 keeps everything)')
+        parser.add_argument('--database', default=None,
+                            help='Database alias (defaults to the request log database)')
+
+    def handle(self, *args, **options):
+        try:
+            if options['install']:
+                if get_partition_backend(options['database']).install():
+                    self.stdout.write(self.style.SUCCESS('Request log table converted to a partitioned table'))
+                else:
+                    self.stdout.write('Request log table is already prepared for partitioning')
+
+            result = maintain_partitions(
+                premake=options['premake'],
+                retain=options['retain'],
+                using=options['database'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for name in result['created']:
+            self.stdout.write(f'Created partition {name}')
+        for name in result['dropped']:
+            self.stdout.write(f'Dropped partition {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Partitions: {len(result['created'])} created, {len(result['dropped'])} dropped"
+        ))
@@ -0,0 +1,41 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from main.retention import purge_request_logs
+
+
+class Command(BaseCommand):
+    help = 'Delete old request logs in bounded batches, optionally archiving them first'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None,
+                            help='Delete logs older than this many days')
+        parser.add_argument('--keep-latest', type=int, default=None,
+                            help='Keep only this many of the newest logs')
+        parser.add_argument('--batch-size', type=int, default=settings.REQUEST_LOG_PURGE_BATCH_SIZE,
+                            help='Rows deleted per transaction')
+        parser.add_argument('--archive-dir', default=settings.REQUEST_LOG_ARCHIVE_DIR or None,
+                            help='Write deleted rows to a gzip JSON Lines file in this directory first')
+        parser.add_argument('--pause', type=float, default=0.0,
+                            help='Seconds to sleep between batches')
+
+    def handle(self, *args, **options):
+        if options['days'] is None and options['keep_latest'] is None:
+            raise CommandError('Pass --days and/or --keep-latest.')
+
+        before = None
+        if options['days'] is not None:
+            before = timezone.now() - timedelta(days=options['days'])
+
+        result = purge_request_logs(
+            before=before,
+            keep_latest=options['keep_latest'],
+            batch_size=options['batch_size'],
+            archive_dir=options['archive_dir'],
+            pause=options['pause'],
+            progress=lambda progress: self.stdout.write(
+                f'{progress.deleted} rows deleted ({progress.rows_per_second:.0f} rows/s)'
+            ),
+        )
+        self.stdout.write(self.style.SUCCESS(str(result)))
@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.core.management import call_command
+from django.conf import settings
 from django.db import connection
 import time
 
@@ -32,6 +33,8 @@ class Command(BaseCommand):
         self.stdout.write('Running migrations...')
         try:
             call_command('migrate')
+            if 'logs' in settings.DATABASES:
+                call_command('migrate', database='logs')
             self.stdout.write(self.style.SUCCESS('Migrations completed successfully!'))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Migration failed: {e}'))
@@ -0,0 +1,167 @@
+import atexit
+import glob
+import json
+import os
+import tempfile
+import threading
+import time
+from django.conf import settings
+from .rollups import LATENCY_BUCKETS, latency_bucket
+
+
+class MetricsRegistry:
+    """
+    In-process request counters and fixed-bucket latency histograms per route.
+
+    Routes are resolved URL names, so the number of series stays bounded no
+    matter which paths are requested. Updates take one short lock.
+
+    When METRICS_MULTIPROCESS_DIR is set, each process periodically writes its
+    snapshot to ``metrics_<pid>.json`` in that directory, and the /metrics/
+    endpoint sums the snapshots of all gunicorn workers. The directory should
+    be emptied when the server starts.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        """Initialize empty counters."""
+        self.buckets = buckets
+        self._requests = {}
+        self._latency = {}
+        self._lock = threading.Lock()
+        self._last_write = 0.0
+        self._exit_hook_registered = False
+
+    def observe(self, route, method, status, latency):
+        """Record one finished request."""
+        bucket = latency_bucket(latency)
+        with self._lock:
+            key = (route, method, str(status))
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._latency.get(route)
+            if histogram is None:
+                histogram = self._latency[route] = {
+                    'buckets': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0
+                }
+            histogram['buckets'][bucket] += 1
+            histogram['sum'] += latency
+            histogram['count'] += 1
+        self._maybe_write()
+
+    def snapshot(self):
+        """Return a JSON-serializable copy of the current values."""
+        with self._lock:
+            return {
+                'requests': [[*key, count] for key, count in self._requests.items()],
+                'latency': {
+                    route: {'buckets': list(h['buckets']), 'sum': h['sum'], 'count': h['count']}
+                    for route, h in self._latency.items()
+                },
+            }
+
+    def reset(self):
+        """Clear all values."""
+        with self._lock:
+            self._requests.clear()
+            self._latency.clear()
+
+    def get_directory(self):
+        return getattr(settings, 'METRICS_MULTIPROCESS_DIR', '') or None
+
+    def _maybe_write(self):
+        """Write this process's snapshot if the write interval has passed."""
+        directory = self.get_directory()
+        if directory is None:
+            return
+        if not self._exit_hook_registered:
+            # Make sure a worker's final counts reach the directory on shutdown
+            self._exit_hook_registered = True
+            atexit.register(self.write, directory)
+        interval = getattr(settings, 'METRICS_WRITE_INTERVAL', 5.0)
+        if time.monotonic() - self._last_write >= interval:
+            self.write(directory)
+
+    def write(self, directory=None):
+        """Atomically write this process's snapshot to the shared directory."""
+        directory = directory or self.get_directory()
+        if directory is None:
+            return
+        self._last_write = time.monotonic()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            with os.fdopen(fd, 'w') as handle:
+                json.dump(self.snapshot(), handle)
+            os.replace(tmp_path, os.path.join(directory, f'metrics_{os.getpid()}.json'))
+        except OSError as e:
+            print(f"Error writing metrics snapshot: {e}")
+
+    def collect(self):
+        """Return the snapshot summed across all worker processes."""
+        directory = self.get_directory()
+        if directory is None:
+            return self.snapshot()
+        self.write(directory)
+        snapshots = []
+        for path in glob.glob(os.path.join(directory, 'metrics_*.json')):
+            try:
+                with open(path) as handle:
+                    snapshots.append(json.load(handle))
+            except (OSError, ValueError):
+                # A worker may be replacing its file right now; skip it
+                continue
+        return merge_snapshots(snapshots, len(self.buckets) + 1)
+
+
+def merge_snapshots(snapshots, bucket_count):
+    """Sum several process snapshots into one."""
+    requests = {}
+    latency = {}
+    for snapshot in snapshots:
+        for route, method, status, count in snapshot.get('requests', []):
+            requests[(route, method, status)] = requests.get((route, method, status), 0) + count
+        for route, histogram in snapshot.get('latency', {}).items():
+            merged = latency.setdefault(route, {'buckets': [0] * bucket_count, 'sum': 0.0, 'count': 0})
+            for index, count in enumerate(histogram['buckets']):
+                merged['buckets'][index] += count
+            merged['sum'] += histogram['sum']
+            merged['count'] += histogram['count']
+    return {
+        'requests': [[*key, count] for key, count in requests.items()],
+        'latency': latency,
+    }
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(snapshot, buckets=LATENCY_BUCKETS):
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = [
+        '# HELP http_requests_total Total HTTP requests by route, method and status.',
+        '# TYPE http_requests_total counter',
+    ]
+    for route, method, status, count in sorted(snapshot['requests']):
+        lines.append(
+            f'http_requests_total{{route="{_escape(route)}",method="{_escape(method)}",'
+            f'status="{_escape(status)}"}} {count}'
+        )
+
+    lines += [
+        '# HELP http_request_duration_seconds HTTP request latency by route.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for route in sorted(snapshot['latency']):
+        histogram = snapshot['latency'][route]
+        label = f'route="{_escape(route)}"'
+        cumulative = 0
+        for bound, count in zip(buckets, histogram['buckets']):
+            cumulative += count
+            lines.append(f'http_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'http_request_duration_seconds_bucket{{{label},le="+Inf"}} {histogram["count"]}')
+        lines.append(f'http_request_duration_seconds_sum{{{label}}} {histogram["sum"]}')
+        lines.append(f'http_request_duration_seconds_count{{{label}}} {histogram["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
@@ -1,15 +1,51 @@
 import time
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY, get_user_model
+from django.core.exceptions import ValidationError
 from django.utils.deprecation import MiddlewareMixin
-from .models import RequestLog
+from django.utils.functional import SimpleLazyObject, empty
+from .instrumentation import (
+    format_server_timing, install_cache_timing, install_template_timing, sample_trace, track_request
+)
+from .log_buffer import get_request_log_buffer
+from .logging_policy import RequestLogPolicy
+from .metrics import registry as metrics_registry
+from .models import RequestLog, RequestProfile
+from .profiling import SlowRequestProfiler, format_summary, load_stats
 
 
 class RequestLoggingMiddleware(MiddlewareMixin):
     """Middleware to log HTTP requests for auditing and monitoring."""
     
+    def __init__(self, get_response):
+        """Load the logging policy once per middleware instance."""
+        super().__init__(get_response)
+        self.policy = RequestLogPolicy.from_settings()
+        self.profiler = SlowRequestProfiler.from_settings()
+        self.instrument = getattr(settings, 'REQUEST_INSTRUMENTATION_ENABLED', True)
+        if self.instrument:
+            install_template_timing()
+            install_cache_timing()
+    
+    def __call__(self, request):
+        """Handle the request while collecting query and template timings."""
+        # ServerTimingMiddleware may already be collecting for the whole request
+        if not self.instrument or getattr(request, 'request_stats', None) is not None:
+            return super().__call__(request)
+        with track_request(trace=sample_trace()) as stats:
+            request.request_stats = stats
+            return super().__call__(request)
+    
     def process_request(self, request):
         """Store the start time of the request."""
         request.start_time = time.time()
     
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Mark the start of the view and start the profiler for sampled requests."""
+        request.view_start_time = time.perf_counter()
+        if self.profiler.enabled:
+            self.profiler.start(request)
+    
     def process_response(self, request, response):
         """Log the request details after response is generated."""
         # Calculate response time
@@ -18,12 +54,26 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         else:
             response_time = 0.0
         
-        # Get user information
-        user = None
-        is_authenticated = False
-        if hasattr(request, 'user') and request.user.is_authenticated:
-            user = request.user
-            is_authenticated = True
+        stats = getattr(request, 'request_stats', None)
+        view_start_time = getattr(request, 'view_start_time', None)
+        if stats is not None and view_start_time is not None:
+            stats.add_span('view', view_start_time, time.perf_counter())
+        
+        # Kept profiles belong to slow requests, which are always logged
+        profile_data = None
+        if self.profiler.enabled:
+            profile_data = self.profiler.stop(request, response_time)
+        
+        # Feed the in-process metrics for every request, logged or not
+        if getattr(settings, 'METRICS_ENABLED', True):
+            self.observe_metrics(request, response, response_time)
+        
+        # Skip excluded paths and requests dropped by sampling
+        if profile_data is None and not self.policy.should_log(request, response, response_time):
+            return response
+        
+        # Get user information without loading the user
+        user_id = self.get_user_id(request)
         
         # Get remote IP
         remote_ip = self.get_client_ip(request)
@@ -34,24 +84,86 @@ class RequestLoggingMiddleware(MiddlewareMixin):
         # Get user agent
         user_agent = request.META.get('HTTP_USER_AGENT', '')
         
-        # Create log entry asynchronously to avoid blocking the response
+        # Read the counters before the log row itself is written
+        log_entry = RequestLog(
+            method=request.method,
+            path=request.path,
+            query_string=query_string,
+            remote_ip=remote_ip,
+            user_agent=user_agent,
+            response_status=response.status_code,
+            response_time=response_time,
+            user_id=user_id,
+            is_authenticated=user_id is not None,
+            db_query_count=stats.db_query_count if stats else 0,
+            db_time=stats.db_time if stats else 0.0,
+            template_time=stats.template_time if stats else 0.0,
+            trace=stats.get_trace() if stats else None
+        )
+        if profile_data is not None:
+            self.save_profile(log_entry, profile_data)
+        else:
+            self.save_log(log_entry)
+        
+        return response
+    
+    def save_log(self, log_entry):
+        """Write the log entry now, or queue it when buffered logging is enabled."""
         try:
-            RequestLog.objects.create(
-                method=request.method,
-                path=request.path,
-                query_string=query_string,
-                remote_ip=remote_ip,
-                user_agent=user_agent,
-                response_status=response.status_code,
-                response_time=response_time,
-                user=user,
-                is_authenticated=is_authenticated
-            )
+            if getattr(settings, 'REQUEST_LOG_BUFFERED', False):
+                get_request_log_buffer().add(log_entry)
+            else:
+                log_entry.save()
         except Exception as e:
             # Log error but don't break the response
             print(f"Error logging request: {e}")
+    
+    def save_profile(self, log_entry, profile_data):
+        """Write the log entry immediately, since the profile row must point to it."""
+        try:
+            log_entry.save()
+            RequestProfile.objects.create(
+                request_log=log_entry,
+                duration=log_entry.response_time,
+                stats_data=profile_data,
+                summary=format_summary(load_stats(profile_data)),
+            )
+        except Exception as e:
+            print(f"Error saving request profile: {e}")
+    
+    def observe_metrics(self, request, response, response_time):
+        """Record the request in the per-route counters and latency histograms."""
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match is not None else '<unmatched>'
+        metrics_registry.observe(route, request.method, response.status_code, response_time)
+    
+    def get_user_id(self, request):
+        """
+        Return the id of the logged-in user, or None for anonymous requests.
         
-        return response
+        Uses request.user only if the view already resolved it, and otherwise
+        reads the id from the session, so logging never runs the auth_user
+        query itself and never loads a session for requests without a
+        session cookie.
+        """
+        user = getattr(request, 'user', None)
+        if isinstance(user, SimpleLazyObject):
+            user = None if user._wrapped is empty else user._wrapped
+        if user is not None:
+            return user.pk if user.is_authenticated else None
+        
+        session = getattr(request, 'session', None)
+        if session is None:
+            return None
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES and not hasattr(session, '_session_cache'):
+            return None
+        user_id = session.get(SESSION_KEY)
+        if user_id is None:
+            return None
+        try:
+            return get_user_model()._meta.pk.to_python(user_id)
+        except ValidationError:
+            return None
     
     def get_client_ip(self, request):
         """Get the client's IP address."""
@@ -60,4 +172,34 @@ class RequestLoggingMiddleware(MiddlewareMixin):
             ip = x_forwarded_for.split(',')[0]
         else:
             ip = request.META.get('REMOTE_ADDR')
-        return ip 
\ No newline at end of file
+        return ip 
+
+
+class ServerTimingMiddleware(MiddlewareMixin):
+    """
+    Add a Server-Timing header with a per-phase breakdown of each request.
+
+    Put it first in MIDDLEWARE so the total and the middleware phase cover
+    the whole middleware stack. The phases are collected by the
+    instrumentation in main.instrumentation and shared with
+    RequestLoggingMiddleware.
+    """
+    
+    def __init__(self, get_response):
+        """Install the timing hooks once when enabled."""
+        super().__init__(get_response)
+        self.enabled = getattr(settings, 'SERVER_TIMING_ENABLED', False)
+        if self.enabled:
+            install_template_timing()
+            install_cache_timing()
+    
+    def __call__(self, request):
+        """Time the request and add the Server-Timing header to the response."""
+        if not self.enabled:
+            return self.get_response(request)
+        start = time.perf_counter()
+        with track_request(trace=sample_trace()) as stats:
+            request.request_stats = stats
+            response = self.get_response(request)
+        response['Server-Timing'] = format_server_timing(stats, time.perf_counter() - start)
+        return response
@@ -26,7 +26,7 @@ class Migration(migrations.Migration):
                 ('response_status', models.IntegerField(verbose_name='Response Status')),
                 ('response_time', models.FloatField(verbose_name='Response Time (seconds)')),
                 ('is_authenticated', models.BooleanField(default=False, verbose_name='Is Authenticated')),
-                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='User')),
+                ('user', models.ForeignKey(blank=True, db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='User')),
             ],
             options={
                 'verbose_name': 'Request Log',
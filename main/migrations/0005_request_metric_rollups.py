@@ -0,0 +1,48 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0004_requestlog_user_no_constraint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True, verbose_name='Name')),
+                ('last_id', models.BigIntegerField(default=0, verbose_name='Last Processed ID')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+            ],
+            options={
+                'verbose_name': 'Rollup Checkpoint',
+                'verbose_name_plural': 'Rollup Checkpoints',
+            },
+        ),
+        migrations.CreateModel(
+            name='RequestMetricRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('minute', 'Minute'), ('hour', 'Hour'), ('day', 'Day')], max_length=6, verbose_name='Granularity')),
+                ('bucket_start', models.DateTimeField(verbose_name='Bucket Start')),
+                ('path', models.CharField(max_length=255, verbose_name='Request Path')),
+                ('method', models.CharField(max_length=10, verbose_name='HTTP Method')),
+                ('response_status', models.IntegerField(verbose_name='Response Status')),
+                ('request_count', models.PositiveIntegerField(default=0, verbose_name='Request Count')),
+                ('error_count', models.PositiveIntegerField(default=0, help_text='Responses with status 500 or above', verbose_name='Error Count')),
+                ('latency_sum', models.FloatField(default=0.0, verbose_name='Latency Sum (seconds)')),
+                ('latency_buckets', models.JSONField(default=list, help_text='Request counts per latency bucket, see main.rollups.LATENCY_BUCKETS', verbose_name='Latency Histogram')),
+            ],
+            options={
+                'verbose_name': 'Request Metric Rollup',
+                'verbose_name_plural': 'Request Metric Rollups',
+                'ordering': ['-bucket_start'],
+                'indexes': [models.Index(fields=['granularity', 'bucket_start'], name='main_reques_granula_9a5ede_idx')],
+                'constraints': [models.UniqueConstraint(fields=('granularity', 'bucket_start', 'path', 'method', 'response_status'), name='unique_request_metric_rollup')],
+            },
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:08
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0005_request_metric_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='requestlog',
+            name='main_reques_timesta_21179b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='requestlog',
+            name='main_reques_method_b16918_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='requestlog',
+            name='main_reques_path_21c140_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='requestlog',
+            name='main_reques_respons_4720be_idx',
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['timestamp', 'id'], name='requestlog_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['method', 'timestamp', 'id'], name='requestlog_method_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['response_status', 'timestamp', 'id'], name='requestlog_status_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['is_authenticated', 'timestamp', 'id'], name='requestlog_auth_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['response_time'], name='requestlog_latency_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['path'], name='requestlog_path_prefix_idx', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
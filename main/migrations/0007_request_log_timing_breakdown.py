@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:21
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0006_request_log_browse_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestlog',
+            name='db_query_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='DB Queries'),
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='db_time',
+            field=models.FloatField(default=0.0, verbose_name='DB Time (seconds)'),
+        ),
+        migrations.AddField(
+            model_name='requestlog',
+            name='template_time',
+            field=models.FloatField(default=0.0, verbose_name='Template Time (seconds)'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['db_query_count', 'id'], name='requestlog_queries_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['db_time', 'id'], name='requestlog_db_time_idx'),
+        ),
+    ]
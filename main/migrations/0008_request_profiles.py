@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:23
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0007_request_log_timing_breakdown'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Created At')),
+                ('duration', models.FloatField(verbose_name='Duration (seconds)')),
+                ('stats_data', models.BinaryField(verbose_name='pstats Data')),
+                ('summary', models.TextField(blank=True, verbose_name='Summary')),
+                ('request_log', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='profiles', to='main.requestlog', verbose_name='Request Log')),
+            ],
+            options={
+                'verbose_name': 'Request Profile',
+                'verbose_name_plural': 'Request Profiles',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
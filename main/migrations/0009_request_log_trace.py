@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0008_request_profiles'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='requestlog',
+            name='trace',
+            field=models.JSONField(blank=True, help_text='Sampled spans of the request, see REQUEST_TRACE_SAMPLE_RATE', null=True, verbose_name='Trace'),
+        ),
+    ]
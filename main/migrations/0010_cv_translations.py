@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-17 05:52
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0009_request_log_trace'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CVTranslation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('language', models.CharField(max_length=50, verbose_name='Language')),
+                ('section', models.CharField(max_length=20, verbose_name='Section')),
+                ('source_hash', models.CharField(db_index=True, max_length=64, verbose_name='Source Hash')),
+                ('translated_text', models.TextField(verbose_name='Translated Text')),
+                ('model', models.CharField(max_length=50, verbose_name='Model')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('cv', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translations', to='main.cv', verbose_name='CV')),
+            ],
+            options={
+                'verbose_name': 'CV Translation',
+                'verbose_name_plural': 'CV Translations',
+                'ordering': ['cv_id', 'language', 'section'],
+                'constraints': [models.UniqueConstraint(fields=('cv', 'language', 'section'), name='unique_cv_translation_section')],
+            },
+        ),
+    ]
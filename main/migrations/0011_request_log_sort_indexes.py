@@ -0,0 +1,27 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0010_cv_translations'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='requestlog',
+            name='requestlog_latency_idx',
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['response_time', 'id'], name='requestlog_latency_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='requestlog',
+            index=models.Index(fields=['template_time', 'id'], name='requestlog_template_time_idx'),
+        ),
+    ]
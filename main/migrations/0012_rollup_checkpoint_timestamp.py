@@ -0,0 +1,37 @@
+# Generated by Django 5.2.5 on 2026-10-17 06:44
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+def set_checkpoint_timestamps(apps, schema_editor):
+    """Start existing checkpoints after the newest row they already folded in."""
+    RollupCheckpoint = apps.get_model('main', 'RollupCheckpoint')
+    RequestLog = apps.get_model('main', 'RequestLog')
+    using = schema_editor.connection.alias
+    for checkpoint in RollupCheckpoint.objects.using(using).filter(last_id__gt=0, last_timestamp__isnull=True):
+        newest = RequestLog.objects.using(using).filter(id__lte=checkpoint.last_id).aggregate(
+            newest=Max('timestamp'), last_id=Max('id')
+        )
+        if newest['newest'] is not None:
+            checkpoint.last_timestamp = newest['newest']
+            checkpoint.last_id = newest['last_id']
+            checkpoint.save(update_fields=['last_timestamp', 'last_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main', '0011_request_log_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rollupcheckpoint',
+            name='last_timestamp',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Last Processed Timestamp'),
+        ),
+        migrations.RunPython(
+            set_checkpoint_timestamps, migrations.RunPython.noop, hints={'model_name': 'rollupcheckpoint'}
+        ),
+    ]
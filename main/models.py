@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 
 
 class CV(models.Model):
@@ -25,9 +26,41 @@ class CV(models.Model):
         return f"{self.firstname} {self.lastname}"
 
 
+class CVTranslation(models.Model):
+    """
+    Translated section of a CV, the persistent tier behind the translation cache.
+
+    ``source_hash`` is the hash of the source text, language, section and
+    model the row was translated from; rows whose hash no longer matches the
+    CV are stale and get replaced on the next translation.
+    """
+    cv = models.ForeignKey(CV, on_delete=models.CASCADE, related_name='translations', verbose_name="CV")
+    language = models.CharField(max_length=50, verbose_name="Language")
+    section = models.CharField(max_length=20, verbose_name="Section")
+    source_hash = models.CharField(max_length=64, db_index=True, verbose_name="Source Hash")
+    translated_text = models.TextField(verbose_name="Translated Text")
+    model = models.CharField(max_length=50, verbose_name="Model")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
+
+    class Meta:
+        verbose_name = "CV Translation"
+        verbose_name_plural = "CV Translations"
+        # By column, so listing rows does not join the CV table for its ordering
+        ordering = ['cv_id', 'language', 'section']
+        constraints = [
+            # Also serves lookups by (cv) and (cv, language)
+            models.UniqueConstraint(fields=['cv', 'language', 'section'], name='unique_cv_translation_section'),
+        ]
+
+    def __str__(self):
+        return f"{self.cv_id} {self.language} {self.section}"
+
+
 class RequestLog(models.Model):
     """Model to log HTTP requests for auditing and monitoring."""
-    timestamp = models.DateTimeField(auto_now_add=True, verbose_name="Timestamp")
+    # Set when the instance is built rather than when it is saved, so that
+    # buffered rows keep the time of the request instead of the flush.
+    timestamp = models.DateTimeField(default=timezone.now, verbose_name="Timestamp")
     method = models.CharField(max_length=10, verbose_name="HTTP Method")
     path = models.CharField(max_length=255, verbose_name="Request Path")
     query_string = models.TextField(blank=True, verbose_name="Query String")
@@ -40,19 +73,40 @@ class RequestLog(models.Model):
         on_delete=models.SET_NULL, 
         null=True, 
         blank=True, 
+        # No database constraint, so logs can live on a separate database
+        db_constraint=False,
         verbose_name="User"
     )
     is_authenticated = models.BooleanField(default=False, verbose_name="Is Authenticated")
+    db_query_count = models.PositiveIntegerField(default=0, verbose_name="DB Queries")
+    db_time = models.FloatField(default=0.0, verbose_name="DB Time (seconds)")
+    template_time = models.FloatField(default=0.0, verbose_name="Template Time (seconds)")
+    trace = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name="Trace",
+        help_text="Sampled spans of the request, see REQUEST_TRACE_SAMPLE_RATE"
+    )
 
     class Meta:
         verbose_name = "Request Log"
         verbose_name_plural = "Request Logs"
         ordering = ['-timestamp']
+        # The filter indexes end in (timestamp, id) and the sort indexes in
+        # (column, id), so every log browser order is paged with one index
+        # range scan.
         indexes = [
-            models.Index(fields=['timestamp']),
-            models.Index(fields=['method']),
-            models.Index(fields=['path']),
-            models.Index(fields=['response_status']),
+            models.Index(fields=['timestamp', 'id'], name='requestlog_time_idx'),
+            models.Index(fields=['method', 'timestamp', 'id'], name='requestlog_method_time_idx'),
+            models.Index(fields=['response_status', 'timestamp', 'id'], name='requestlog_status_time_idx'),
+            models.Index(fields=['is_authenticated', 'timestamp', 'id'], name='requestlog_auth_time_idx'),
+            models.Index(fields=['response_time', 'id'], name='requestlog_latency_idx'),
+            models.Index(fields=['db_query_count', 'id'], name='requestlog_queries_idx'),
+            models.Index(fields=['db_time', 'id'], name='requestlog_db_time_idx'),
+            models.Index(fields=['template_time', 'id'], name='requestlog_template_time_idx'),
+            # varchar_pattern_ops lets PostgreSQL use the index for path
+            # prefix (LIKE 'x%') filters under any collation.
+            models.Index(fields=['path'], name='requestlog_path_prefix_idx', opclasses=['varchar_pattern_ops']),
         ]
 
     def __str__(self):
@@ -63,3 +117,89 @@ class RequestLog(models.Model):
         if self.response_time < 1:
             return f"{self.response_time * 1000:.0f}ms"
         return f"{self.response_time:.2f}s"
+
+
+class RequestProfile(models.Model):
+    """cProfile data captured for a slow request."""
+    request_log = models.ForeignKey(
+        RequestLog,
+        # Request logs are removed with bulk deletes and partition drops,
+        # which clean up their profiles explicitly.
+        on_delete=models.DO_NOTHING,
+        related_name='profiles',
+        # Partitioned request log tables have no single-column unique id
+        db_constraint=False,
+        verbose_name="Request Log"
+    )
+    created_at = models.DateTimeField(default=timezone.now, verbose_name="Created At")
+    duration = models.FloatField(verbose_name="Duration (seconds)")
+    stats_data = models.BinaryField(verbose_name="pstats Data")
+    summary = models.TextField(blank=True, verbose_name="Summary")
+
+    class Meta:
+        verbose_name = "Request Profile"
+        verbose_name_plural = "Request Profiles"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Profile of {self.request_log_id} ({self.duration:.2f}s)"
+
+
+class RequestMetricRollup(models.Model):
+    """Pre-aggregated request metrics per time bucket, path, method and status."""
+    GRANULARITY_CHOICES = [
+        ('minute', 'Minute'),
+        ('hour', 'Hour'),
+        ('day', 'Day'),
+    ]
+
+    granularity = models.CharField(max_length=6, choices=GRANULARITY_CHOICES, verbose_name="Granularity")
+    bucket_start = models.DateTimeField(verbose_name="Bucket Start")
+    path = models.CharField(max_length=255, verbose_name="Request Path")
+    method = models.CharField(max_length=10, verbose_name="HTTP Method")
+    response_status = models.IntegerField(verbose_name="Response Status")
+    request_count = models.PositiveIntegerField(default=0, verbose_name="Request Count")
+    error_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Error Count",
+        help_text="Responses with status 500 or above"
+    )
+    latency_sum = models.FloatField(default=0.0, verbose_name="Latency Sum (seconds)")
+    latency_buckets = models.JSONField(
+        default=list,
+        verbose_name="Latency Histogram",
+        help_text="Request counts per latency bucket, see main.rollups.LATENCY_BUCKETS"
+    )
+
+    class Meta:
+        verbose_name = "Request Metric Rollup"
+        verbose_name_plural = "Request Metric Rollups"
+        ordering = ['-bucket_start']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['granularity', 'bucket_start', 'path', 'method', 'response_status'],
+                name='unique_request_metric_rollup'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start']),
+        ]
+
+    def __str__(self):
+        return f"{self.granularity} {self.bucket_start} {self.method} {self.path} {self.response_status}"
+
+
+class RollupCheckpoint(models.Model):
+    """Last source row folded into the rollups, so each run only reads new rows."""
+    name = models.CharField(max_length=50, unique=True, verbose_name="Name")
+    # Rows are folded in (timestamp, id) order; these identify the last one
+    last_timestamp = models.DateTimeField(null=True, blank=True, verbose_name="Last Processed Timestamp")
+    last_id = models.BigIntegerField(default=0, verbose_name="Last Processed ID")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Updated At")
+
+    class Meta:
+        verbose_name = "Rollup Checkpoint"
+        verbose_name_plural = "Rollup Checkpoints"
+
+    def __str__(self):
+        return f"{self.name}: {self.last_timestamp} #{self.last_id}"
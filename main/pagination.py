@@ -0,0 +1,121 @@
+import base64
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(value, pk):
+    """Encode the sort value and primary key of the last row of a page."""
+    if hasattr(value, 'isoformat'):
+        value = value.isoformat()
+    raw = json.dumps([value, pk]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor, datetime_value=False):
+    """Decode a cursor into its (value, pk) pair."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        value, pk = json.loads(raw)
+        if datetime_value:
+            value = parse_datetime(value)
+            if value is None:
+                raise ValueError
+        return value, int(pk)
+    except (TypeError, ValueError):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+
+
+class KeysetPage:
+    """One page of keyset-paginated results."""
+
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginate_keyset(queryset, page_size, cursor=None, order_field='timestamp'):
+    """
+    Return the page after ``cursor`` with rows in descending (order_field, id) order.
+
+    The page is located with a WHERE clause on the last seen (value, id) pair
+    instead of an OFFSET, so every page costs one index range scan no matter
+    how deep it is.
+    """
+    queryset = queryset.order_by(f'-{order_field}', '-id')
+    if cursor:
+        is_datetime = queryset.model._meta.get_field(order_field).get_internal_type() == 'DateTimeField'
+        value, pk = decode_cursor(cursor, datetime_value=is_datetime)
+        queryset = queryset.filter(
+            Q(**{f'{order_field}__lt': value}) | Q(**{order_field: value, 'id__lt': pk})
+        )
+    rows = list(queryset[:page_size + 1])
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, order_field), last.pk)
+    return KeysetPage(rows, next_cursor)
+
+
+class KeysetPagination(BasePagination):
+    """DRF pagination class using keyset (cursor) pagination on (order_field, id)."""
+
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    order_field = 'timestamp'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def get_order_field(self, request, view):
+        return getattr(view, 'order_field', self.order_field)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        try:
+            self.page = paginate_keyset(
+                queryset,
+                self.get_page_size(request),
+                cursor=request.query_params.get(self.cursor_query_param),
+                order_field=self.get_order_field(request, view),
+            )
+        except InvalidCursor as e:
+            raise NotFound(str(e))
+        return list(self.page)
+
+    def get_next_link(self):
+        if not self.page.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.page.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -0,0 +1,243 @@
+import re
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+from .models import RequestLog, RequestProfile
+
+PERIOD_LENGTHS = {
+    'day': timedelta(days=1),
+    'week': timedelta(weeks=1),
+}
+
+
+def get_partition_period():
+    """Return the configured partition period, or None if partitioning is disabled."""
+    period = getattr(settings, 'REQUEST_LOG_PARTITION_PERIOD', '') or None
+    if period is not None and period not in PERIOD_LENGTHS:
+        raise ValueError(
+            f"REQUEST_LOG_PARTITION_PERIOD must be one of {tuple(PERIOD_LENGTHS)}, got {period!r}"
+        )
+    return period
+
+
+def period_start(moment, period):
+    """Return the UTC start of the period containing ``moment``."""
+    day = moment.astimezone(dt_timezone.utc).date()
+    if period == 'week':
+        day -= timedelta(days=day.weekday())
+    return datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+
+
+def next_period_start(start, period):
+    """Return the start of the period following ``start``."""
+    return start + PERIOD_LENGTHS[period]
+
+
+def partition_name(start):
+    """Return the table name of the partition starting at ``start``."""
+    return f"{RequestLog._meta.db_table}_p{start:%Y%m%d}"
+
+
+class Partition:
+    """A request log partition table with its time bounds (None means unbounded)."""
+
+    def __init__(self, name, start, end):
+        self.name = name
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f"Partition({self.name!r}, {self.start}, {self.end})"
+
+
+class BasePartitionBackend:
+    """Common partition management for one database connection."""
+
+    def __init__(self, connection, period):
+        self.connection = connection
+        self.period = period
+        self.table = RequestLog._meta.db_table
+
+    def quote(self, name):
+        return self.connection.ops.quote_name(name)
+
+    def adapt(self, value):
+        return self.connection.ops.adapt_datetimefield_value(value)
+
+    def install(self):
+        """Prepare the request log table for partitioning."""
+        raise NotImplementedError
+
+    def create_partition(self, start):
+        """Create the partition starting at ``start`` if it does not exist."""
+        raise NotImplementedError
+
+    def list_partitions(self):
+        """Return the existing partitions ordered by start."""
+        raise NotImplementedError
+
+    def drop_partition(self, partition):
+        """Drop a whole partition; this is O(1) regardless of its row count."""
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {self.quote(partition.name)}")
+
+    def create_upcoming(self, now, count):
+        """Create partitions for the current period and the next ``count`` periods."""
+        created = []
+        start = period_start(now, self.period)
+        for _ in range(count + 1):
+            if self.create_partition(start):
+                created.append(partition_name(start))
+            start = next_period_start(start, self.period)
+        return created
+
+    def drop_expired(self, now, retain):
+        """Drop partitions that end before the oldest of the ``retain`` most recent periods."""
+        cutoff = period_start(now, self.period) - PERIOD_LENGTHS[self.period] * (retain - 1)
+        dropped = []
+        for partition in self.list_partitions():
+            if partition.end is not None and partition.end <= cutoff:
+                self.drop_partition(partition)
+                dropped.append(partition.name)
+        if dropped:
+            RequestProfile.objects.using(self.connection.alias).filter(created_at__lt=cutoff).delete()
+        return dropped
+
+
+class PostgresPartitionBackend(BasePartitionBackend):
+    """Native declarative range partitioning on PostgreSQL."""
+
+    bound_re = re.compile(r"FROM \((?:'([^']+)'|MINVALUE)\) TO \((?:'([^']+)'|MAXVALUE)\)")
+
+    def is_partitioned(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [self.table])
+            return cursor.fetchone() is not None
+
+    def install(self):
+        """
+        Convert main_requestlog into a table partitioned by timestamp.
+
+        Existing rows stay in a "legacy" partition covering everything up to the
+        end of the current period, so nothing is copied, and a default partition
+        catches rows outside the created ranges. The model's indexes are created
+        on the partitioned table, so every partition gets them; the legacy
+        table's existing indexes are renamed and attached instead of rebuilt.
+        """
+        if self.is_partitioned():
+            return False
+        table = self.quote(self.table)
+        legacy = self.quote(f"{self.table}_legacy")
+        default = self.quote(f"{self.table}_default")
+        sequence = self.quote(f"{self.table}_part_id_seq")
+        boundary = next_period_start(period_start(timezone.now(), self.period), self.period)
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+            cursor.execute(f'SELECT MAX("timestamp") FROM {table}')
+            newest = cursor.fetchone()[0]
+            if newest is not None and newest >= boundary:
+                boundary = next_period_start(period_start(newest, self.period), self.period)
+            cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+            cursor.execute(
+                "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = %s::regclass AND NOT i.indisprimary",
+                [f"{self.table}_legacy"]
+            )
+            for (index_name,) in cursor.fetchall():
+                # Index names are unique per schema; free them for the parent table
+                cursor.execute(
+                    f"ALTER INDEX {self.quote(index_name)} RENAME TO {self.quote(index_name[:56] + '_legacy')}"
+                )
+            cursor.execute(
+                f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+                f'PARTITION BY RANGE ("timestamp")'
+            )
+            cursor.execute(f"CREATE SEQUENCE {sequence} OWNED BY {table}.id")
+            cursor.execute(f"SELECT setval(%s, COALESCE((SELECT MAX(id) FROM {legacy}), 0) + 1, false)",
+                           [f"{self.table}_part_id_seq"])
+            cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval(%s)",
+                           [f"{self.table}_part_id_seq"])
+            cursor.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, "timestamp")')
+            with self.connection.schema_editor(atomic=False) as editor:
+                # Meta.indexes plus the user foreign key index, under Django's names
+                for statement in editor._model_indexes_sql(RequestLog):
+                    editor.execute(statement)
+            cursor.execute(f"ALTER TABLE {legacy} ALTER COLUMN id DROP IDENTITY IF EXISTS")
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {legacy} FOR VALUES FROM (MINVALUE) TO (%s)",
+                [boundary]
+            )
+            cursor.execute(f"CREATE TABLE {default} PARTITION OF {table} DEFAULT")
+        return True
+
+    def create_partition(self, start):
+        if self.partition_exists(start):
+            return False
+        end = next_period_start(start, self.period)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.quote(partition_name(start))} "
+                f"PARTITION OF {self.quote(self.table)} FOR VALUES FROM (%s) TO (%s)",
+                [start, end]
+            )
+        return True
+
+    def partition_exists(self, start):
+        """Return True if a partition already covers ``start`` (the legacy one may)."""
+        return any(
+            (partition.start is None or partition.start <= start)
+            and (partition.end is None or start < partition.end)
+            for partition in self.list_partitions()
+        )
+
+    def list_partitions(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = %s::regclass",
+                [self.table]
+            )
+            rows = cursor.fetchall()
+        partitions = []
+        for name, bound in rows:
+            match = self.bound_re.search(bound or '')
+            if match is None:
+                # The DEFAULT partition has no bounds and is never dropped
+                continue
+            start, end = (datetime.fromisoformat(value) if value else None for value in match.groups())
+            partitions.append(Partition(name, start, end))
+        return sorted(partitions, key=lambda p: p.start or datetime.min.replace(tzinfo=dt_timezone.utc))
+
+
+def get_partition_backend(using=None):
+    """Return the partition backend for the request log database."""
+    period = get_partition_period()
+    if period is None:
+        raise ValueError("Request log partitioning is disabled; set REQUEST_LOG_PARTITION_PERIOD.")
+    connection = connections[using or router.db_for_write(RequestLog)]
+    if connection.vendor == 'postgresql':
+        return PostgresPartitionBackend(connection, period)
+    # Elsewhere rows would have to be moved into tables the ORM never reads,
+    # so retention is left to purge_request_logs.
+    raise ValueError(
+        f"Request log partitioning is not supported on {connection.vendor}; "
+        f"use the purge_request_logs command for retention."
+    )
+
+
+def maintain_partitions(now=None, premake=None, retain=None, using=None):
+    """
+    Create upcoming partitions and drop expired ones.
+
+    Returns a dict with the names of created and dropped partitions.
+    """
+    now = now or timezone.now()
+    premake = getattr(settings, 'REQUEST_LOG_PARTITION_PREMAKE', 3) if premake is None else premake
+    retain = getattr(settings, 'REQUEST_LOG_PARTITION_RETAIN', 30) if retain is None else retain
+    backend = get_partition_backend(using)
+    result = {'created': backend.create_upcoming(now, premake), 'dropped': []}
+    if retain:
+        result['dropped'] = backend.drop_expired(now, retain)
+    return result
@@ -0,0 +1,311 @@
+import tempfile
+import threading
+from io import BytesIO
+from django.conf import settings
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+from .instrumentation import span
+
+DEFAULT_LAYOUT = 'modern'
+
+_layouts = {}
+
+
+class CVLayout:
+    """
+    A named CV design.
+
+    Paragraph and table styles are built the first time the layout is used
+    and then shared by every render in the process; ReportLab only reads
+    them, so sharing is safe across threads. Subclasses set the page
+    geometry, implement build_styles() and build_story().
+    """
+
+    name = None
+    label = None
+    pagesize = A4
+    margins = {'leftMargin': 2 * cm, 'rightMargin': 2 * cm, 'topMargin': 2 * cm, 'bottomMargin': 2 * cm}
+
+    def __init__(self):
+        """Initialize the layout; styles are built lazily."""
+        self._styles = None
+        self._lock = threading.Lock()
+
+    @property
+    def frame_width(self):
+        """Width available to flowables between the side margins."""
+        return self.pagesize[0] - self.margins['leftMargin'] - self.margins['rightMargin']
+
+    @property
+    def styles(self):
+        """Return the layout's styles, building them on first use."""
+        if self._styles is None:
+            with self._lock:
+                if self._styles is None:
+                    self._styles = self.build_styles(getSampleStyleSheet())
+        return self._styles
+
+    def build_styles(self, sample_styles):
+        """Return a dict of the styles used by build_story()."""
+        raise NotImplementedError
+
+    def build_story(self, cv):
+        """Return the list of flowables for a CV."""
+        raise NotImplementedError
+
+    def render(self, cv, output=None):
+        """
+        Render a CV.
+
+        Writes the PDF to the binary file object ``output`` and returns it, or
+        returns the PDF bytes when no output is given.
+        """
+        if output is not None:
+            doc = SimpleDocTemplate(output, pagesize=self.pagesize, **self.margins)
+            doc.build(self.build_story(cv))
+            return output
+        buffer = BytesIO()
+        self.render(cv, buffer)
+        pdf = buffer.getvalue()
+        buffer.close()
+        return pdf
+
+
+class ModernLayout(CVLayout):
+    """Two-column header with large name, generous spacing and section headings."""
+
+    name = 'modern'
+    label = 'Modern'
+    margins = {'leftMargin': 1.8 * cm, 'rightMargin': 1.8 * cm, 'topMargin': 2 * cm, 'bottomMargin': 1.5 * cm}
+
+    def build_styles(self, sample_styles):
+        return {
+            'name': ParagraphStyle(
+                'NameStyle',
+                parent=sample_styles['Heading1'],
+                fontSize=28,
+                spaceAfter=5,
+                spaceBefore=0,
+                alignment=TA_LEFT,
+                textColor=colors.HexColor('#1a1a1a'),
+                fontName='Helvetica-Bold',
+                leading=32
+            ),
+            'title': ParagraphStyle(
+                'TitleStyle',
+                parent=sample_styles['Normal'],
+                fontSize=14,
+                spaceAfter=20,
+                alignment=TA_LEFT,
+                textColor=colors.HexColor('#666666'),
+                fontName='Helvetica',
+                leading=16
+            ),
+            'contact': ParagraphStyle(
+                'ContactStyle',
+                parent=sample_styles['Normal'],
+                fontSize=10,
+                spaceAfter=3,
+                alignment=TA_RIGHT,
+                textColor=colors.HexColor('#333333'),
+                fontName='Helvetica',
+                leading=12
+            ),
+            'section_heading': ParagraphStyle(
+                'SectionHeading',
+                parent=sample_styles['Heading2'],
+                fontSize=16,
+                spaceAfter=12,
+                spaceBefore=25,
+                textColor=colors.HexColor('#2c3e50'),
+                fontName='Helvetica-Bold',
+                leftIndent=0,
+                leading=18
+            ),
+            'content': ParagraphStyle(
+                'ContentStyle',
+                parent=sample_styles['Normal'],
+                fontSize=10,
+                spaceAfter=8,
+                alignment=TA_JUSTIFY,
+                textColor=colors.HexColor('#333333'),
+                fontName='Helvetica',
+                leading=14,
+                leftIndent=0
+            ),
+            'skills': ParagraphStyle(
+                'SkillsStyle',
+                parent=sample_styles['Normal'],
+                fontSize=10,
+                spaceAfter=6,
+                alignment=TA_LEFT,
+                textColor=colors.HexColor('#34495e'),
+                fontName='Helvetica',
+                leading=14,
+                leftIndent=0
+            ),
+            'footer': ParagraphStyle(
+                'FooterStyle',
+                parent=sample_styles['Normal'],
+                fontSize=8,
+                textColor=colors.HexColor('#95a5a6'),
+                alignment=TA_CENTER,
+                fontName='Helvetica',
+                leading=10
+            ),
+            'header_table': TableStyle([
+                ('ALIGN', (0, 0), (0, 0), 'LEFT'),
+                ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('LEFTPADDING', (0, 0), (-1, -1), 0),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+                ('TOPPADDING', (0, 0), (-1, -1), 0),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+            ]),
+        }
+
+    def build_story(self, cv):
+        styles = self.styles
+        story = []
+
+        # Header section with name and contact info side by side
+        header_table = Table(
+            [[
+                Paragraph(cv.get_full_name(), styles['name']),
+                Paragraph(cv.contacts.replace('\n', '<br/>'), styles['contact'])
+            ]],
+            colWidths=[self.frame_width * 0.6, self.frame_width * 0.4]
+        )
+        header_table.setStyle(styles['header_table'])
+        story.append(header_table)
+
+        # Add professional title
+        story.append(Paragraph("Software Developer", styles['title']))
+
+        # Add decorative line
+        story.append(Spacer(1, 15))
+
+        # Professional Summary Section
+        story.append(Paragraph("Professional Summary", styles['section_heading']))
+        story.append(Paragraph(cv.bio.replace('\n', '<br/>'), styles['content']))
+
+        # Skills & Expertise Section
+        story.append(Paragraph("Technical Skills", styles['section_heading']))
+
+        # Format skills with bullet points for better readability
+        skills_list = [skill.strip() for skill in cv.skills.split(',')]
+        story.append(Paragraph(" • ".join(skills_list), styles['skills']))
+
+        # Projects & Achievements Section
+        story.append(Paragraph("Projects & Achievements", styles['section_heading']))
+        story.append(Paragraph(cv.projects.replace('\n', '<br/>'), styles['content']))
+
+        # Add footer with metadata
+        story.append(Spacer(1, 20))
+        footer_text = f"Generated on {cv.updated_at.strftime('%B %d, %Y')} at {cv.updated_at.strftime('%H:%M')}"
+        story.append(Paragraph(footer_text, styles['footer']))
+
+        metadata_text = f"CV ID: {cv.pk} | Created: {cv.created_at.strftime('%b %d, %Y')} | Updated: {cv.updated_at.strftime('%b %d, %Y')}"
+        story.append(Paragraph(metadata_text, styles['footer']))
+        return story
+
+
+class CompactLayout(CVLayout):
+    """Dense single-column layout with small type, for one-page printouts."""
+
+    name = 'compact'
+    label = 'Compact'
+    margins = {'leftMargin': 1.2 * cm, 'rightMargin': 1.2 * cm, 'topMargin': 1.2 * cm, 'bottomMargin': 1 * cm}
+
+    def build_styles(self, sample_styles):
+        base = sample_styles['Normal']
+        return {
+            'name': ParagraphStyle(
+                'CompactName', parent=base, fontName='Helvetica-Bold', fontSize=18, leading=21,
+                textColor=colors.HexColor('#1a1a1a')
+            ),
+            'contact': ParagraphStyle(
+                'CompactContact', parent=base, fontSize=8.5, leading=10, spaceAfter=8,
+                textColor=colors.HexColor('#555555')
+            ),
+            'section_heading': ParagraphStyle(
+                'CompactHeading', parent=base, fontName='Helvetica-Bold', fontSize=10.5, leading=13,
+                spaceBefore=8, spaceAfter=3, textColor=colors.HexColor('#2c3e50')
+            ),
+            'content': ParagraphStyle(
+                'CompactContent', parent=base, fontSize=8.5, leading=11, spaceAfter=4,
+                alignment=TA_JUSTIFY, textColor=colors.HexColor('#333333')
+            ),
+            'footer': ParagraphStyle(
+                'CompactFooter', parent=base, fontSize=7, leading=8, alignment=TA_CENTER,
+                textColor=colors.HexColor('#95a5a6')
+            ),
+        }
+
+    def build_story(self, cv):
+        styles = self.styles
+        contacts = ' | '.join(line.strip() for line in cv.contacts.splitlines() if line.strip())
+        skills = ', '.join(skill.strip() for skill in cv.skills.split(',') if skill.strip())
+        return [
+            Paragraph(cv.get_full_name(), styles['name']),
+            Paragraph(contacts, styles['contact']),
+            Paragraph("Summary", styles['section_heading']),
+            Paragraph(cv.bio.replace('\n', '<br/>'), styles['content']),
+            Paragraph("Skills", styles['section_heading']),
+            Paragraph(skills, styles['content']),
+            Paragraph("Projects", styles['section_heading']),
+            Paragraph(cv.projects.replace('\n', '<br/>'), styles['content']),
+            Spacer(1, 8),
+            Paragraph(f"CV ID: {cv.pk} | Updated: {cv.updated_at.strftime('%b %d, %Y')}", styles['footer']),
+        ]
+
+
+def register_layout(layout):
+    """Add a layout instance to the registry under its name."""
+    _layouts[layout.name] = layout
+    return layout
+
+
+def get_layout(name=None):
+    """Return the registered layout called ``name``, or the default layout."""
+    try:
+        return _layouts[name or DEFAULT_LAYOUT]
+    except KeyError:
+        raise ValueError(f"Unknown PDF layout: {name}")
+
+
+def get_layout_choices():
+    """Return (name, label) pairs of the registered layouts."""
+    return [(layout.name, layout.label) for layout in _layouts.values()]
+
+
+register_layout(ModernLayout())
+register_layout(CompactLayout())
+
+
+@span('pdf')
+def render_cv_pdf(cv, layout=None):
+    """Render a CV with the named layout and return the PDF bytes."""
+    return get_layout(layout).render(cv)
+
+
+@span('pdf')
+def render_cv_pdf_file(cv, layout=None):
+    """
+    Render a CV into a temporary file and return it rewound.
+
+    The file stays in memory up to PDF_SPOOL_MAX_SIZE bytes and moves to disk
+    beyond that, so large documents are never held as extra bytes copies.
+    """
+    output = tempfile.SpooledTemporaryFile(max_size=getattr(settings, 'PDF_SPOOL_MAX_SIZE', 1024 * 1024))
+    try:
+        get_layout(layout).render(cv, output)
+    except BaseException:
+        output.close()
+        raise
+    output.seek(0)
+    return output
@@ -0,0 +1,175 @@
+import math
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from .models import CV
+from .pdf import get_layout, render_cv_pdf
+from .pdf_cache import PDF_RENDER_VERSION
+
+# Synthetic CV sizes: skills, project entries, bio paragraphs
+CV_SIZES = {
+    'small': {'skills': 10, 'projects': 3, 'bio_paragraphs': 1},
+    'medium': {'skills': 50, 'projects': 15, 'bio_paragraphs': 4},
+    'large': {'skills': 200, 'projects': 60, 'bio_paragraphs': 15},
+    'xlarge': {'skills': 500, 'projects': 200, 'bio_paragraphs': 50},
+}
+
+WORDS = (
+    'design build scale deliver maintain migrate optimize api service data pipeline platform team '
+    'customer latency throughput reliability django python postgres redis celery cloud deploy test '
+    'review mentor lead architecture feature release monitor performance security cost'
+).split()
+
+
+def _sentence(rng, words=12):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def synthetic_cv(size, seed=0):
+    """Return an unsaved CV of the given size with deterministic content."""
+    spec = CV_SIZES[size]
+    rng = random.Random(f'{size}-{seed}')
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return CV(
+        pk=seed + 1,
+        firstname='Benchmark',
+        lastname=size.capitalize(),
+        skills=', '.join(f'{rng.choice(WORDS).capitalize()} {i}' for i in range(spec['skills'])),
+        projects='\n'.join(
+            f"Project {i}: {' '.join(_sentence(rng) for _ in range(3))}" for i in range(spec['projects'])
+        ),
+        bio='\n'.join(' '.join(_sentence(rng) for _ in range(6)) for _ in range(spec['bio_paragraphs'])),
+        contacts='benchmark@example.com\n+1 555 0100\nhttps://example.com',
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def percentile(values, pct):
+    """Return the nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of this process so far, in MiB.
+
+    This is a high-water mark over the whole process, which is why
+    run_benchmark measures every case in a process of its own.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def benchmark_render(cv, layout=None, iterations=20, cold_styles=False, trace_memory=False):
+    """
+    Render a CV repeatedly and return timing, size and memory statistics.
+
+    With ``cold_styles`` the layout's shared styles are dropped before every
+    render, measuring the cost of a first render in a fresh process.
+    """
+    layout_obj = get_layout(layout)
+    timings = []
+    size = 0
+    peak_alloc = 0
+    for _ in range(iterations):
+        if cold_styles:
+            layout_obj._styles = None
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        pdf = render_cv_pdf(cv, layout_obj.name)
+        timings.append(time.perf_counter() - start)
+        if trace_memory:
+            peak_alloc = max(peak_alloc, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        size = len(pdf)
+    total = sum(timings)
+    result = {
+        'iterations': iterations,
+        'renders_per_sec': round(iterations / total, 2) if total else None,
+        'mean_ms': round(total / iterations * 1000, 3),
+        'p50_ms': round(percentile(timings, 50) * 1000, 3),
+        'p90_ms': round(percentile(timings, 90) * 1000, 3),
+        'p99_ms': round(percentile(timings, 99) * 1000, 3),
+        'max_ms': round(max(timings) * 1000, 3),
+        'output_bytes': size,
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    if trace_memory:
+        result['peak_alloc_mb'] = round(peak_alloc / (1024 * 1024), 2)
+    return result
+
+
+def _run_case(size, seed, layout, cold, iterations, warmup, trace_memory):
+    """Benchmark one case; runs in a fresh process so peak_rss_mb belongs to this case alone."""
+    cv = synthetic_cv(size, seed)
+    for _ in range(warmup):
+        render_cv_pdf(cv, layout)
+    return benchmark_render(cv, layout, iterations, cold_styles=cold, trace_memory=trace_memory)
+
+
+def run_benchmark(sizes=None, layouts=None, iterations=20, warmup=2, trace_memory=False, seed=0):
+    """
+    Benchmark PDF rendering for every size and layout, cold and warm.
+
+    Every case runs in a spawned process of its own, so its peak_rss_mb is
+    not inflated by the cases before it. Returns a JSON-serializable dict
+    with environment metadata and one result per (size, layout, styles)
+    combination.
+    """
+    import reportlab
+    from .pdf_bulk import _init_worker
+
+    results = []
+    for size in sizes or list(CV_SIZES):
+        for layout in layouts or [None]:
+            layout_name = get_layout(layout).name
+            for cold in (True, False):
+                with ProcessPoolExecutor(max_workers=1, initializer=_init_worker,
+                                         mp_context=multiprocessing.get_context('spawn')) as executor:
+                    result = executor.submit(
+                        _run_case, size, seed, layout_name, cold, iterations, warmup, trace_memory
+                    ).result()
+                results.append({'size': size, 'layout': layout_name, 'styles': 'cold' if cold else 'warm', **result})
+    return {
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'reportlab': reportlab.Version,
+        'platform': platform.platform(),
+        'pdf_render_version': PDF_RENDER_VERSION,
+        'iterations': iterations,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def compare_to_baseline(report, baseline, max_regression=0.2):
+    """
+    Return descriptions of results whose throughput fell more than ``max_regression``.
+
+    Results are matched on size, layout and styles; combinations missing from
+    the baseline are ignored.
+    """
+    previous = {(r['size'], r['layout'], r['styles']): r for r in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        old = previous.get((result['size'], result['layout'], result['styles']))
+        if not old or not old.get('renders_per_sec') or not result['renders_per_sec']:
+            continue
+        change = result['renders_per_sec'] / old['renders_per_sec'] - 1
+        if change < -max_regression:
+            regressions.append(
+                f"{result['size']}/{result['layout']}/{result['styles']}: "
+                f"{old['renders_per_sec']} -> {result['renders_per_sec']} renders/sec ({change:+.0%})"
+            )
+    return regressions
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from django.conf import settings
+from django.utils.text import slugify
+
+# Submitted but unfinished renders per worker; bounds memory on large exports
+MAX_PENDING_PER_WORKER = 2
+
+
+def _init_worker():
+    """Set up Django in pool workers started with spawn or forkserver."""
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+def _render_in_worker(cv, layout):
+    """Render one CV in a pool worker; the CV instance is passed in, so no DB access."""
+    from .pdf import render_cv_pdf
+    return cv, render_cv_pdf(cv, layout)
+
+
+def get_worker_count(workers=None):
+    """Return the number of render processes to use."""
+    return workers or getattr(settings, 'PDF_BULK_WORKERS', 0) or os.cpu_count() or 1
+
+
+def iter_cv_pdfs(cvs, layout=None, workers=None):
+    """
+    Yield (cv, pdf_bytes) for every CV, reusing cached PDFs.
+
+    Cached PDFs are yielded right away; the rest are rendered in a
+    ProcessPoolExecutor, since ReportLab is CPU-bound and holds the GIL, and
+    are yielded in completion order and stored in the PDF cache.
+    """
+    from .pdf_cache import get_pdf_cache, pdf_cache_key
+
+    pdf_cache = get_pdf_cache()
+    workers = get_worker_count(workers)
+    missing = []
+    for cv in cvs:
+        data = pdf_cache.get(pdf_cache_key(cv, layout))
+        if data is None:
+            missing.append(cv)
+        else:
+            yield cv, data
+
+    if not missing:
+        return
+    if workers == 1 or len(missing) == 1:
+        from .pdf import render_cv_pdf
+        for cv in missing:
+            data = render_cv_pdf(cv, layout)
+            _store(pdf_cache, pdf_cache_key(cv, layout), data)
+            yield cv, data
+        return
+
+    # Spawned workers, since forking a process with running threads (gunicorn
+    # threads, DB and cache clients) can deadlock the child on a held lock
+    with ProcessPoolExecutor(max_workers=min(workers, len(missing)), initializer=_init_worker,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        queue = iter(missing)
+        pending = set()
+        while True:
+            for cv in queue:
+                pending.add(executor.submit(_render_in_worker, cv, layout))
+                if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                cv, data = future.result()
+                _store(pdf_cache, pdf_cache_key(cv, layout), data)
+                yield cv, data
+
+
+def _store(pdf_cache, key, data):
+    try:
+        pdf_cache.set(key, data)
+    except OSError as e:
+        print(f"Error caching PDF {key}: {e}")
+
+
+def pdf_filename(cv):
+    """Return the name of a CV's PDF inside the ZIP archive."""
+    return f"{cv.pk}_{slugify(cv.get_full_name()) or 'cv'}.pdf"
+
+
+class _ZipStream:
+    """Write-only buffer that ZipFile writes to and the generator drains."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def iter_pdf_zip(cvs, layout=None, workers=None):
+    """
+    Yield a ZIP archive of CV PDFs in chunks, one file at a time as renders finish.
+
+    PDFs are already compressed, so they are stored without deflating.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for cv, data in iter_cv_pdfs(cvs, layout, workers):
+            archive.writestr(pdf_filename(cv), data)
+            yield stream.drain()
+    yield stream.drain()
+
+
+def write_pdf_zip(cvs, path, layout=None, workers=None):
+    """Write a ZIP archive of CV PDFs to ``path`` and return the number of PDFs."""
+    count = 0
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for cv, data in iter_cv_pdfs(cvs, layout, workers):
+            archive.writestr(pdf_filename(cv), data)
+            count += 1
+    return count
@@ -0,0 +1,189 @@
+import glob
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from django.conf import settings
+from django.core.cache import caches
+from .pdf import get_layout, render_cv_pdf, render_cv_pdf_file
+
+# Bump when the PDF rendering code changes so cached files are rebuilt
+PDF_RENDER_VERSION = 1
+
+
+def pdf_cache_key(cv, layout=None):
+    """
+    Return the cache key of a CV's PDF in a layout.
+
+    The key changes whenever the CV is saved (updated_at) or the rendering
+    code changes, so cached entries never need to be invalidated.
+    """
+    version = int(cv.updated_at.timestamp() * 1000000)
+    return f"cv{cv.pk}-{get_layout(layout).name}-{version}-r{PDF_RENDER_VERSION}"
+
+
+def pdf_etag(cv, layout=None):
+    """Return the ETag header value of a CV's PDF in a layout."""
+    return f'"{pdf_cache_key(cv, layout)}"'
+
+
+class FileSystemPDFCache:
+    """Store rendered PDFs as files in a directory."""
+
+    def __init__(self, directory):
+        """Initialize the cache in ``directory``."""
+        self.directory = str(directory)
+
+    def path(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key):
+        """Return the cached PDF bytes, or None."""
+        try:
+            with open(self.path(key), 'rb') as handle:
+                return handle.read()
+        except FileNotFoundError:
+            return None
+
+    def open(self, key):
+        """Return the cached PDF as an open binary file, or None."""
+        try:
+            return open(self.path(key), 'rb')
+        except FileNotFoundError:
+            return None
+
+    def set(self, key, data):
+        """Store PDF bytes and remove older versions of the same CV and layout."""
+        self._write(key, lambda handle: handle.write(data))
+
+    def set_file(self, key, fileobj):
+        """Store a PDF from a binary file object, copying it in chunks."""
+        self._write(key, lambda handle: shutil.copyfileobj(fileobj, handle))
+
+    def _write(self, key, write):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as handle:
+                write(handle)
+            # Atomic, so concurrent readers never see a partial file
+            os.replace(tmp_path, self.path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        cv_prefix = key.rsplit('-', 2)[0]
+        for old_path in glob.glob(os.path.join(self.directory, f"{glob.escape(cv_prefix)}-*.pdf")):
+            if old_path != self.path(key):
+                try:
+                    os.remove(old_path)
+                except FileNotFoundError:
+                    pass
+
+
+class DjangoCachePDFCache:
+    """Store rendered PDFs in a Django cache backend."""
+
+    def __init__(self, alias='default', timeout=None):
+        """Initialize the cache on the cache ``alias``."""
+        self.alias = alias
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def get(self, key):
+        """Return the cached PDF bytes, or None."""
+        return self.cache.get(f"cv_pdf:{key}")
+
+    def open(self, key):
+        """Return the cached PDF as a binary file object, or None."""
+        data = self.get(key)
+        return None if data is None else BytesIO(data)
+
+    def set(self, key, data):
+        """Store PDF bytes; older versions expire with the cache timeout."""
+        self.cache.set(f"cv_pdf:{key}", data, self.timeout)
+
+    def set_file(self, key, fileobj):
+        """Store a PDF from a binary file object."""
+        self.set(key, fileobj.read())
+
+
+class NullPDFCache:
+    """Cache that stores nothing, used when PDF caching is disabled."""
+
+    def get(self, key):
+        return None
+
+    def open(self, key):
+        return None
+
+    def set(self, key, data):
+        pass
+
+    def set_file(self, key, fileobj):
+        pass
+
+
+def get_pdf_cache():
+    """Return the PDF cache configured by the PDF_CACHE_* settings."""
+    backend = getattr(settings, 'PDF_CACHE_BACKEND', 'filesystem')
+    if backend == 'filesystem':
+        return FileSystemPDFCache(getattr(settings, 'PDF_CACHE_DIR', os.path.join(settings.BASE_DIR, 'pdf_cache')))
+    if backend == 'cache':
+        return DjangoCachePDFCache(
+            getattr(settings, 'PDF_CACHE_ALIAS', 'default'),
+            getattr(settings, 'PDF_CACHE_TIMEOUT', None),
+        )
+    if not backend:
+        return NullPDFCache()
+    raise ValueError(f"PDF_CACHE_BACKEND must be 'filesystem', 'cache' or empty, got {backend!r}")
+
+
+def get_cached_cv_pdf(cv, layout=None):
+    """Return the cached PDF bytes of a CV's current version, or None; never renders."""
+    return get_pdf_cache().get(pdf_cache_key(cv, layout))
+
+
+def get_cv_pdf(cv, layout=None):
+    """Return the PDF bytes of a CV from the cache, rendering and storing them on a miss."""
+    pdf_cache = get_pdf_cache()
+    key = pdf_cache_key(cv, layout)
+    data = pdf_cache.get(key)
+    if data is None:
+        data = render_cv_pdf(cv, layout)
+        try:
+            pdf_cache.set(key, data)
+        except OSError as e:
+            # Serving the PDF matters more than caching it
+            print(f"Error caching PDF for CV {cv.pk}: {e}")
+    return data
+
+
+def open_cached_cv_pdf(cv, layout=None):
+    """Return the cached PDF of a CV's current version as an open file, or None; never renders."""
+    return get_pdf_cache().open(pdf_cache_key(cv, layout))
+
+
+def open_cv_pdf(cv, layout=None):
+    """
+    Return the PDF of a CV as an open binary file, rendering and storing it on a miss.
+
+    Cache hits on the filesystem backend return the cached file itself, and
+    misses are rendered into a spooled temporary file, so serving a PDF holds
+    at most one copy of it in memory.
+    """
+    pdf_cache = get_pdf_cache()
+    key = pdf_cache_key(cv, layout)
+    handle = pdf_cache.open(key)
+    if handle is not None:
+        return handle
+    handle = render_cv_pdf_file(cv, layout)
+    try:
+        pdf_cache.set_file(key, handle)
+    except OSError as e:
+        print(f"Error caching PDF for CV {cv.pk}: {e}")
+    handle.seek(0)
+    return handle
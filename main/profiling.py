@@ -0,0 +1,143 @@
+import cProfile
+import io
+import marshal
+import pstats
+import random
+from django.conf import settings
+
+# Deeper call chains are cut off in collapsed stacks
+MAX_STACK_DEPTH = 64
+
+
+class SlowRequestProfiler:
+    """
+    Profile a sample of requests with cProfile and keep only the slow ones.
+
+    The sampling decision is one random() call, so requests that are not
+    sampled pay nothing else. Sampled requests are profiled from just before
+    the view runs until the response comes back, and the profile is kept only
+    when the request took at least ``threshold_ms``. ``views`` restricts
+    profiling to the given URL names; an empty list profiles every view.
+    """
+
+    def __init__(self, enabled=False, sample_rate=0.0, threshold_ms=500, views=()):
+        """Initialize the profiler policy."""
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.threshold_ms = threshold_ms
+        self.views = set(views)
+
+    @classmethod
+    def from_settings(cls):
+        """Build the profiler from the REQUEST_PROFILE_* settings."""
+        return cls(
+            enabled=getattr(settings, 'REQUEST_PROFILING_ENABLED', False),
+            sample_rate=getattr(settings, 'REQUEST_PROFILE_SAMPLE_RATE', 0.0),
+            threshold_ms=getattr(settings, 'REQUEST_PROFILE_THRESHOLD_MS', 500),
+            views=getattr(settings, 'REQUEST_PROFILE_VIEWS', ()),
+        )
+
+    def should_profile(self, request):
+        """Return True if this request should be profiled."""
+        if not self.enabled or random.random() >= self.sample_rate:
+            return False
+        if not self.views:
+            return True
+        match = getattr(request, 'resolver_match', None)
+        return match is not None and match.view_name in self.views
+
+    def start(self, request):
+        """Start profiling the request if it is sampled."""
+        if not self.should_profile(request):
+            return
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return
+        request.profiler = profiler
+
+    def stop(self, request, response_time):
+        """
+        Stop profiling the request.
+
+        Returns the pstats data when the request was profiled and slower than
+        the threshold, otherwise None.
+        """
+        profiler = getattr(request, 'profiler', None)
+        if profiler is None:
+            return None
+        profiler.disable()
+        request.profiler = None
+        if response_time * 1000 < self.threshold_ms:
+            return None
+        return dump_stats(profiler)
+
+
+def dump_stats(profiler):
+    """Serialize a profiler's stats in the format written by pstats.dump_stats()."""
+    return marshal.dumps(pstats.Stats(profiler).stats)
+
+
+def load_stats(data):
+    """Load serialized stats into a pstats.Stats object."""
+    stats = pstats.Stats()
+    stats.stats = marshal.loads(bytes(data))
+    stats.get_top_level_stats()
+    return stats
+
+
+def format_summary(stats, limit=30):
+    """Return the top functions by cumulative time as text."""
+    stream = io.StringIO()
+    stats.stream = stream
+    stats.sort_stats('cumulative').print_stats(limit)
+    return stream.getvalue()
+
+
+def _label(func):
+    filename, line, name = func
+    if filename == '~':
+        # Built-in functions
+        return name
+    return f"{name} ({filename}:{line})"
+
+
+def collapsed_stacks(stats):
+    """
+    Convert pstats call graph data into collapsed stacks for flamegraph tools.
+
+    cProfile records caller/callee pairs rather than full stacks, so each
+    function's time is split between its callees in proportion to the time
+    recorded on each call edge. Values are in microseconds. The result can be
+    fed to flamegraph.pl or speedscope.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller, edge in callers.items():
+            callees.setdefault(caller, []).append((func, edge[3]))
+
+    roots = [(func, entry[3]) for func, entry in stats.stats.items() if not entry[4]]
+    # Skip branches below 0.01% of the profile to keep the output small
+    min_time = sum(cumulative for _, cumulative in roots) / 10000
+    lines = {}
+
+    def walk(func, stack, cumulative):
+        total = stats.stats[func][3]
+        if not total or cumulative < min_time or len(stack) >= MAX_STACK_DEPTH:
+            return
+        stack = stack + [_label(func)]
+        share = min(cumulative / total, 1.0)
+        self_time = int(stats.stats[func][2] * share * 1e6)
+        if self_time:
+            key = ';'.join(stack)
+            lines[key] = lines.get(key, 0) + self_time
+        for callee, edge_cumulative in callees.get(func, ()):
+            if _label(callee) not in stack:
+                walk(callee, stack, edge_cumulative * share)
+
+    for func, cumulative in roots:
+        walk(func, [], cumulative)
+
+    return ''.join(f"{stack} {value}\n" for stack, value in sorted(lines.items()))
@@ -0,0 +1,110 @@
+import gzip
+import json
+import os
+import time
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import router, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import RequestLog, RequestProfile
+
+
+class PurgeResult:
+    """Summary of a retention run."""
+
+    def __init__(self):
+        self.deleted = 0
+        self.batches = 0
+        self.elapsed = 0.0
+        self.archive_path = None
+
+    @property
+    def rows_per_second(self):
+        return self.deleted / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        text = (f"Deleted {self.deleted} request logs in {self.batches} batches "
+                f"({self.elapsed:.1f}s, {self.rows_per_second:.0f} rows/s)")
+        if self.archive_path:
+            text += f", archived to {self.archive_path}"
+        return text
+
+
+def purge_request_logs(before=None, keep_latest=None, batch_size=5000, archive_dir=None,
+                       pause=0.0, progress=None):
+    """
+    Delete old request logs in bounded primary-key batches.
+
+    Rows are deleted if they are older than ``before`` and/or outside the
+    ``keep_latest`` newest rows by timestamp (both conditions must hold when
+    both are given). Each batch walks the primary key index from the last deleted id,
+    so memory stays at one batch and every transaction is short. With
+    ``archive_dir`` each batch is appended to a gzip JSON Lines file before it
+    is deleted. ``pause`` sleeps between batches to leave room for other
+    writers, and ``progress`` is called with the running PurgeResult.
+    """
+    if before is None and keep_latest is None:
+        raise ValueError("Either before or keep_latest is required.")
+
+    using = router.db_for_write(RequestLog)
+    result = PurgeResult()
+    candidates = RequestLog.objects.using(using).all()
+    if before is not None:
+        candidates = candidates.filter(timestamp__lt=before)
+    if keep_latest:
+        # Newest by timestamp, not id: buffered inserts from several workers
+        # reach the table out of time order
+        oldest_kept = list(
+            RequestLog.objects.using(using).order_by('-timestamp', '-id').values_list('timestamp', 'id')
+            [keep_latest - 1:keep_latest]
+        )
+        if not oldest_kept:
+            # Fewer rows than we want to keep
+            return result
+        cutoff_time, cutoff_id = oldest_kept[0]
+        candidates = candidates.filter(
+            Q(timestamp__lt=cutoff_time) | Q(timestamp=cutoff_time, id__lt=cutoff_id)
+        )
+
+    archive = None
+    started = time.monotonic()
+    last_id = 0
+    try:
+        while True:
+            ids = list(
+                candidates.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            batch = candidates.filter(id__gte=ids[0], id__lte=ids[-1])
+
+            if archive_dir is not None:
+                if archive is None:
+                    os.makedirs(archive_dir, exist_ok=True)
+                    result.archive_path = os.path.join(
+                        archive_dir, f"request_logs_{timezone.now():%Y%m%dT%H%M%S}.jsonl.gz"
+                    )
+                    archive = gzip.open(result.archive_path, 'at', encoding='utf-8')
+                for row in batch.values().iterator():
+                    archive.write(json.dumps(row, cls=DjangoJSONEncoder) + '\n')
+                archive.flush()
+
+            with transaction.atomic(using=using):
+                RequestProfile.objects.using(using).filter(request_log_id__in=ids).delete()
+                _, deleted_by_model = batch.delete()
+
+            last_id = ids[-1]
+            result.deleted += deleted_by_model.get(RequestLog._meta.label, 0)
+            result.batches += 1
+            result.elapsed = time.monotonic() - started
+            if progress is not None:
+                progress(result)
+            if len(ids) < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
+    finally:
+        if archive is not None:
+            archive.close()
+    result.elapsed = time.monotonic() - started
+    return result
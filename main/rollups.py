@@ -0,0 +1,253 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import router, transaction
+from django.db.models import Q, Sum
+from django.utils import timezone
+from .models import RequestLog, RequestMetricRollup, RollupCheckpoint
+
+# Upper bounds in seconds of the latency histogram buckets; a final bucket
+# counts everything slower than the last bound.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+GRANULARITIES = ('minute', 'hour', 'day')
+
+CHECKPOINT_NAME = 'request_logs'
+
+
+def latency_bucket(latency):
+    """Return the histogram bucket index for a latency in seconds."""
+    return bisect_left(LATENCY_BUCKETS, latency)
+
+
+def empty_histogram():
+    """Return an empty latency histogram."""
+    return [0] * (len(LATENCY_BUCKETS) + 1)
+
+
+def truncate(moment, granularity):
+    """Return the start of the bucket containing ``moment``."""
+    if granularity == 'minute':
+        return moment.replace(second=0, microsecond=0)
+    if granularity == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def estimate_percentile(histogram, quantile):
+    """
+    Estimate a latency percentile from histogram counts.
+
+    Returns the upper bound of the bucket that holds the percentile, or None
+    for an empty histogram.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = quantile * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return LATENCY_BUCKETS[min(index, len(LATENCY_BUCKETS) - 1)]
+    return LATENCY_BUCKETS[-1]
+
+
+def merge_histograms(histograms):
+    """Add several histograms together."""
+    merged = empty_histogram()
+    for histogram in histograms:
+        for index, count in enumerate(histogram):
+            merged[index] += count
+    return merged
+
+
+def rollup_request_logs(batch_size=5000, max_batches=None, now=None):
+    """
+    Fold request log rows added since the last run into the rollup tables.
+
+    Rows are read in (timestamp, id) order from the checkpoint, aggregated in
+    memory per minute, hour and day, and merged into existing rollup rows in
+    one short transaction per batch. Each batch locks the checkpoint row
+    before reading logs, so overlapping runs wait for each other instead of
+    counting the same rows twice. Returns the number of log rows processed.
+
+    Only rows older than REQUEST_LOG_ROLLUP_LAG seconds are read. Ids are
+    assigned when a row is inserted but rows only become visible when their
+    transaction commits, and buffered flushes from several workers commit
+    out of order, so a high-water id would skip rows that were still in
+    flight. The settle window gives them time to commit.
+    """
+    using = router.db_for_write(RequestMetricRollup)
+    now = now or timezone.now()
+    settled = now - timedelta(seconds=getattr(settings, 'REQUEST_LOG_ROLLUP_LAG', 120))
+    RollupCheckpoint.objects.using(using).get_or_create(name=CHECKPOINT_NAME)
+    processed = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic(using=using):
+            checkpoint = RollupCheckpoint.objects.using(using).select_for_update().get(name=CHECKPOINT_NAME)
+            pending = RequestLog.objects.using(using).filter(timestamp__lt=settled)
+            if checkpoint.last_timestamp is not None:
+                pending = pending.filter(
+                    Q(timestamp__gt=checkpoint.last_timestamp)
+                    | Q(timestamp=checkpoint.last_timestamp, id__gt=checkpoint.last_id)
+                )
+            rows = list(
+                pending.order_by('timestamp', 'id')
+                .values_list('id', 'timestamp', 'path', 'method', 'response_status', 'response_time')
+                [:batch_size]
+            )
+            if not rows:
+                break
+
+            aggregates = defaultdict(lambda: [0, 0, 0.0, empty_histogram()])
+            for _, timestamp, path, method, status, latency in rows:
+                bucket = latency_bucket(latency)
+                for granularity in GRANULARITIES:
+                    entry = aggregates[(granularity, truncate(timestamp, granularity), path, method, status)]
+                    entry[0] += 1
+                    entry[1] += status >= 500
+                    entry[2] += latency
+                    entry[3][bucket] += 1
+
+            _merge_aggregates(aggregates, using)
+            checkpoint.last_id, checkpoint.last_timestamp = rows[-1][:2]
+            checkpoint.save(using=using, update_fields=['last_id', 'last_timestamp', 'updated_at'])
+
+        processed += len(rows)
+        batches += 1
+        if len(rows) < batch_size:
+            break
+    return processed
+
+
+def _merge_aggregates(aggregates, using):
+    """Add in-memory aggregates to existing rollup rows or create new ones."""
+    starts_by_granularity = defaultdict(set)
+    for granularity, bucket_start, *_ in aggregates:
+        starts_by_granularity[granularity].add(bucket_start)
+
+    existing = {}
+    for granularity, starts in starts_by_granularity.items():
+        for rollup in RequestMetricRollup.objects.using(using).select_for_update().filter(
+            granularity=granularity, bucket_start__in=starts
+        ):
+            key = (rollup.granularity, rollup.bucket_start, rollup.path, rollup.method, rollup.response_status)
+            existing[key] = rollup
+
+    to_update, to_create = [], []
+    for key, (count, errors, latency_sum, histogram) in aggregates.items():
+        rollup = existing.get(key)
+        if rollup is None:
+            granularity, bucket_start, path, method, status = key
+            to_create.append(RequestMetricRollup(
+                granularity=granularity,
+                bucket_start=bucket_start,
+                path=path,
+                method=method,
+                response_status=status,
+                request_count=count,
+                error_count=errors,
+                latency_sum=latency_sum,
+                latency_buckets=histogram,
+            ))
+        else:
+            rollup.request_count += count
+            rollup.error_count += errors
+            rollup.latency_sum += latency_sum
+            rollup.latency_buckets = merge_histograms([rollup.latency_buckets or empty_histogram(), histogram])
+            to_update.append(rollup)
+
+    RequestMetricRollup.objects.using(using).bulk_create(to_create)
+    RequestMetricRollup.objects.using(using).bulk_update(
+        to_update, ['request_count', 'error_count', 'latency_sum', 'latency_buckets']
+    )
+
+
+def count_requests(start=None, end=None):
+    """Return the number of requests between two day boundaries, read from day rollups."""
+    rollups = RequestMetricRollup.objects.filter(granularity='day')
+    if start is not None:
+        rollups = rollups.filter(bucket_start__gte=start)
+    if end is not None:
+        rollups = rollups.filter(bucket_start__lt=end)
+    return rollups.aggregate(total=Sum('request_count'))['total'] or 0
+
+
+def get_request_stats(granularity='hour', since=None, until=None, top=5):
+    """
+    Summarize rollups over a time range.
+
+    Returns totals, a per-bucket series and the busiest paths. Only rollup
+    rows are read, so the cost depends on the number of buckets and routes,
+    not on raw request volume.
+    """
+    until = until or timezone.now()
+    since = since or until - timedelta(hours=24)
+    rollups = RequestMetricRollup.objects.filter(
+        granularity=granularity,
+        bucket_start__gte=truncate(since, granularity),
+        bucket_start__lt=until,
+    ).values_list('bucket_start', 'path', 'method', 'request_count', 'error_count',
+                  'latency_sum', 'latency_buckets')
+
+    series = defaultdict(lambda: [0, 0, 0.0, []])
+    paths = defaultdict(lambda: [0, 0, 0.0])
+    for bucket_start, path, method, count, errors, latency_sum, histogram in rollups:
+        point = series[bucket_start]
+        point[0] += count
+        point[1] += errors
+        point[2] += latency_sum
+        point[3].append(histogram)
+        path_entry = paths[(method, path)]
+        path_entry[0] += count
+        path_entry[1] += errors
+        path_entry[2] += latency_sum
+
+    points = []
+    for bucket_start in sorted(series):
+        count, errors, latency_sum, histograms = series[bucket_start]
+        histogram = merge_histograms(histograms)
+        points.append({
+            'bucket_start': bucket_start,
+            'request_count': count,
+            'error_count': errors,
+            'avg_latency': latency_sum / count if count else None,
+            'p95_latency': estimate_percentile(histogram, 0.95),
+            'histogram': histogram,
+        })
+
+    overall = merge_histograms(point['histogram'] for point in points)
+    request_count = sum(point['request_count'] for point in points)
+    error_count = sum(point['error_count'] for point in points)
+    latency_sum = sum(entry[2] for entry in paths.values())
+    top_paths = sorted(paths.items(), key=lambda item: item[1][0], reverse=True)[:top]
+
+    return {
+        'granularity': granularity,
+        'since': since,
+        'until': until,
+        'totals': {
+            'request_count': request_count,
+            'error_count': error_count,
+            'error_rate': error_count / request_count if request_count else 0.0,
+            'avg_latency': latency_sum / request_count if request_count else None,
+            'p50_latency': estimate_percentile(overall, 0.5),
+            'p95_latency': estimate_percentile(overall, 0.95),
+            'p99_latency': estimate_percentile(overall, 0.99),
+        },
+        'series': points,
+        'top_paths': [
+            {
+                'method': method,
+                'path': path,
+                'request_count': count,
+                'error_count': errors,
+                'avg_latency': latency_sum / count if count else None,
+            }
+            for (method, path), (count, errors, latency_sum) in top_paths
+        ],
+        'latency_buckets': list(LATENCY_BUCKETS),
+    }
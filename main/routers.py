@@ -0,0 +1,52 @@
+from django.conf import settings
+
+
+class TelemetryRouter:
+    """
+    Database router that keeps telemetry models on their own database alias.
+
+    Request logs and other monitoring data are read, written and migrated on
+    the alias named by REQUEST_LOG_DATABASE, so logging traffic does not
+    compete with CV data on the default database.
+    """
+
+    telemetry_models = {
+        'main.requestlog', 'main.requestmetricrollup', 'main.rollupcheckpoint', 'main.requestprofile',
+    }
+
+    def get_telemetry_database(self):
+        """Return the alias that holds telemetry tables."""
+        return getattr(settings, 'REQUEST_LOG_DATABASE', 'default')
+
+    def is_telemetry(self, model=None, app_label=None, model_name=None):
+        """Return True if the model belongs on the telemetry database."""
+        if model is not None:
+            app_label, model_name = model._meta.app_label, model._meta.model_name
+        return f'{app_label}.{model_name}' in self.telemetry_models
+
+    def db_for_read(self, model, **hints):
+        """Send telemetry reads to the telemetry database."""
+        if self.is_telemetry(model):
+            return self.get_telemetry_database()
+        return None
+
+    def db_for_write(self, model, **hints):
+        """Send telemetry writes to the telemetry database."""
+        if self.is_telemetry(model):
+            return self.get_telemetry_database()
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allow telemetry rows to reference objects on other databases (e.g. users)."""
+        if self.is_telemetry(obj1) or self.is_telemetry(obj2):
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """Create telemetry tables only on the telemetry database, and nothing else there."""
+        telemetry_db = self.get_telemetry_database()
+        if model_name is not None and self.is_telemetry(app_label=app_label, model_name=model_name):
+            return db == telemetry_db
+        if db == telemetry_db and telemetry_db != 'default':
+            return False
+        return None
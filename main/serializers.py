@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import CV
+from .models import CV, RequestLog
 
 
 class CVSerializer(serializers.ModelSerializer):
@@ -39,4 +39,17 @@ class CVListSerializer(serializers.ModelSerializer):
     
     def get_full_name(self, obj):
         """Get the full name of the CV."""
-        return obj.get_full_name() 
\ No newline at end of file
+        return obj.get_full_name() 
+
+
+class RequestLogSerializer(serializers.ModelSerializer):
+    """Read-only serializer for request logs."""
+    
+    class Meta:
+        model = RequestLog
+        fields = [
+            'id', 'timestamp', 'method', 'path', 'query_string', 'remote_ip',
+            'user_agent', 'response_status', 'response_time', 'user_id', 'is_authenticated',
+            'db_query_count', 'db_time', 'template_time', 'trace'
+        ]
+        read_only_fields = fields
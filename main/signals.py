@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from .models import CV
+
+# Extra lifetime of the queued flag after the job is due
+PRERENDER_FLAG_GRACE = 300
+
+
+def schedule_cv_pdf_prerender(cv_id, version):
+    """
+    Queue a pre-render job for a version of a CV.
+
+    ``version`` is the CV's updated_at in microseconds. The job runs
+    PDF_PRERENDER_DELAY seconds later and does nothing if the CV was saved
+    again in the meantime, so a burst of saves renders only the latest
+    version. Each version is queued once; since a newer version always gets
+    its own job, this does not depend on the cache being shared with the
+    Celery workers. Returns True if a job was queued.
+    """
+    from .tasks import check_broker, pdf_prerender_flag, prerender_cv_pdf_task
+
+    delay = getattr(settings, 'PDF_PRERENDER_DELAY', 10)
+    flag = pdf_prerender_flag(cv_id, version)
+    if not cache.add(flag, True, delay + PRERENDER_FLAG_GRACE):
+        return False
+    try:
+        # Saving a CV must not wait for Celery's retries when the broker is down
+        check_broker()
+        prerender_cv_pdf_task.apply_async(args=[cv_id, version], countdown=delay, retry=False)
+    except Exception as e:
+        cache.delete(flag)
+        print(f"Error scheduling PDF pre-render for CV {cv_id}: {e}")
+        return False
+    return True
+
+
+@receiver(post_save, sender=CV, dispatch_uid='main.prerender_cv_pdf')
+def prerender_cv_pdf_on_save(sender, instance, raw=False, **kwargs):
+    """Schedule a PDF pre-render once the transaction saving a CV commits."""
+    if raw or not getattr(settings, 'PDF_PRERENDER_ON_SAVE', False):
+        return
+    # Read the version at commit time, so several saves in one transaction queue one job
+    transaction.on_commit(
+        lambda: schedule_cv_pdf_prerender(instance.pk, int(instance.updated_at.timestamp() * 1000000))
+    )
@@ -1,8 +1,15 @@
 import time
-from celery import shared_task
+from celery import current_app, shared_task
+from django.core.cache import cache
 from django.core.mail import send_mail
 from django.conf import settings
-from .models import CV, RequestLog
+from .models import CV
+
+
+def check_broker():
+    """Raise if the Celery broker cannot be reached, without Celery's retry delays."""
+    with current_app.pool.acquire(block=True, timeout=1) as connection:
+        connection.ensure_connection(max_retries=0)
 
 
 @shared_task
@@ -58,47 +65,177 @@ def send_cv_notification_task(cv_id, recipient_email):
 
 
 @shared_task
-def generate_cv_pdf_task(cv_id):
+def generate_cv_pdf_task(cv_id, layout=None):
     """
-    Background task to generate CV PDF.
+    Background task to render a CV PDF into the PDF cache.
+    
+    The result is stored under the CV's current version, where
+    cv_pdf_download and the PDF artifact API pick it up without rendering.
+    Errors are raised rather than returned, so the task ends in the FAILURE
+    state and pdf_task_status_api does not offer a download that would 404.
     
     Args:
         cv_id (int): ID of the CV to generate PDF for
+        layout (str): Name of the PDF layout, or None for the default
     """
+    from .pdf_cache import get_cv_pdf
+    
+    cv = CV.objects.get(id=cv_id)
+    pdf = get_cv_pdf(cv, layout)
+    return f"PDF generated successfully for {cv.get_full_name()} ({len(pdf)} bytes)"
+
+
+def pdf_prerender_flag(cv_id, version):
+    """Return the cache key marking a queued pre-render job for a CV version."""
+    return f'pdf_prerender:{cv_id}:{version}'
+
+
+@shared_task
+def prerender_cv_pdf_task(cv_id, version=None):
+    """
+    Background task to pre-render a CV's PDFs after it was saved.
+    
+    The job is skipped if the CV was saved again after ``version`` (its
+    updated_at in microseconds), since that save queued its own job; so a
+    burst of saves renders once. Layouts already cached for the version are
+    skipped. Translations for PDF_PRERENDER_LANGUAGES are warmed as well.
+    
+    Args:
+        cv_id (int): ID of the CV to pre-render
+        version (int): Version the job was queued for, or None for the latest
+    """
+    from .pdf_cache import open_cv_pdf
+    from .pdf import DEFAULT_LAYOUT
+    
     try:
         cv = CV.objects.get(id=cv_id)
-        # Simulate PDF generation process
-        time.sleep(2)  # Simulate processing time
-        
-        # In a real implementation, you would generate the PDF here
-        # For now, we'll just return a success message
-        return f"PDF generated successfully for {cv.get_full_name()}"
     except CV.DoesNotExist:
         return f"CV with ID {cv_id} not found"
+    if version is not None and int(cv.updated_at.timestamp() * 1000000) != version:
+        return f"Skipped pre-render of {cv.get_full_name()}: a newer version is queued"
+    
+    rendered = []
+    failed = []
+    for layout in getattr(settings, 'PDF_PRERENDER_LAYOUTS', None) or [DEFAULT_LAYOUT]:
+        try:
+            open_cv_pdf(cv, layout).close()
+            rendered.append(layout)
+        except Exception as e:
+            failed.append(f"{layout}: {e}")
+    
+    languages = getattr(settings, 'PDF_PRERENDER_LANGUAGES', [])
+    if languages:
+        from .translation_service import TranslationService
+        try:
+            translation_service = TranslationService()
+        except Exception as e:
+            failed.append(f"translations: {e}")
+        else:
+            for language in languages:
+                try:
+                    translation_service.translate_cv_content(cv, language)
+                    rendered.append(language)
+                except Exception as e:
+                    failed.append(f"{language}: {e}")
+    
+    message = f"Pre-rendered {', '.join(rendered) or 'nothing'} for {cv.get_full_name()}"
+    if failed:
+        message += f" (failed: {'; '.join(failed)})"
+    return message
+
+
+def translation_job_key(cv, language):
+    """Return the cache key of the in-flight translation job for a CV version and language."""
+    version = int(cv.updated_at.timestamp() * 1000000)
+    return f'translation_job:{cv.pk}:{version}:{language}'
+
+
+@shared_task
+def translate_cv_task(cv_id, language, job_key=None):
+    """
+    Background task to translate a CV into one language.
+    
+    Returns the translate_cv_content() result. When the translation fails
+    the single-flight entry ``job_key`` is removed, so the next request
+    starts a new job instead of attaching to the failed one.
+    
+    Args:
+        cv_id (int): ID of the CV to translate
+        language (str): Target language code
+        job_key (str): Cache key of the in-flight job entry
+    """
+    from .translation_service import TranslationService
+    
+    try:
+        cv = CV.objects.get(id=cv_id)
+        result = TranslationService().translate_cv_content(cv, language)
+    except CV.DoesNotExist:
+        result = {'error': f'CV with ID {cv_id} not found', 'translated': False}
     except Exception as e:
-        return f"Failed to generate PDF: {str(e)}"
+        result = {'error': f'Translation failed: {str(e)}', 'translated': False}
+    if job_key and not result.get('translated'):
+        cache.delete(job_key)
+    return result
 
 
 @shared_task
 def cleanup_old_logs_task():
     """
     Background task to cleanup old request logs.
-    Keeps only the last 1000 logs.
+    Keeps only the latest REQUEST_LOG_KEEP_LATEST logs, or when
+    REQUEST_LOG_RETENTION_DAYS is set, deletes logs older than that.
+    Rows are deleted in short primary-key batches.
     """
+    from django.utils import timezone
+    from datetime import timedelta
+    from .retention import purge_request_logs
+
     try:
-        total_logs = RequestLog.objects.count()
-        if total_logs > 1000:
-            # Delete logs older than 30 days, keeping only the latest 1000
-            logs_to_delete = RequestLog.objects.order_by('timestamp')[:total_logs - 1000]
-            deleted_count = logs_to_delete.count()
-            logs_to_delete.delete()
-            return f"Cleaned up {deleted_count} old logs. Total logs: {RequestLog.objects.count()}"
-        else:
-            return f"No cleanup needed. Total logs: {total_logs}"
+        retention_days = getattr(settings, 'REQUEST_LOG_RETENTION_DAYS', 0)
+        result = purge_request_logs(
+            before=timezone.now() - timedelta(days=retention_days) if retention_days else None,
+            keep_latest=None if retention_days else getattr(settings, 'REQUEST_LOG_KEEP_LATEST', 1000),
+            batch_size=getattr(settings, 'REQUEST_LOG_PURGE_BATCH_SIZE', 5000),
+            archive_dir=getattr(settings, 'REQUEST_LOG_ARCHIVE_DIR', '') or None,
+        )
+        if result.deleted:
+            return f"Cleaned up old logs: {result}"
+        return "No cleanup needed"
     except Exception as e:
         return f"Failed to cleanup logs: {str(e)}"
 
 
+@shared_task
+def maintain_log_partitions_task():
+    """
+    Background task to create upcoming request log partitions and drop expired ones.
+    This task is scheduled hourly via Celery Beat when partitioning is enabled.
+    """
+    from .partitions import maintain_partitions
+
+    try:
+        result = maintain_partitions()
+        return (f"Partitions maintained: {len(result['created'])} created, "
+                f"{len(result['dropped'])} dropped")
+    except Exception as e:
+        return f"Failed to maintain partitions: {str(e)}"
+
+
+@shared_task
+def rollup_request_logs_task():
+    """
+    Background task to fold new request logs into the per-minute/hour/day rollups.
+    This task is scheduled every minute via Celery Beat.
+    """
+    from .rollups import rollup_request_logs
+
+    try:
+        processed = rollup_request_logs()
+        return f"Rolled up {processed} request logs"
+    except Exception as e:
+        return f"Failed to roll up request logs: {str(e)}"
+
+
 @shared_task
 def send_daily_report_task():
     """
@@ -106,25 +243,27 @@ def send_daily_report_task():
     This task is scheduled to run daily via Celery Beat.
     """
     try:
+        from django.utils import timezone
+        from datetime import datetime, timedelta
+        from .rollups import count_requests
+
+        # Request counts are read from the rollups, which rollup_request_logs_task
+        # keeps current every minute, so the report cost does not grow with raw
+        # log volume.
         # Get statistics
         total_cvs = CV.objects.count()
-        total_logs = RequestLog.objects.count()
-        
-        # Get today's logs
-        from django.utils import timezone
-        from datetime import timedelta
         
         today = timezone.now().date()
-        today_logs = RequestLog.objects.filter(
-            timestamp__date=today
-        ).count()
+        today_start = timezone.make_aware(datetime.combine(today, datetime.min.time()))
+        today_logs = count_requests(today_start, today_start + timedelta(days=1))
+        total_logs = count_requests()
         
         subject = "Daily CV Project Report"
         message = f"""
         Daily Report for {today}:
         
         Total CVs: {total_cvs}
-        Total Request Logs: {total_logs}
+        Total Requests: {total_logs}
         Today's Requests: {today_logs}
         
         This is an automated daily report from the CV Project system.
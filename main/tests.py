@@ -3,14 +3,49 @@ from django.urls import reverse
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
-from .models import CV, RequestLog
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import BytesIO, StringIO
+import cProfile
+import gzip
+import os
+import pstats
+import tempfile
+import time
+import zipfile
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from .models import CV, CVTranslation, RequestLog, RequestMetricRollup, RequestProfile
+from .log_buffer import RequestLogBuffer
+from .logging_policy import RequestLogPolicy
+from .routers import TelemetryRouter
+from .partitions import get_partition_backend, maintain_partitions, partition_name, period_start
+from .metrics import MetricsRegistry, merge_snapshots, registry as metrics_registry, render_prometheus
+from .retention import purge_request_logs
+from .instrumentation import format_server_timing, span, track_request
+from . import pdf as pdf_module
+from .pdf import get_layout, render_cv_pdf, render_cv_pdf_file
+from .pdf_benchmark import compare_to_baseline, synthetic_cv
+from .pdf_bulk import iter_cv_pdfs, iter_pdf_zip, pdf_filename
+from .pdf_cache import get_cached_cv_pdf, get_cv_pdf
+from .profiling import SlowRequestProfiler, collapsed_stacks, load_stats
+from .pagination import InvalidCursor, decode_cursor, encode_cursor, paginate_keyset
+from .rollups import (
+    LATENCY_BUCKETS, count_requests, estimate_percentile, get_request_stats, latency_bucket,
+    rollup_request_logs
+)
 from .context_processors import settings_context
 from decouple import config
 from .tasks import (
     send_email_task, send_cv_notification_task, generate_cv_pdf_task,
-    cleanup_old_logs_task, send_daily_report_task, test_task, long_running_task
+    cleanup_old_logs_task, send_daily_report_task, test_task, long_running_task,
+    prerender_cv_pdf_task, translate_cv_task, translation_job_key
 )
-from .translation_service import TranslationService
+from .translation_service import TranslationService, estimate_tokens, split_text
 import json
 
 
@@ -133,6 +168,12 @@ class CVDetailViewTest(TestCase):
         self.assertIn('cv', response.context)
         self.assertEqual(response.context['cv'], self.cv)
 
+    def test_cv_detail_view_translates_in_background(self):
+        """Test that the translate modal starts a background job instead of translating inline."""
+        response = self.client.get(reverse('main:cv_detail', kwargs={'pk': self.cv.pk}))
+        self.assertContains(response, reverse('main:translation_job_create_api'))
+        self.assertNotContains(response, "fetch(`/api/translate-cv/`")
+
     def test_cv_detail_view_404(self):
         """Test CV detail view returns 404 for non-existent CV."""
         response = self.client.get(reverse('main:cv_detail', kwargs={'pk': 999}))
@@ -164,6 +205,8 @@ class CVPDFTest(TestCase):
     def setUp(self):
         """Set up test data."""
         self.client = Client()
+        self.pdf_cache_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(self.settings(PDF_CACHE_BACKEND='filesystem', PDF_CACHE_DIR=self.pdf_cache_dir))
         self.cv = CV.objects.create(
             firstname="John",
             lastname="Doe",
@@ -194,6 +237,83 @@ class CVPDFTest(TestCase):
         response = self.client.get(reverse('main:cv_pdf_download', kwargs={'pk': 999}))
         self.assertEqual(response.status_code, 404)
 
+    def test_cv_pdf_is_cached(self):
+        """Test that a second download is served from the PDF cache."""
+        url = reverse('main:cv_pdf_download', kwargs={'pk': self.cv.pk})
+        first = self.client.get(url)
+        with mock.patch('main.pdf_cache.render_cv_pdf') as render:
+            second = self.client.get(url)
+        render.assert_not_called()
+        self.assertEqual(first.getvalue(), second.getvalue())
+        self.assertEqual(len(os.listdir(self.pdf_cache_dir)), 1)
+
+    def test_cv_pdf_streamed_with_content_length(self):
+        """Test that PDFs are streamed from a file with an accurate Content-Length."""
+        url = reverse('main:cv_pdf_download', kwargs={'pk': self.cv.pk})
+        for _ in range(2):
+            # Rendered into a spooled file on the first request, the cached file on the second
+            response = self.client.get(url)
+            self.assertTrue(response.streaming)
+            content = response.getvalue()
+            self.assertTrue(content.startswith(b'%PDF'))
+            self.assertEqual(int(response['Content-Length']), len(content))
+            response.close()
+
+    def test_render_cv_pdf_file_spools_to_disk(self):
+        """Test that PDFs larger than PDF_SPOOL_MAX_SIZE are spooled to disk."""
+        with self.settings(PDF_SPOOL_MAX_SIZE=10):
+            with render_cv_pdf_file(self.cv) as handle:
+                self.assertTrue(handle._rolled)
+                self.assertTrue(handle.read().startswith(b'%PDF'))
+
+    def test_cv_pdf_conditional_requests(self):
+        """Test ETag/Last-Modified headers and 304 responses."""
+        url = reverse('main:cv_pdf_download', kwargs={'pk': self.cv.pk})
+        response = self.client.get(url)
+        etag = response['ETag']
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        # Editing the CV changes the ETag and replaces the cached file
+        self.cv.bio = "Updated developer biography"
+        self.cv.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(os.listdir(self.pdf_cache_dir)), 1)
+
+    def test_cv_pdf_layouts(self):
+        """Test that layouts are selected per request and cached separately."""
+        url = reverse('main:cv_pdf_download', kwargs={'pk': self.cv.pk})
+        modern = self.client.get(url)
+        compact = self.client.get(url, {'layout': 'compact'})
+        self.assertEqual(compact.status_code, 200)
+        self.assertTrue(compact.getvalue().startswith(b'%PDF'))
+        self.assertNotEqual(modern['ETag'], compact['ETag'])
+        self.assertEqual(len(os.listdir(self.pdf_cache_dir)), 2)
+        self.assertEqual(self.client.get(url, {'layout': 'fancy'}).status_code, 404)
+
+    def test_layout_styles_built_once(self):
+        """Test that layout styles are built on first use and then reused."""
+        layout = get_layout('compact')
+        with mock.patch('main.pdf.getSampleStyleSheet', wraps=pdf_module.getSampleStyleSheet) as sample:
+            layout._styles = None
+            render_cv_pdf(self.cv, 'compact')
+            render_cv_pdf(self.cv, 'compact')
+        self.assertEqual(sample.call_count, 1)
+
+    def test_django_cache_backend(self):
+        """Test the Django cache PDF backend."""
+        with self.settings(PDF_CACHE_BACKEND='cache'):
+            first = get_cv_pdf(self.cv)
+            with mock.patch('main.pdf_cache.render_cv_pdf') as render:
+                self.assertEqual(get_cv_pdf(self.cv), first)
+            render.assert_not_called()
+        self.assertEqual(os.listdir(self.pdf_cache_dir), [])
+
 
 class CVAPITest(APITestCase):
     """Test cases for CV REST API."""
@@ -437,6 +557,20 @@ class RequestLoggingMiddlewareTest(TestCase):
         self.assertEqual(log.user, user)
         self.assertTrue(log.is_authenticated)
 
+    def test_middleware_reads_user_id_from_session(self):
+        """Test that the user id is logged without querying the user table."""
+        user = User.objects.create_user(username='testuser', password='testpass123')
+        self.client.force_login(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('main:cv_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('auth_user' in query['sql'] for query in queries.captured_queries))
+
+        log = RequestLog.objects.get(path=reverse('main:cv_list'))
+        self.assertEqual(log.user_id, user.pk)
+        self.assertTrue(log.is_authenticated)
+
     def test_middleware_logs_anonymous_requests(self):
         """Test that middleware logs anonymous requests correctly."""
         # Make an anonymous request
@@ -471,6 +605,788 @@ class RequestLoggingMiddlewareTest(TestCase):
         self.assertEqual(log.response_status, 404)
 
 
+class RequestLogBufferTest(TestCase):
+    """Test cases for buffered request logging."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+
+    def make_log(self, path='/buffered/'):
+        """Build an unsaved RequestLog instance."""
+        return RequestLog(
+            method='GET',
+            path=path,
+            remote_ip='127.0.0.1',
+            response_status=200,
+            response_time=0.1
+        )
+
+    def test_buffer_flushes_at_batch_size(self):
+        """Test that the buffer writes all queued rows once the batch is full."""
+        buffer = RequestLogBuffer(batch_size=3, flush_interval=0)
+        buffer.add(self.make_log())
+        buffer.add(self.make_log())
+        self.assertEqual(RequestLog.objects.count(), 0)
+        self.assertEqual(len(buffer), 2)
+
+        buffer.add(self.make_log())
+        self.assertEqual(RequestLog.objects.count(), 3)
+        self.assertEqual(len(buffer), 0)
+
+    def test_buffer_manual_flush(self):
+        """Test that flush writes pending rows and reports how many were written."""
+        buffer = RequestLogBuffer(batch_size=100, flush_interval=0)
+        buffer.add(self.make_log())
+        self.assertEqual(buffer.flush(), 1)
+        self.assertEqual(buffer.flush(), 0)
+        self.assertEqual(RequestLog.objects.count(), 1)
+
+    def test_buffer_keeps_request_timestamp(self):
+        """Test that buffered rows keep the time they were created, not flushed."""
+        buffer = RequestLogBuffer(batch_size=100, flush_interval=0)
+        log = self.make_log()
+        created_at = log.timestamp
+        buffer.add(log)
+        buffer.flush()
+        self.assertEqual(RequestLog.objects.get().timestamp, created_at)
+
+    def test_middleware_buffers_when_enabled(self):
+        """Test that the middleware queues rows instead of inserting them."""
+        buffer = RequestLogBuffer(batch_size=100, flush_interval=0)
+        with self.settings(REQUEST_LOG_BUFFERED=True), \
+                mock.patch('main.middleware.get_request_log_buffer', return_value=buffer):
+            response = self.client.get(reverse('main:cv_list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(RequestLog.objects.count(), 0)
+        self.assertEqual(len(buffer), 1)
+
+        buffer.flush()
+        self.assertEqual(RequestLog.objects.get().path, '/')
+
+
+class RequestLogPolicyTest(TestCase):
+    """Test cases for the request logging policy."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.ok = type('MockResponse', (), {'status_code': 200})()
+        self.error = type('MockResponse', (), {'status_code': 500})()
+
+    def make_request(self, path):
+        """Build a minimal request object for the policy."""
+        return type('MockRequest', (), {'path': path, 'resolver_match': None})()
+
+    def test_excluded_prefixes_and_patterns(self):
+        """Test that excluded paths are never logged, even on errors."""
+        policy = RequestLogPolicy(exclude_paths=['/static/'], exclude_patterns=[r'\.ico$'])
+        self.assertFalse(policy.should_log(self.make_request('/static/app.css'), self.error, 0.1))
+        self.assertFalse(policy.should_log(self.make_request('/favicon.ico'), self.ok, 0.1))
+        self.assertTrue(policy.should_log(self.make_request('/cv/1/'), self.ok, 0.1))
+
+    def test_longest_prefix_sample_rate(self):
+        """Test that the longest matching prefix decides the sample rate."""
+        policy = RequestLogPolicy(sample_rates={'/api/': 0.5, '/api/v1/': 0.0})
+        self.assertEqual(policy.get_sample_rate(self.make_request('/api/cvs/')), 0.5)
+        self.assertEqual(policy.get_sample_rate(self.make_request('/api/v1/cvs/')), 0.0)
+        self.assertEqual(policy.get_sample_rate(self.make_request('/cv/1/')), 1.0)
+        self.assertFalse(policy.should_log(self.make_request('/api/v1/cvs/'), self.ok, 0.1))
+
+    def test_errors_and_slow_requests_bypass_sampling(self):
+        """Test that errors and slow requests are logged at a zero sample rate."""
+        policy = RequestLogPolicy(default_sample_rate=0.0, slow_threshold_ms=500)
+        request = self.make_request('/cv/1/')
+        self.assertFalse(policy.should_log(request, self.ok, 0.1))
+        self.assertTrue(policy.should_log(request, self.error, 0.1))
+        self.assertTrue(policy.should_log(request, self.ok, 0.6))
+
+    def test_adaptive_sampling_lowers_rate(self):
+        """Test that the sample rate drops once traffic exceeds the threshold."""
+        policy = RequestLogPolicy(adaptive_threshold=1, adaptive_window=10)
+        request = self.make_request('/cv/1/')
+        for _ in range(100):
+            policy.should_log(request, self.ok, 0.1)
+        with mock.patch('main.logging_policy.random.random', return_value=0.5):
+            self.assertFalse(policy.should_log(request, self.ok, 0.1))
+        with mock.patch('main.logging_policy.random.random', return_value=0.01):
+            self.assertTrue(policy.should_log(request, self.ok, 0.1))
+
+    def test_middleware_skips_excluded_paths(self):
+        """Test that the middleware does not log excluded paths."""
+        response = self.client.get(reverse('main:health_check'))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(RequestLog.objects.filter(path='/health/').exists())
+
+    def test_middleware_uses_url_name_sample_rate(self):
+        """Test that sample rates can be keyed by URL name."""
+        with self.settings(REQUEST_LOG_SAMPLE_RATES={'main:cv_list': 0.0}):
+            self.client.get(reverse('main:cv_list'))
+            self.client.get(reverse('main:settings'))
+        self.assertFalse(RequestLog.objects.filter(path='/').exists())
+        self.assertTrue(RequestLog.objects.filter(path='/settings/').exists())
+
+
+class TelemetryRouterTest(TestCase):
+    """Test cases for the telemetry database router."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.router = TelemetryRouter()
+
+    def test_default_alias_without_logs_database(self):
+        """Test that request logs stay on the default database by default."""
+        with self.settings(REQUEST_LOG_DATABASE='default'):
+            self.assertEqual(self.router.db_for_write(RequestLog), 'default')
+            self.assertTrue(self.router.allow_migrate('default', 'main', 'requestlog'))
+            self.assertIsNone(self.router.allow_migrate('default', 'main', 'cv'))
+
+    def test_request_logs_routed_to_logs_alias(self):
+        """Test that request log reads and writes go to the logs alias."""
+        with self.settings(REQUEST_LOG_DATABASE='logs'):
+            self.assertEqual(self.router.db_for_read(RequestLog), 'logs')
+            self.assertEqual(self.router.db_for_write(RequestLog), 'logs')
+            self.assertIsNone(self.router.db_for_read(CV))
+            self.assertIsNone(self.router.db_for_write(User))
+
+    def test_migrations_routed_to_logs_alias(self):
+        """Test that only telemetry tables are created on the logs alias."""
+        with self.settings(REQUEST_LOG_DATABASE='logs'):
+            self.assertTrue(self.router.allow_migrate('logs', 'main', 'requestlog'))
+            self.assertFalse(self.router.allow_migrate('default', 'main', 'requestlog'))
+            self.assertFalse(self.router.allow_migrate('logs', 'main', 'cv'))
+            self.assertFalse(self.router.allow_migrate('logs', 'auth', 'user'))
+            self.assertIsNone(self.router.allow_migrate('default', 'main', 'cv'))
+
+    def test_relation_between_log_and_user_allowed(self):
+        """Test that request logs may reference users on another database."""
+        user = User(username='testuser')
+        log = RequestLog(method='GET', path='/')
+        self.assertTrue(self.router.allow_relation(log, user))
+        self.assertIsNone(self.router.allow_relation(user, CV()))
+
+
+class RequestLogPartitionTest(TestCase):
+    """Test cases for time-partitioned request log storage."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.now = datetime(2026, 10, 17, 12, 0, tzinfo=dt_timezone.utc)
+
+    def test_period_start(self):
+        """Test that periods start at UTC midnight, and weeks on Monday."""
+        self.assertEqual(period_start(self.now, 'day'), datetime(2026, 10, 17, tzinfo=dt_timezone.utc))
+        self.assertEqual(period_start(self.now, 'week'), datetime(2026, 10, 12, tzinfo=dt_timezone.utc))
+        self.assertEqual(partition_name(datetime(2026, 10, 12, tzinfo=dt_timezone.utc)),
+                         'main_requestlog_p20261012')
+
+    def test_partitioning_disabled_by_default(self):
+        """Test that maintenance refuses to run without a partition period."""
+        with self.settings(REQUEST_LOG_PARTITION_PERIOD=''):
+            with self.assertRaises(ValueError):
+                maintain_partitions(now=self.now)
+
+    def test_sqlite_not_supported(self):
+        """Test that partitioning is refused on SQLite, where partitions would not be readable."""
+        with self.settings(REQUEST_LOG_PARTITION_PERIOD='day'):
+            with self.assertRaisesMessage(ValueError, 'not supported on sqlite'):
+                get_partition_backend()
+
+    def test_management_command(self):
+        """Test that the manage_log_partitions command reports unsupported databases."""
+        with self.settings(REQUEST_LOG_PARTITION_PERIOD='week'):
+            with self.assertRaisesMessage(CommandError, 'purge_request_logs'):
+                call_command('manage_log_partitions', retain=0, stdout=StringIO())
+
+
+class RequestMetricRollupTest(TestCase):
+    """Test cases for pre-aggregated request metric rollups."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        # Old enough to be past the rollup settle window
+        self.now = (timezone.now() - timedelta(minutes=10)).replace(second=30, microsecond=0)
+        for status_code, response_time in ((200, 0.02), (200, 0.2), (500, 3.0)):
+            self.make_log(status_code, response_time)
+
+    def make_log(self, status_code, response_time, path='/cv/1/'):
+        """Create a request log at the fixed test time."""
+        return RequestLog.objects.create(
+            timestamp=self.now,
+            method='GET',
+            path=path,
+            remote_ip='127.0.0.1',
+            response_status=status_code,
+            response_time=response_time
+        )
+
+    def test_histogram_helpers(self):
+        """Test latency bucketing and percentile estimation."""
+        self.assertEqual(latency_bucket(0.005), 0)
+        self.assertEqual(latency_bucket(0.006), 1)
+        self.assertEqual(latency_bucket(60), len(LATENCY_BUCKETS))
+        histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        histogram[latency_bucket(0.02)] = 9
+        histogram[latency_bucket(3.0)] = 1
+        self.assertEqual(estimate_percentile(histogram, 0.5), 0.025)
+        self.assertEqual(estimate_percentile(histogram, 0.99), 5.0)
+        self.assertIsNone(estimate_percentile([0] * len(histogram), 0.5))
+
+    def test_rollup_aggregates_all_granularities(self):
+        """Test that each log row is counted once per granularity."""
+        self.assertEqual(rollup_request_logs(), 3)
+        for granularity in ('minute', 'hour', 'day'):
+            rollups = RequestMetricRollup.objects.filter(granularity=granularity)
+            self.assertEqual(sum(r.request_count for r in rollups), 3)
+            self.assertEqual(sum(r.error_count for r in rollups), 1)
+        ok = RequestMetricRollup.objects.get(granularity='minute', response_status=200)
+        self.assertEqual(ok.bucket_start, self.now.replace(second=0))
+        self.assertAlmostEqual(ok.latency_sum, 0.22)
+        self.assertEqual(sum(ok.latency_buckets), 2)
+
+    def test_rollup_is_incremental(self):
+        """Test that a second run only folds in new rows."""
+        rollup_request_logs()
+        self.assertEqual(rollup_request_logs(), 0)
+
+        self.make_log(200, 0.05)
+        self.assertEqual(rollup_request_logs(batch_size=1), 1)
+        ok = RequestMetricRollup.objects.get(granularity='day', response_status=200)
+        self.assertEqual(ok.request_count, 3)
+        self.assertEqual(count_requests(), 4)
+
+    def test_rows_committed_late_are_counted(self):
+        """Test that a lower id committed after a rollup passed a higher one is still counted."""
+        rolled_up_at = timezone.now()
+        RequestLog.objects.create(
+            id=100, timestamp=self.now, method='GET', path='/cv/1/',
+            remote_ip='127.0.0.1', response_status=200, response_time=0.1
+        )
+        self.assertEqual(rollup_request_logs(now=rolled_up_at), 4)
+
+        # A flush that took id 50 before id 100 was written but committed later
+        RequestLog.objects.create(
+            id=50, timestamp=rolled_up_at - timedelta(seconds=30), method='GET', path='/cv/1/',
+            remote_ip='127.0.0.1', response_status=200, response_time=0.1
+        )
+        # Still inside the settle window, so it is not folded in yet
+        self.assertEqual(rollup_request_logs(now=rolled_up_at), 0)
+        self.assertEqual(rollup_request_logs(now=rolled_up_at + timedelta(minutes=5)), 1)
+        self.assertEqual(count_requests(), 5)
+
+    def test_request_stats(self):
+        """Test the summary computed from hourly rollups."""
+        rollup_request_logs()
+        stats = get_request_stats('hour', since=self.now - timedelta(hours=1), until=self.now + timedelta(hours=1))
+        self.assertEqual(stats['totals']['request_count'], 3)
+        self.assertEqual(stats['totals']['error_count'], 1)
+        self.assertEqual(stats['top_paths'][0]['path'], '/cv/1/')
+        self.assertEqual(len(stats['series']), 1)
+
+    def test_request_stats_api(self):
+        """Test the request stats API endpoint."""
+        rollup_request_logs()
+        response = self.client.get(reverse('main:request_stats_api') + '?granularity=minute&hours=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['totals']['request_count'], 3)
+
+        response = self.client.get(reverse('main:request_stats_api') + '?granularity=year')
+        self.assertEqual(response.status_code, 400)
+
+    def test_request_logs_page_shows_stats(self):
+        """Test that the logs page reads its statistics from the rollups."""
+        rollup_request_logs()
+        response = self.client.get(reverse('main:request_logs'))
+        self.assertEqual(response.context['stats']['totals']['request_count'], 3)
+
+
+class MetricsTest(TestCase):
+    """Test cases for in-process request metrics and the /metrics/ endpoint."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        metrics_registry.reset()
+
+    def tearDown(self):
+        """Clear metrics recorded by the test."""
+        metrics_registry.reset()
+
+    def test_registry_observe_and_render(self):
+        """Test counters and cumulative histogram buckets in the text output."""
+        registry = MetricsRegistry()
+        registry.observe('main:cv_list', 'GET', 200, 0.02)
+        registry.observe('main:cv_list', 'GET', 200, 3.0)
+        output = render_prometheus(registry.snapshot())
+        self.assertIn('http_requests_total{route="main:cv_list",method="GET",status="200"} 2', output)
+        self.assertIn('http_request_duration_seconds_bucket{route="main:cv_list",le="0.025"} 1', output)
+        self.assertIn('http_request_duration_seconds_bucket{route="main:cv_list",le="5.0"} 2', output)
+        self.assertIn('http_request_duration_seconds_count{route="main:cv_list"} 2', output)
+
+    def test_snapshots_merged_across_processes(self):
+        """Test that worker snapshots written to a shared directory are summed."""
+        first, second = MetricsRegistry(), MetricsRegistry()
+        first.observe('main:cv_list', 'GET', 200, 0.02)
+        second.observe('main:cv_list', 'GET', 200, 0.2)
+        second.observe('main:cv_detail', 'GET', 404, 0.01)
+        merged = merge_snapshots([first.snapshot(), second.snapshot()], len(LATENCY_BUCKETS) + 1)
+        self.assertIn(['main:cv_list', 'GET', '200', 2], merged['requests'])
+        self.assertEqual(merged['latency']['main:cv_list']['count'], 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+            with self.settings(METRICS_MULTIPROCESS_DIR=directory):
+                first.write()
+                self.assertEqual(len(os.listdir(directory)), 1)
+                collected = first.collect()
+        self.assertEqual(collected['latency']['main:cv_list']['count'], 1)
+
+    def test_middleware_records_route_names(self):
+        """Test that requests are labelled by URL name, not raw path."""
+        cv = CV.objects.create(
+            firstname="John",
+            lastname="Doe",
+            skills="Python",
+            projects="Web application",
+            bio="Experienced developer",
+            contacts="john.doe@email.com"
+        )
+        self.client.get(reverse('main:cv_detail', kwargs={'pk': cv.pk}))
+        self.client.get('/non-existent-page/')
+        response = self.client.get(reverse('main:metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        output = response.content.decode()
+        self.assertIn('route="main:cv_detail",method="GET",status="200"', output)
+        self.assertIn('route="<unmatched>",method="GET",status="404"', output)
+        self.assertNotIn(f'/cv/{cv.pk}/', output)
+
+
+class RequestLogRetentionTest(TestCase):
+    """Test cases for the batched request log retention engine."""
+
+    def setUp(self):
+        """Set up test data."""
+        now = timezone.now()
+        for days_ago in range(10):
+            RequestLog.objects.create(
+                timestamp=now - timedelta(days=days_ago),
+                method='GET',
+                path=f'/day-{days_ago}/',
+                remote_ip='127.0.0.1',
+                response_status=200,
+                response_time=0.1
+            )
+
+    def test_purge_by_time_in_batches(self):
+        """Test that rows older than the cutoff are deleted batch by batch."""
+        result = purge_request_logs(before=timezone.now() - timedelta(days=4, hours=12), batch_size=2)
+        self.assertEqual(result.deleted, 5)
+        self.assertEqual(result.batches, 3)
+        self.assertEqual(RequestLog.objects.count(), 5)
+        self.assertFalse(RequestLog.objects.filter(path='/day-5/').exists())
+
+    def test_purge_keep_latest(self):
+        """Test that only the newest rows are kept."""
+        result = purge_request_logs(keep_latest=3, batch_size=4)
+        self.assertEqual(result.deleted, 7)
+        self.assertEqual(sorted(RequestLog.objects.values_list('path', flat=True)),
+                         ['/day-0/', '/day-1/', '/day-2/'])
+
+    def test_purge_keep_latest_uses_timestamp_order(self):
+        """Test that rows inserted late with old timestamps are not kept over newer rows."""
+        RequestLog.objects.create(
+            timestamp=timezone.now() - timedelta(days=30), method='GET', path='/late-flush/',
+            remote_ip='127.0.0.1', response_status=200, response_time=0.1
+        )
+        purge_request_logs(keep_latest=2)
+        self.assertEqual(sorted(RequestLog.objects.values_list('path', flat=True)), ['/day-0/', '/day-1/'])
+
+    def test_purge_keep_latest_with_fewer_rows(self):
+        """Test that nothing is deleted when the table is smaller than keep_latest."""
+        self.assertEqual(purge_request_logs(keep_latest=1000).deleted, 0)
+        self.assertEqual(RequestLog.objects.count(), 10)
+
+    def test_purge_writes_archive_first(self):
+        """Test that deleted rows are archived as gzip JSON Lines."""
+        with tempfile.TemporaryDirectory() as directory:
+            result = purge_request_logs(keep_latest=8, batch_size=1, archive_dir=directory)
+            with gzip.open(result.archive_path, 'rt') as archive:
+                rows = [json.loads(line) for line in archive]
+        self.assertEqual(result.deleted, 2)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(sorted(row['path'] for row in rows), ['/day-8/', '/day-9/'])
+
+    def test_cleanup_task_keeps_latest(self):
+        """Test that the cleanup task uses the retention engine."""
+        with self.settings(REQUEST_LOG_RETENTION_DAYS=0, REQUEST_LOG_KEEP_LATEST=4):
+            result = cleanup_old_logs_task()
+        self.assertIn('Cleaned up old logs: Deleted 6 request logs', result)
+        self.assertEqual(RequestLog.objects.count(), 4)
+
+    def test_purge_command(self):
+        """Test the purge_request_logs management command."""
+        out = StringIO()
+        call_command('purge_request_logs', days=5, batch_size=100, stdout=out)
+        self.assertIn('Deleted 5 request logs', out.getvalue())
+
+
+class RequestLogExportTest(TestCase):
+    """Test cases for streaming request log exports."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.client.force_login(User.objects.create_user(username='staff', password='testpass123', is_staff=True))
+        now = timezone.now()
+        for days_ago, status_code, path in ((2, 200, '/cv/1/'), (1, 404, '/missing/'), (0, 500, '/api/cvs/')):
+            RequestLog.objects.create(
+                timestamp=now - timedelta(days=days_ago),
+                method='GET',
+                path=path,
+                remote_ip='127.0.0.1',
+                response_status=status_code,
+                response_time=0.1
+            )
+
+    def export(self, **params):
+        """Request an export and return the streamed body."""
+        response = self.client.get(reverse('main:request_log_export'), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        """Test CSV export with a header row."""
+        until = timezone.now().isoformat()
+        lines = self.export(format='csv', until=until).strip().splitlines()
+        self.assertTrue(lines[0].startswith('id,timestamp,method,path'))
+        self.assertEqual(len(lines), 4)
+
+    def test_ndjson_export_with_filters(self):
+        """Test NDJSON export filtered by status class and path prefix."""
+        rows = [json.loads(line) for line in self.export(format='ndjson', status='5xx').splitlines()]
+        self.assertEqual([row['path'] for row in rows], ['/api/cvs/'])
+
+        rows = self.export(format='ndjson', path='/cv/').splitlines()
+        self.assertEqual(len(rows), 1)
+
+    def test_export_time_range(self):
+        """Test that since/until restrict the exported rows."""
+        since = (timezone.now() - timedelta(days=1, hours=12)).isoformat()
+        until = timezone.now().isoformat()
+        rows = [json.loads(line) for line in self.export(format='ndjson', since=since, until=until).splitlines()]
+        self.assertEqual([row['response_status'] for row in rows], [404, 500])
+
+    def test_export_requires_staff(self):
+        """Test that anonymous and non-staff users cannot export request logs."""
+        url = reverse('main:request_log_export')
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(User.objects.create_user(username='visitor', password='testpass123'))
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+    def test_export_invalid_parameters(self):
+        """Test that bad parameters are rejected before streaming."""
+        url = reverse('main:request_log_export')
+        self.assertEqual(self.client.get(url, {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'status': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'since': 'yesterday'}).status_code, 400)
+
+    def test_export_command(self):
+        """Test the export_request_logs management command."""
+        out = StringIO()
+        call_command('export_request_logs', format='ndjson', status='404', stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([row['path'] for row in rows], ['/missing/'])
+
+
+class RequestLogKeysetPaginationTest(TestCase):
+    """Test cases for the filterable, keyset-paginated request log browser."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.now = timezone.now()
+        # Pairs of rows share a timestamp so paging has to break ties on id
+        for i in range(25):
+            RequestLog.objects.create(
+                timestamp=self.now - timedelta(minutes=i // 2),
+                method='POST' if i % 5 == 0 else 'GET',
+                path=f'/item/{i}/',
+                remote_ip='127.0.0.1',
+                response_status=200,
+                response_time=i / 10,
+                is_authenticated=i % 2 == 0,
+            )
+
+    def test_cursor_round_trip(self):
+        """Test that cursors decode to the encoded value and id."""
+        cursor = encode_cursor(self.now, 42)
+        self.assertEqual(decode_cursor(cursor, datetime_value=True), (self.now, 42))
+        with self.assertRaises(InvalidCursor):
+            decode_cursor('not-a-cursor')
+
+    def test_paginate_keyset_visits_every_row_once(self):
+        """Test that walking all pages returns each row once in newest-first order."""
+        queryset = RequestLog.objects.filter(path__startswith='/item/')
+        seen = []
+        cursor = None
+        while True:
+            page = paginate_keyset(queryset, 10, cursor=cursor)
+            seen.extend(page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len({log.pk for log in seen}), 25)
+        keys = [(log.timestamp, log.pk) for log in seen]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_view_next_page(self):
+        """Test that the view links to the next page with a cursor."""
+        response = self.client.get(reverse('main:request_logs'), {'path': '/item/'})
+        self.assertEqual(len(response.context['logs']), 10)
+        self.assertIn('next_page_query', response.context)
+
+        response = self.client.get(reverse('main:request_logs') + '?' + response.context['next_page_query'])
+        self.assertEqual(len(response.context['logs']), 10)
+        self.assertTrue(all(log.path.startswith('/item/') for log in response.context['logs']))
+
+    def test_view_filters(self):
+        """Test method, authentication and latency filters."""
+        url = reverse('main:request_logs')
+        response = self.client.get(url, {'path': '/item/', 'method': 'post'})
+        self.assertEqual(len(response.context['logs']), 5)
+
+        response = self.client.get(url, {'path': '/item/', 'authenticated': 'false', 'min_latency': '2000'})
+        self.assertEqual(
+            sorted(log.path for log in response.context['logs']),
+            ['/item/21/', '/item/23/']
+        )
+
+    def test_view_invalid_parameters(self):
+        """Test that bad cursors and filters return 404."""
+        url = reverse('main:request_logs')
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'status': 'abc'}).status_code, 404)
+
+    def test_api_pagination(self):
+        """Test the keyset-paginated request log API."""
+        url = reverse('main:request_log_list_api')
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(User.objects.create_user(username='staff', password='testpass123', is_staff=True))
+        response = self.client.get(url, {'path': '/item/', 'page_size': 20})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIsNotNone(response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next'])
+
+        self.assertEqual(self.client.get(url, {'cursor': 'garbage'}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'min_latency': 'slow'}).status_code, 400)
+
+
+class RequestInstrumentationTest(TestCase):
+    """Test cases for per-request query and template timings."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        CV.objects.create(
+            firstname='John', lastname='Doe', skills='Python',
+            projects='Project', bio='A developer bio.', contacts='john@example.com'
+        )
+
+    def test_track_request_counts_queries(self):
+        """Test that queries inside the block are counted and timed."""
+        with track_request() as stats:
+            list(CV.objects.all())
+            CV.objects.count()
+        self.assertEqual(stats.db_query_count, 2)
+        self.assertGreater(stats.db_time, 0)
+
+        # Queries outside the block are not counted
+        CV.objects.count()
+        self.assertEqual(stats.db_query_count, 2)
+
+    def test_middleware_records_timings(self):
+        """Test that logged requests carry query and template timings."""
+        self.client.get(reverse('main:cv_list'))
+        log = RequestLog.objects.get(path=reverse('main:cv_list'))
+        self.assertGreater(log.db_query_count, 0)
+        self.assertGreater(log.db_time, 0)
+        self.assertGreater(log.template_time, 0)
+
+    def test_sort_by_query_count(self):
+        """Test that the log API and page can sort by query count."""
+        for count in (3, 40, 7):
+            RequestLog.objects.create(
+                method='GET', path='/sorted/', remote_ip='127.0.0.1',
+                response_status=200, response_time=0.1, db_query_count=count
+            )
+        self.client.force_login(User.objects.create_user(username='staff', password='testpass123', is_staff=True))
+        response = self.client.get(
+            reverse('main:request_log_list_api'), {'path': '/sorted/', 'sort': 'db_query_count', 'page_size': 2}
+        )
+        self.assertEqual([row['db_query_count'] for row in response.data['results']], [40, 7])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([row['db_query_count'] for row in response.data['results']], [3])
+
+        response = self.client.get(reverse('main:request_logs'), {'path': '/sorted/', 'sort': 'db_query_count'})
+        self.assertEqual([log.db_query_count for log in response.context['logs']], [40, 7, 3])
+        self.assertEqual(self.client.get(reverse('main:request_logs'), {'sort': 'path'}).status_code, 404)
+
+
+class RequestProfileTest(TestCase):
+    """Test cases for the slow-request profiler."""
+
+    profile_settings = {
+        'REQUEST_PROFILING_ENABLED': True,
+        'REQUEST_PROFILE_SAMPLE_RATE': 1.0,
+        'REQUEST_PROFILE_THRESHOLD_MS': 0,
+        'REQUEST_PROFILE_VIEWS': [],
+    }
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.staff = User.objects.create_user('staff', password='secret', is_staff=True)
+
+    def test_sampling(self):
+        """Test that requests are only profiled when sampled and for listed views."""
+        request = mock.Mock(resolver_match=mock.Mock(view_name='main:cv_list'))
+        self.assertFalse(SlowRequestProfiler(enabled=False, sample_rate=1.0).should_profile(request))
+        self.assertFalse(SlowRequestProfiler(enabled=True, sample_rate=0.0).should_profile(request))
+        self.assertTrue(SlowRequestProfiler(enabled=True, sample_rate=1.0).should_profile(request))
+        profiler = SlowRequestProfiler(enabled=True, sample_rate=1.0, views=['main:cv_pdf_download'])
+        self.assertFalse(profiler.should_profile(request))
+
+    def test_slow_request_profile_is_stored(self):
+        """Test that a profiled request over the threshold stores a linked profile."""
+        with self.settings(**self.profile_settings):
+            self.client.get(reverse('main:cv_list'))
+        profile = RequestProfile.objects.get()
+        self.assertEqual(profile.request_log.path, '/')
+        self.assertIn('cumulative', profile.summary)
+        self.assertTrue(load_stats(profile.stats_data).stats)
+
+    def test_fast_request_profile_is_discarded(self):
+        """Test that profiles of requests under the threshold are dropped."""
+        with self.settings(**dict(self.profile_settings, REQUEST_PROFILE_THRESHOLD_MS=60000)):
+            self.client.get(reverse('main:cv_list'))
+        self.assertFalse(RequestProfile.objects.exists())
+        self.assertTrue(RequestLog.objects.filter(path='/').exists())
+
+    def test_profile_downloads(self):
+        """Test pstats and collapsed-stack downloads for staff users."""
+        with self.settings(**self.profile_settings):
+            self.client.get(reverse('main:cv_list'))
+        profile = RequestProfile.objects.get()
+
+        url = reverse('main:request_profile_download', args=[profile.pk, 'pstats'])
+        self.assertEqual(self.client.get(url).status_code, 302)
+
+        self.client.force_login(self.staff)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, bytes(profile.stats_data))
+
+        response = self.client.get(reverse('main:request_profile_download', args=[profile.pk, 'collapsed']))
+        lines = response.content.decode().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+
+        url = reverse('main:request_profile_download', args=[profile.pk, 'svg'])
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+    def test_collapsed_stacks_follow_call_graph(self):
+        """Test that collapsed stacks nest callees under their callers."""
+        def inner():
+            return sum(i * i for i in range(20000))
+
+        def outer():
+            return inner()
+
+        profiler = cProfile.Profile()
+        profiler.runcall(outer)
+        output = collapsed_stacks(pstats.Stats(profiler))
+        self.assertTrue(any(
+            'outer' in line and 'inner' in line and line.index('outer') < line.index('inner')
+            for line in output.splitlines()
+        ))
+
+    def test_purge_removes_profiles(self):
+        """Test that purging request logs also removes their profiles."""
+        log = RequestLog.objects.create(
+            method='GET', path='/slow/', remote_ip='127.0.0.1', response_status=200, response_time=2.0
+        )
+        RequestProfile.objects.create(request_log=log, duration=2.0, stats_data=b'')
+        purge_request_logs(before=timezone.now() + timedelta(minutes=1))
+        self.assertFalse(RequestProfile.objects.exists())
+
+
+class ServerTimingTest(TestCase):
+    """Test cases for the Server-Timing header and request traces."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.enterContext(self.settings(PDF_CACHE_BACKEND=''))
+        self.cv = CV.objects.create(
+            firstname='John', lastname='Doe', skills='Python',
+            projects='Project', bio='A developer bio.', contacts='john@example.com'
+        )
+
+    def test_spans_sum_per_phase(self):
+        """Test that spans are summed per phase and traced when sampled."""
+        with track_request(trace=True) as stats:
+            with span('external'):
+                pass
+            with span('external'):
+                pass
+            CV.objects.count()
+        self.assertIn('external', stats.phases)
+        self.assertEqual([entry['name'] for entry in stats.get_trace()['spans']], ['external', 'external', 'db'])
+
+        header = format_server_timing(stats, 0.01)
+        self.assertTrue(header.startswith('total;dur=10.0'))
+        self.assertIn('db;dur=', header)
+        self.assertIn('desc="1 queries"', header)
+
+        # Outside a request spans are ignored
+        with span('external'):
+            pass
+
+    def test_server_timing_header(self):
+        """Test that responses carry a Server-Timing header with the request phases."""
+        with self.settings(SERVER_TIMING_ENABLED=True):
+            response = self.client.get(reverse('main:cv_pdf_download', args=[self.cv.pk]))
+        header = response['Server-Timing']
+        for phase in ('total', 'view', 'middleware', 'db', 'pdf'):
+            self.assertIn(f'{phase};dur=', header)
+
+    def test_server_timing_disabled(self):
+        """Test that no header is sent when Server-Timing is disabled."""
+        with self.settings(SERVER_TIMING_ENABLED=False):
+            response = self.client.get(reverse('main:cv_list'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_sampled_trace_is_logged(self):
+        """Test that sampled requests store their spans in RequestLog.trace."""
+        with self.settings(REQUEST_TRACE_SAMPLE_RATE=1.0):
+            self.client.get(reverse('main:cv_detail', args=[self.cv.pk]))
+        log = RequestLog.objects.get(path=reverse('main:cv_detail', args=[self.cv.pk]))
+        names = {entry['name'] for entry in log.trace['spans']}
+        self.assertTrue({'db', 'template', 'view'} <= names)
+
+        with self.settings(REQUEST_TRACE_SAMPLE_RATE=0.0):
+            self.client.get(reverse('main:cv_list'))
+        self.assertIsNone(RequestLog.objects.get(path='/').trace)
+
+
 class ContextProcessorTest(TestCase):
     """Test cases for settings context processor."""
 
@@ -630,11 +1546,268 @@ class DockerSetupTest(TestCase):
         self.assertGreater(len(settings.SECRET_KEY), 0)
 
 
+class BackgroundPDFAPITest(TestCase):
+    """Test cases for background PDF generation, status polling and downloads."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.enterContext(self.settings(
+            PDF_CACHE_BACKEND='filesystem', PDF_CACHE_DIR=self.enterContext(tempfile.TemporaryDirectory())
+        ))
+        self.cv = CV.objects.create(
+            firstname='John', lastname='Doe', skills='Python',
+            projects='Project', bio='A developer bio.', contacts='john@example.com'
+        )
+        self.generate_url = reverse('main:cv_pdf_generate_api', args=[self.cv.pk])
+        self.download_url = reverse('main:cv_pdf_artifact_api', args=[self.cv.pk])
+
+    def test_enqueue_then_download(self):
+        """Test that a queued PDF can be downloaded once the task has run."""
+        with mock.patch('main.api_views.check_broker'), \
+                mock.patch('main.api_views.generate_cv_pdf_task.apply_async',
+                           return_value=mock.Mock(id='task-1')) as apply_async:
+            response = self.client.post(self.generate_url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['task_id'], 'task-1')
+        apply_async.assert_called_once_with(args=[self.cv.pk, None], retry=False)
+
+        # Nothing is rendered on the request path before the task runs
+        response = self.client.get(self.download_url)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()['status'], 'not_ready')
+
+        self.assertIn("PDF generated successfully", generate_cv_pdf_task(self.cv.pk))
+        response = self.client.get(self.download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.getvalue().startswith(b'%PDF'))
+
+        # Already rendered versions are not queued again
+        with mock.patch('main.api_views.generate_cv_pdf_task.apply_async') as apply_async:
+            response = self.client.post(self.generate_url)
+        apply_async.assert_not_called()
+        self.assertEqual(response.json()['status'], 'ready')
+
+    def test_task_status(self):
+        """Test polling a finished task returns its download URL."""
+        with mock.patch('main.api_views.check_broker'), \
+                mock.patch('main.api_views.generate_cv_pdf_task.apply_async',
+                           return_value=mock.Mock(id='task-2')):
+            self.client.post(self.generate_url, {'layout': 'compact'})
+        finished = mock.Mock(state='SUCCESS', result='PDF generated successfully')
+        finished.ready.return_value = True
+        with mock.patch('main.api_views.AsyncResult', return_value=finished):
+            response = self.client.get(reverse('main:pdf_task_status_api', args=['task-2']))
+        data = response.json()
+        self.assertTrue(data['ready'])
+        self.assertFalse(data['failed'])
+        self.assertTrue(data['download_url'].endswith(f'{self.download_url}?layout=compact'))
+
+    def test_task_status_failed(self):
+        """Test that a task that raised is reported as failed without a download URL."""
+        with mock.patch('main.api_views.check_broker'), \
+                mock.patch('main.api_views.generate_cv_pdf_task.apply_async',
+                           return_value=mock.Mock(id='task-3')):
+            self.client.post(self.generate_url)
+        failed = mock.Mock(state='FAILURE', result=ValueError('Unknown layout'))
+        failed.ready.return_value = True
+        with mock.patch('main.api_views.AsyncResult', return_value=failed):
+            response = self.client.get(reverse('main:pdf_task_status_api', args=['task-3']))
+        data = response.json()
+        self.assertFalse(data['ready'])
+        self.assertTrue(data['failed'])
+        self.assertEqual(data['error'], 'Unknown layout')
+        self.assertNotIn('download_url', data)
+
+    def test_broker_unavailable(self):
+        """Test that a missing broker returns 503 instead of hanging."""
+        with mock.patch('main.api_views.check_broker', side_effect=ConnectionError('Connection refused')):
+            response = self.client.post(self.generate_url)
+        self.assertEqual(response.status_code, 503)
+
+    def test_invalid_layout(self):
+        """Test that unknown layouts are rejected."""
+        self.assertEqual(self.client.post(self.generate_url, {'layout': 'fancy'}).status_code, 400)
+        self.assertEqual(self.client.get(self.download_url, {'layout': 'fancy'}).status_code, 400)
+
+
+class BulkPDFExportTest(TestCase):
+    """Test cases for bulk CV PDF export to ZIP."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.pdf_cache_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(self.settings(PDF_CACHE_BACKEND='filesystem', PDF_CACHE_DIR=self.pdf_cache_dir))
+        self.cvs = [
+            CV.objects.create(
+                firstname=f'User{i}', lastname='Doe', skills='Python',
+                projects='Project', bio='A developer bio.', contacts='user@example.com'
+            )
+            for i in range(3)
+        ]
+
+    def read_zip(self, data):
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+
+    def test_iter_pdf_zip_in_process_pool(self):
+        """Test that PDFs rendered in worker processes are streamed into a valid ZIP."""
+        data = b''.join(iter_pdf_zip(self.cvs, workers=2))
+        files = self.read_zip(data)
+        self.assertEqual(sorted(files), sorted(pdf_filename(cv) for cv in self.cvs))
+        for content in files.values():
+            self.assertTrue(content.startswith(b'%PDF'))
+        # Rendered PDFs are stored for later downloads
+        self.assertEqual(len(os.listdir(self.pdf_cache_dir)), 3)
+
+    def test_cached_pdfs_are_reused(self):
+        """Test that cached PDFs go into the ZIP without being rendered again."""
+        cached = get_cv_pdf(self.cvs[0])
+        with mock.patch('main.pdf.render_cv_pdf', return_value=b'%PDF-rendered') as render:
+            files = dict((cv.pk, data) for cv, data in iter_cv_pdfs(self.cvs, workers=1))
+        self.assertEqual(files[self.cvs[0].pk], cached)
+        self.assertEqual(render.call_count, 2)
+
+    def test_export_cv_pdfs_command(self):
+        """Test that the command writes the selected CVs to a ZIP file."""
+        output = os.path.join(self.pdf_cache_dir, 'cvs.zip')
+        out = StringIO()
+        ids = f'{self.cvs[0].pk},{self.cvs[2].pk}'
+        call_command('export_cv_pdfs', output, ids=ids, layout='compact', workers=1, stdout=out)
+        self.assertIn('Exported 2 CV PDFs', out.getvalue())
+        with open(output, 'rb') as handle:
+            files = self.read_zip(handle.read())
+        self.assertEqual(sorted(files), sorted(pdf_filename(cv) for cv in (self.cvs[0], self.cvs[2])))
+
+    def test_export_cv_pdfs_command_invalid_layout(self):
+        """Test that an unknown layout is rejected."""
+        with self.assertRaises(CommandError):
+            call_command('export_cv_pdfs', 'out.zip', layout='missing')
+
+    def test_admin_action_streams_zip(self):
+        """Test that the admin action streams a ZIP of the selected CVs."""
+        User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.login(username='admin', password='password')
+        response = self.client.post(reverse('admin:main_cv_changelist'), {
+            'action': 'download_pdfs',
+            '_selected_action': [cv.pk for cv in self.cvs[:2]],
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        with mock.patch('main.pdf_bulk.get_worker_count', return_value=1):
+            files = self.read_zip(b''.join(response.streaming_content))
+        self.assertEqual(len(files), 2)
+
+
+class PDFPrerenderTest(TestCase):
+    """Test cases for pre-rendering PDFs when a CV is saved."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.pdf_cache_dir = self.enterContext(tempfile.TemporaryDirectory())
+        self.enterContext(self.settings(
+            PDF_CACHE_BACKEND='filesystem', PDF_CACHE_DIR=self.pdf_cache_dir,
+            PDF_PRERENDER_ON_SAVE=True, PDF_PRERENDER_LAYOUTS=[], PDF_PRERENDER_LANGUAGES=[]
+        ))
+        self.enterContext(mock.patch('main.tasks.check_broker'))
+        self.apply_async = self.enterContext(mock.patch('main.tasks.prerender_cv_pdf_task.apply_async'))
+        self.addCleanup(cache.clear)
+
+    def create_cv(self):
+        return CV.objects.create(
+            firstname='John', lastname='Doe', skills='Python',
+            projects='Project', bio='A developer bio.', contacts='john@example.com'
+        )
+
+    def test_saves_are_coalesced(self):
+        """Test that each saved version is queued once and only the latest one renders."""
+        with self.captureOnCommitCallbacks(execute=True):
+            cv = self.create_cv()
+            cv.save()
+        self.apply_async.assert_called_once()
+        first_version = self.apply_async.call_args.kwargs['args'][1]
+        cv.bio = 'Second edit'
+        with self.captureOnCommitCallbacks(execute=True):
+            cv.save()
+        latest_version = int(cv.updated_at.timestamp() * 1000000)
+        self.apply_async.assert_called_with(args=[cv.pk, latest_version], countdown=10, retry=False)
+        self.assertEqual(self.apply_async.call_count, 2)
+
+        self.assertIn('Skipped', prerender_cv_pdf_task(cv.pk, first_version))
+        self.assertIsNone(get_cached_cv_pdf(cv))
+        self.assertIn('Pre-rendered modern', prerender_cv_pdf_task(cv.pk, latest_version))
+        self.assertIsNotNone(get_cached_cv_pdf(cv))
+
+    def test_disabled_by_default_setting(self):
+        """Test that nothing is queued when PDF_PRERENDER_ON_SAVE is off."""
+        with self.settings(PDF_PRERENDER_ON_SAVE=False):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.create_cv()
+        self.apply_async.assert_not_called()
+
+    def test_task_renders_latest_version(self):
+        """Test that a job without a version renders the current version into the cache."""
+        with self.captureOnCommitCallbacks(execute=True):
+            cv = self.create_cv()
+        cv.bio = 'Edited after the job was queued'
+        cv.save()
+
+        result = prerender_cv_pdf_task(cv.pk)
+        self.assertIn('Pre-rendered modern', result)
+        cv.refresh_from_db()
+        self.assertIsNotNone(get_cached_cv_pdf(cv))
+
+    def test_broker_down_does_not_block_save(self):
+        """Test that a failed enqueue is swallowed and retried on the next save."""
+        with mock.patch('main.tasks.check_broker', side_effect=ConnectionError('Connection refused')):
+            with self.captureOnCommitCallbacks(execute=True):
+                cv = self.create_cv()
+        self.apply_async.assert_not_called()
+        with self.captureOnCommitCallbacks(execute=True):
+            cv.save()
+        self.apply_async.assert_called_once()
+
+
+class PDFBenchmarkTest(TestCase):
+    """Test cases for the PDF rendering benchmark."""
+
+    def test_benchmark_command_writes_json(self):
+        """Test that the benchmark reports cold and warm results as JSON."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'bench.json')
+            call_command('benchmark_pdf', sizes='small', iterations=2, warmup=0, json=path, stdout=StringIO())
+            with open(path) as handle:
+                report = json.load(handle)
+        self.assertEqual([(r['size'], r['styles']) for r in report['results']], [('small', 'cold'), ('small', 'warm')])
+        for result in report['results']:
+            self.assertGreater(result['renders_per_sec'], 0)
+            self.assertGreater(result['output_bytes'], 0)
+            self.assertLessEqual(result['p50_ms'], result['p99_ms'])
+
+    def test_synthetic_cvs_are_reproducible(self):
+        """Test that synthetic CVs are deterministic and grow with size."""
+        self.assertEqual(synthetic_cv('medium').projects, synthetic_cv('medium').projects)
+        self.assertLess(len(synthetic_cv('small').skills), len(synthetic_cv('large').skills))
+
+    def test_compare_to_baseline(self):
+        """Test that throughput drops beyond the threshold are reported."""
+        baseline = {'results': [{'size': 'small', 'layout': 'modern', 'styles': 'warm', 'renders_per_sec': 100}]}
+        report = {'results': [{'size': 'small', 'layout': 'modern', 'styles': 'warm', 'renders_per_sec': 70}]}
+        self.assertEqual(len(compare_to_baseline(report, baseline, 0.2)), 1)
+        self.assertEqual(compare_to_baseline(report, baseline, 0.5), [])
+
+    def test_unknown_size(self):
+        """Test that unknown sizes are rejected."""
+        with self.assertRaises(CommandError):
+            call_command('benchmark_pdf', sizes='huge')
+
+
 class CeleryTasksTest(TestCase):
     """Test cases for Celery background tasks."""
 
     def setUp(self):
         """Set up test data."""
+        self.enterContext(self.settings(PDF_CACHE_DIR=self.enterContext(tempfile.TemporaryDirectory())))
         self.cv = CV.objects.create(
             firstname="John",
             lastname="Doe",
@@ -676,9 +1849,9 @@ class CeleryTasksTest(TestCase):
         self.assertIn("PDF generated successfully", result)
 
     def test_generate_cv_pdf_task_invalid_id(self):
-        """Test PDF generation task with invalid CV ID."""
-        result = generate_cv_pdf_task(999)
-        self.assertIn("CV with ID 999 not found", result)
+        """Test that the PDF generation task fails for an invalid CV ID."""
+        with self.assertRaises(CV.DoesNotExist):
+            generate_cv_pdf_task(999)
 
     def test_cleanup_old_logs_task(self):
         """Test log cleanup task."""
@@ -895,6 +2068,276 @@ class TranslationServiceTest(TestCase):
         self.assertIn('not supported', result['error'])
 
 
+class TranslationCacheTest(TestCase):
+    """Test cases for the section-level translation cache."""
+
+    def setUp(self):
+        """Set up test data and a fake OpenAI client."""
+        self.enterContext(self.settings(OPENAI_API_KEY='test-key'))
+        self.addCleanup(cache.clear)
+        cache.clear()
+        self.cv = CV.objects.create(
+            firstname="John", lastname="Doe", skills="Python, Django",
+            projects="Web application", bio="Experienced developer", contacts="john.doe@email.com"
+        )
+        self.service = TranslationService()
+        self.service.client = mock.Mock()
+        self.requests = []
+        self.service.client.chat.completions.create.side_effect = self.fake_completion
+
+    def fake_completion(self, model, messages, **kwargs):
+        prompt = messages[-1]['content']
+        sections = [s for s in ('name', 'bio', 'skills', 'projects', 'contacts') if f'"{s}"' in prompt]
+        self.requests.append(sections)
+        content = json.dumps({section: f'{section} in French' for section in sections})
+        return mock.Mock(choices=[mock.Mock(message=mock.Mock(content=content))])
+
+    def test_unchanged_sections_are_not_translated_again(self):
+        """Test that only edited sections are sent to OpenAI."""
+        first = self.service.translate_cv_content(self.cv, 'french')
+        self.assertTrue(first['translated'])
+        self.assertEqual(first['bio'], 'bio in French')
+        self.assertEqual(sorted(self.requests[0]), ['bio', 'contacts', 'name', 'projects', 'skills'])
+
+        self.assertEqual(self.service.translate_cv_content(self.cv, 'french'), first)
+        self.assertEqual(len(self.requests), 1)
+
+        self.cv.bio = "Edited biography"
+        self.cv.save()
+        self.service.translate_cv_content(self.cv, 'french')
+        self.assertEqual(self.requests[1], ['bio'])
+
+    def test_identical_text_is_shared_across_cvs(self):
+        """Test that another CV with the same text reuses the cached sections."""
+        self.service.translate_cv_content(self.cv, 'french')
+        other = CV.objects.create(
+            firstname="Jane", lastname="Doe", skills="Python, Django",
+            projects="Web application", bio="Experienced developer", contacts="jane.doe@email.com"
+        )
+        self.service.translate_cv_content(other, 'french')
+        self.assertEqual(sorted(self.requests[1]), ['contacts', 'name'])
+
+    def test_translation_table_is_second_tier(self):
+        """Test that sections survive a cache flush in the translation table."""
+        first = self.service.translate_cv_content(self.cv, 'french')
+        self.assertEqual(CVTranslation.objects.filter(cv=self.cv, language='french').count(), 5)
+        cache.clear()
+        self.assertEqual(self.service.translate_cv_content(self.cv, 'french'), first)
+        self.assertEqual(len(self.requests), 1)
+
+        # Rows of other CVs are reused and copied to the CV being translated
+        cache.clear()
+        other = CV.objects.create(
+            firstname="John", lastname="Doe", skills="Python, Django",
+            projects="Web application", bio="Experienced developer", contacts="john.doe@email.com"
+        )
+        self.service.translate_cv_content(other, 'french')
+        self.assertEqual(len(self.requests), 1)
+        self.assertEqual(other.translations.count(), 5)
+
+    def test_get_cv_translations(self):
+        """Test that all current languages of a CV are fetched in one query."""
+        self.service.translate_cv_content(self.cv, 'french')
+        self.service.translate_cv_content(self.cv, 'german')
+        with self.assertNumQueries(1):
+            translations = self.service.get_cv_translations(self.cv)
+        self.assertEqual(sorted(translations), ['french', 'german'])
+        self.assertEqual(translations['german']['bio'], 'bio in French')
+
+        # Languages with a stale section are left out until translated again
+        self.cv.skills = "Python, Go"
+        self.cv.save()
+        self.service.translate_cv_content(self.cv, 'french')
+        self.assertEqual(list(self.service.get_cv_translations(self.cv)), ['french'])
+        self.assertEqual(list(self.service.get_cv_translations(self.cv, ['german'])), [])
+
+    def test_languages_are_translated_concurrently(self):
+        """Test that several languages take about as long as one OpenAI call."""
+        def slow_completion(*args, **kwargs):
+            time.sleep(0.2)
+            return self.fake_completion(*args, **kwargs)
+        self.service.client.chat.completions.create.side_effect = slow_completion
+        languages = ['french', 'german', 'spanish', 'italian', 'japanese', 'korean']
+
+        started = time.perf_counter()
+        results = dict(self.service.translate_cv_languages(self.cv, languages + ['klingon'], max_workers=6))
+        self.assertLess(time.perf_counter() - started, 0.2 * len(languages) / 2)
+
+        self.assertEqual(sorted(results), sorted(languages + ['klingon']))
+        self.assertIn('not supported', results['klingon']['error'])
+        self.assertTrue(all(results[language]['translated'] for language in languages))
+        # Stored from the main thread, so the next batch makes no OpenAI calls
+        self.assertEqual(CVTranslation.objects.filter(cv=self.cv).count(), 5 * len(languages))
+        dict(self.service.translate_cv_languages(self.cv, languages))
+        self.assertEqual(len(self.requests), len(languages))
+
+    def test_failed_language_does_not_stop_others(self):
+        """Test that an OpenAI error is reported for its language only."""
+        def flaky_completion(model, messages, **kwargs):
+            if 'German' in messages[-1]['content']:
+                raise RuntimeError('Rate limit exceeded')
+            return self.fake_completion(model, messages, **kwargs)
+        self.service.client.chat.completions.create.side_effect = flaky_completion
+        results = dict(self.service.translate_cv_languages(self.cv, ['french', 'german'], max_workers=2))
+        self.assertTrue(results['french']['translated'])
+        self.assertIn('Rate limit exceeded', results['german']['error'])
+
+    def test_left_out_section_is_a_partial_failure(self):
+        """Test that a section the model keeps leaving out fails instead of coming back in English."""
+        def incomplete_completion(model, messages, **kwargs):
+            response = self.fake_completion(model, messages, **kwargs)
+            content = json.loads(response.choices[0].message.content)
+            content.pop('skills', None)
+            response.choices[0].message.content = json.dumps(content)
+            return response
+        self.service.client.chat.completions.create.side_effect = incomplete_completion
+
+        with self.settings(TRANSLATION_CHUNK_RETRIES=1):
+            result = self.service.translate_cv_content(self.cv, 'french')
+        self.assertFalse(result['translated'])
+        self.assertTrue(result['partial'])
+        self.assertEqual(result['missing_sections'], ['skills'])
+        # The retry asked for the left-out section only
+        self.assertEqual(self.requests[1], ['skills'])
+
+        # The other sections are kept, so the next attempt only sends the missing one
+        self.assertEqual(CVTranslation.objects.filter(cv=self.cv).count(), 4)
+        self.service.client.chat.completions.create.side_effect = self.fake_completion
+        self.requests.clear()
+        result = self.service.translate_cv_content(self.cv, 'french')
+        self.assertTrue(result['translated'])
+        self.assertEqual(self.requests, [['skills']])
+
+    def test_batch_api_streams_ndjson(self):
+        """Test that the batch endpoint streams one line per language."""
+        with mock.patch('main.views.TranslationService', return_value=self.service):
+            response = self.client.post(reverse('main:translate_cv_batch'), content_type='application/json',
+                                        data=json.dumps({'cv_id': self.cv.pk, 'languages': ['french', 'german']}))
+            self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+            lines = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(sorted(line['language'] for line in lines), ['french', 'german'])
+        self.assertTrue(all(line['status'] == 'success' for line in lines))
+
+        response = self.client.post(reverse('main:translate_cv_batch'), content_type='application/json',
+                                    data=json.dumps({'cv_id': self.cv.pk}))
+        self.assertEqual(response.status_code, 400)
+
+    def test_long_sections_are_chunked_and_reassembled(self):
+        """Test that long sections are split, translated in parallel and rebuilt in order."""
+        paragraphs = [f"Paragraph {i}. " + "Built and shipped features. " * 12 for i in range(6)]
+        self.cv.bio = '\n'.join(paragraphs)
+        self.cv.save()
+        prompts = []
+        failed = []
+
+        def echo_completion(model, messages, **kwargs):
+            prompt = messages[-1]['content']
+            prompts.append(prompt)
+            content = prompt.split('CV Content to translate:\n', 1)[1].rsplit('\n\nPlease ensure', 1)[0]
+            if 'Paragraph 3.' in content and not failed:
+                failed.append(True)
+                raise RuntimeError('Timeout')
+            if content.startswith('Bio: '):
+                return mock.Mock(choices=[mock.Mock(message=mock.Mock(content=json.dumps({'bio': content[5:].upper()})))])
+            return self.fake_completion(model, messages, **kwargs)
+        self.service.client.chat.completions.create.side_effect = echo_completion
+
+        with self.settings(TRANSLATION_CHUNK_TOKENS=200):
+            result = self.service.translate_cv_content(self.cv, 'french')
+        self.assertTrue(result['translated'])
+        self.assertEqual(result['bio'], self.cv.bio.upper())
+        bio_requests = [prompt for prompt in prompts if 'Bio: ' in prompt]
+        self.assertGreater(len(bio_requests), 2)
+        # Only the failed chunk was sent again
+        self.assertEqual(len([prompt for prompt in bio_requests if 'Paragraph 3.' in prompt]), 2)
+        self.assertEqual(len(prompts), len(set(prompts)) + 1)
+
+    def test_split_text(self):
+        """Test that text is split at paragraph and sentence boundaries under the budget."""
+        self.assertEqual(split_text('Short bio', 100), [('Short bio', '')])
+        text = '\n'.join(['First paragraph. ' * 20, 'Second paragraph.', 'Third. ' * 50])
+        pieces = split_text(text, 60)
+        self.assertTrue(all(estimate_tokens(piece) <= 60 for piece, _ in pieces))
+        self.assertEqual(
+            [line.strip() for line in ''.join(piece + separator for piece, separator in pieces).split('\n')],
+            [line.strip() for line in text.split('\n')]
+        )
+
+    def test_cache_key_depends_on_language_and_model(self):
+        """Test that languages and models do not share cached sections."""
+        key = self.service._section_hash('bio', 'Experienced developer', 'french')
+        self.assertNotEqual(key, self.service._section_hash('bio', 'Experienced developer', 'german'))
+        with self.settings(OPENAI_TRANSLATION_MODEL='gpt-4o-mini'):
+            self.assertNotEqual(key, self.service._section_hash('bio', 'Experienced developer', 'french'))
+
+
+class TranslationJobAPITest(TestCase):
+    """Test cases for background translation jobs."""
+
+    def setUp(self):
+        """Set up test data."""
+        self.client = Client()
+        self.addCleanup(cache.clear)
+        self.cv = CV.objects.create(
+            firstname="John", lastname="Doe", skills="Python, Django",
+            projects="Web application", bio="Experienced developer", contacts="john.doe@email.com"
+        )
+        self.url = reverse('main:translation_job_create_api')
+        self.enterContext(mock.patch('main.api_views.check_broker'))
+        self.apply_async = self.enterContext(mock.patch('main.api_views.translate_cv_task.apply_async'))
+
+    def post(self, language='french'):
+        return self.client.post(self.url, content_type='application/json',
+                                data=json.dumps({'cv_id': self.cv.pk, 'language': language}))
+
+    def test_identical_requests_share_one_job(self):
+        """Test that concurrent identical requests attach to the in-flight job."""
+        first = self.post()
+        self.assertEqual(first.status_code, 202)
+        self.assertFalse(first.json()['deduplicated'])
+        second = self.post()
+        self.assertEqual(second.json()['job_id'], first.json()['job_id'])
+        self.assertTrue(second.json()['deduplicated'])
+        self.apply_async.assert_called_once()
+        self.assertEqual(self.apply_async.call_args.kwargs['task_id'], first.json()['job_id'])
+
+        # Another language or a newer CV version starts a new job
+        self.assertNotEqual(self.post('german').json()['job_id'], first.json()['job_id'])
+        self.cv.bio = "Edited biography"
+        self.cv.save()
+        self.assertNotEqual(self.post().json()['job_id'], first.json()['job_id'])
+        self.assertEqual(self.apply_async.call_count, 3)
+
+    def test_broker_down(self):
+        """Test that an unreachable broker returns 503 and does not block later requests."""
+        with mock.patch('main.api_views.check_broker', side_effect=ConnectionError('Connection refused')):
+            self.assertEqual(self.post().status_code, 503)
+        self.assertFalse(self.post().json()['deduplicated'])
+
+    def test_invalid_requests(self):
+        """Test validation of the job request."""
+        self.assertEqual(self.post('klingon').status_code, 400)
+        response = self.client.post(self.url, content_type='application/json', data=json.dumps({'cv_id': 999, 'language': 'french'}))
+        self.assertEqual(response.status_code, 404)
+
+    def test_job_status(self):
+        """Test that the status endpoint returns the job result once done."""
+        result = mock.Mock(state='SUCCESS', result={'translated': True, 'bio': 'Bio'})
+        result.ready.return_value = True
+        with mock.patch('main.api_views.AsyncResult', return_value=result):
+            response = self.client.get(reverse('main:translation_job_status_api', args=['job-1']))
+        self.assertEqual(response.json()['result']['bio'], 'Bio')
+        self.assertTrue(response.json()['ready'])
+
+    def test_failed_task_releases_single_flight_entry(self):
+        """Test that a failed translation lets the next request start a new job."""
+        job_key = translation_job_key(self.cv, 'french')
+        cache.set(job_key, 'job-1')
+        result = translate_cv_task(self.cv.pk, 'french', job_key)
+        self.assertFalse(result['translated'])
+        self.assertIsNone(cache.get(job_key))
+
+
 class TranslationAPITest(TestCase):
     """Test cases for translation API."""
 
@@ -1,7 +1,229 @@
+import hashlib
+import math
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 import openai
 from django.conf import settings
-from django.core.cache import cache
+from django.core.cache import caches
 import json
+from .instrumentation import span
+from .models import CVTranslation
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of tokens in English text.
+    
+    Uses the rule of thumb of about four characters per token, which is
+    close enough for sizing requests without a tokenizer dependency.
+    """
+    return math.ceil(len(text) / 4)
+
+
+def _split_words(text, budget):
+    pieces = []
+    current = []
+    for word in text.split():
+        if current and estimate_tokens(' '.join(current + [word])) > budget:
+            pieces.append(' '.join(current))
+            current = []
+        current.append(word)
+    if current:
+        pieces.append(' '.join(current))
+    return pieces
+
+
+def split_text(text, budget):
+    """
+    Split text into pieces of at most ``budget`` estimated tokens.
+    
+    Pieces follow paragraph boundaries; paragraphs over the budget are cut
+    between sentences and, as a last resort, between words. Returns
+    (piece, separator) pairs where joining piece + separator in order
+    rebuilds the text (whitespace inside long paragraphs is normalized).
+    """
+    if estimate_tokens(text) <= budget:
+        return [(text, '')]
+    
+    units = []
+    for paragraph in text.split('\n'):
+        if estimate_tokens(paragraph) <= budget:
+            units.append((paragraph, '\n'))
+            continue
+        sentences = []
+        for sentence in re.split(r'(?<=[.!?])\s+', paragraph.strip()):
+            if estimate_tokens(sentence) <= budget:
+                sentences.append(sentence)
+            else:
+                sentences.extend(_split_words(sentence, budget))
+        units.extend((sentence, ' ') for sentence in sentences[:-1])
+        units.append((sentences[-1], '\n'))
+    
+    # Merge consecutive units while they fit in the budget
+    pieces = []
+    current, current_separator = units[0]
+    for unit, separator in units[1:]:
+        candidate = current + current_separator + unit
+        if estimate_tokens(candidate) > budget:
+            pieces.append((current, current_separator))
+            current = unit
+        else:
+            current = candidate
+        current_separator = separator
+    pieces.append((current, ''))
+    return pieces
+
+
+def pack_chunks(pieces, budget):
+    """
+    Group section pieces into requests of at most ``budget`` estimated tokens.
+    
+    ``pieces`` maps sections to their list of [piece, separator, ...]
+    entries. Whole sections that fit are packed together; each piece of a
+    split section gets a request of its own, since a request holds at most
+    one piece per section. Returns lists of (section, piece index) pairs.
+    """
+    chunks = []
+    current = []
+    size = 0
+    for section, section_pieces in pieces.items():
+        if len(section_pieces) > 1:
+            chunks.extend([(section, index)] for index in range(len(section_pieces)))
+            continue
+        tokens = estimate_tokens(section_pieces[0][0])
+        if current and size + tokens > budget:
+            chunks.append(current)
+            current = []
+            size = 0
+        current.append((section, 0))
+        size += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class _LanguageJob:
+    """
+    Translation state of one language of a CV.
+
+    Holds the sections already known (cached, stored or empty), the sections
+    still to translate split into pieces, the requests covering them and how
+    those requests ended.
+    """
+
+    def __init__(self, language, hashes):
+        self.language = language
+        # Source hash of every non-empty section
+        self.hashes = hashes
+        # Section texts of the result, filled in as they become known
+        self.result = {}
+        # Sections to write to the cache and the translation table
+        self.new_sections = {}
+        # Sections to send to OpenAI, with their source text
+        self.missing = {}
+        # [source piece, separator, translated piece] entries per missing section
+        self.pieces = {}
+        self.requests = []
+        self.remaining = 0
+        self.error = None
+        # Sections the model left out of its responses
+        self.left_out = set()
+
+    def plan(self, budget):
+        """Split the missing sections into requests of at most ``budget`` tokens and return them."""
+        self.pieces = {
+            section: [[piece, separator, None] for piece, separator in split_text(text, budget)]
+            for section, text in self.missing.items()
+        }
+        self.requests = [_ChunkRequest(self, chunk) for chunk in pack_chunks(self.pieces, budget)]
+        self.remaining = len(self.requests)
+        return self.requests
+
+    def request_finished(self, request):
+        """Record a request that will not be retried; return True once all requests are done."""
+        if request.left_out:
+            self.left_out.update(section for section, _ in request.chunk)
+        elif request.error is not None and self.error is None:
+            self.error = request.error
+        self.remaining -= 1
+        return not self.remaining
+
+    def translated_sections(self):
+        """Return the missing sections whose pieces were all translated, reassembled in order."""
+        return {
+            section: ''.join(translated + separator for _, separator, translated in section_pieces)
+            for section, section_pieces in self.pieces.items()
+            if all(piece[2] is not None for piece in section_pieces)
+        }
+
+
+class _ChunkRequest:
+    """One OpenAI request for some section pieces of a language, with its retry state."""
+
+    def __init__(self, job, chunk):
+        self.job = job
+        # (section, piece index) pairs
+        self.chunk = chunk
+        self.attempts = 0
+        self.error = None
+        self.left_out = False
+
+    @property
+    def language(self):
+        return self.job.language
+
+    def payload(self):
+        """Return the source pieces to translate as {section: text}."""
+        return {section: self.job.pieces[section][index][0] for section, index in self.chunk}
+
+    def completed(self, get_content, retries):
+        """Handle a finished attempt; return True when the request needs no retry."""
+        try:
+            content = get_content()
+        except Exception as e:
+            self.error = {'error': f'Translation failed: {str(e)}', 'translated': False}
+            self.left_out = False
+            succeeded = False
+        else:
+            succeeded = self.apply(content)
+        return succeeded or self.attempts > retries
+
+    def apply(self, content):
+        """
+        Store the translated pieces of a response; return False if it should be retried.
+        
+        Pieces the response left out stay in the request, so a retry only
+        sends those.
+        """
+        try:
+            translated = json.loads(content)
+        except json.JSONDecodeError:
+            self.error = {
+                'error': 'Failed to parse translation response',
+                'raw_response': content,
+                'translated': False
+            }
+            self.left_out = False
+            return False
+        if not isinstance(translated, dict):
+            translated = {}
+        left_out = []
+        for section, index in self.chunk:
+            value = translated.get(section)
+            if isinstance(value, str):
+                self.job.pieces[section][index][2] = value
+            else:
+                left_out.append((section, index))
+        self.chunk = left_out
+        self.left_out = bool(left_out)
+        if left_out:
+            self.error = {
+                'error': f"Translation response left out {', '.join(section for section, _ in left_out)}",
+                'translated': False
+            }
+            return False
+        self.error = None
+        return True
 
 
 class TranslationService:
@@ -98,6 +320,10 @@ class TranslationService:
         """
         Translate CV content to the specified language.
         
+        Each section is cached separately under a hash of its source text,
+        so only sections that changed since the last translation are sent
+        to OpenAI.
+        
         Args:
             cv: CV model instance
             target_language: Target language code
@@ -105,6 +331,63 @@ class TranslationService:
         Returns:
             dict: Translated CV content
         """
+        error = self._check_available(target_language)
+        if error:
+            return error
+        
+        try:
+            max_workers = getattr(settings, 'TRANSLATION_MAX_CONCURRENCY', 8)
+            for _, result in self._translate_languages(cv, [target_language], max_workers):
+                return result
+        except Exception as e:
+            return {
+                'error': f'Translation failed: {str(e)}',
+                'translated': False
+            }
+    
+    def translate_cv_languages(self, cv, target_languages, max_workers=None):
+        """
+        Translate CV content to several languages concurrently.
+        
+        Yields (language, result) pairs as each language finishes, where
+        result has the shape returned by translate_cv_content(). Cached and
+        stored sections of every language are looked up in one batch; the
+        OpenAI calls for the rest run in a thread pool of at most
+        ``max_workers`` (TRANSLATION_MAX_CONCURRENCY by default) threads.
+        
+        Args:
+            cv: CV model instance
+            target_languages: Target language codes
+            max_workers: Maximum number of concurrent OpenAI requests
+        """
+        languages = []
+        for language in dict.fromkeys(target_languages):
+            error = self._check_available(language)
+            if error:
+                yield language, error
+            else:
+                languages.append(language)
+        if not languages:
+            return
+        
+        max_workers = max_workers or getattr(settings, 'TRANSLATION_MAX_CONCURRENCY', 8)
+        finished = set()
+        try:
+            for language, result in self._translate_languages(cv, languages, max_workers):
+                finished.add(language)
+                yield language, result
+        except Exception as e:
+            # E.g. the cache or database failed; report the languages still pending
+            for language in languages:
+                if language in finished:
+                    continue
+                yield language, {
+                    'error': f'Translation failed: {str(e)}',
+                    'translated': False
+                }
+    
+    def _check_available(self, target_language):
+        """Return an error result if ``target_language`` cannot be translated, else None."""
         if not self.client:
             return {
                 'error': 'OpenAI API key not configured. Please set OPENAI_API_KEY in settings.',
@@ -122,25 +405,228 @@ class TranslationService:
                 'error': f'Language {target_language} not supported',
                 'translated': False
             }
+        return None
+    
+    def _translate_languages(self, cv, languages, max_workers):
+        """
+        Yield (language, result) for supported languages as they finish.
+        
+        Sections missing from the cache and the translation table are split
+        into requests under the TRANSLATION_CHUNK_TOKENS budget: short
+        sections are packed together, long ones are cut at paragraph (then
+        sentence) boundaries. The requests of every language run in parallel;
+        a failed request is retried up to TRANSLATION_CHUNK_RETRIES times on
+        its own, and the pieces of each section are reassembled in order.
+        Cache and database access stays in the calling thread; worker threads
+        only wait on OpenAI.
+        """
+        # Prepare CV content for translation
+        cv_content = self._prepare_cv_content(cv)
+        jobs = {
+            language: _LanguageJob(language, {
+                section: self._section_hash(section, text, language)
+                for section, text in cv_content.items() if text
+            })
+            for language in languages
+        }
+        
+        # Reuse sections whose source text was translated before, from the
+        # cache first and then from the translation table
+        cached_sections = self.cache.get_many([
+            self._cache_key(source_hash) for job in jobs.values() for source_hash in job.hashes.values()
+        ])
+        for job in jobs.values():
+            for section, text in cv_content.items():
+                key = self._cache_key(job.hashes[section]) if text else None
+                if not text:
+                    job.result[section] = text
+                elif key in cached_sections:
+                    job.result[section] = cached_sections[key]
+                else:
+                    job.missing[section] = text
+        
+        owned = set()
+        missing_hashes = [job.hashes[section] for job in jobs.values() for section in job.missing]
+        if missing_hashes:
+            stored, owned = self._fetch_stored_sections(cv, missing_hashes)
+            for job in jobs.values():
+                for section in list(job.missing):
+                    source_hash = job.hashes[section]
+                    if source_hash in stored:
+                        job.result[section] = job.new_sections[section] = stored[source_hash]
+                        del job.missing[section]
         
-        # Create cache key for this translation
-        cache_key = f'cv_translation_{cv.id}_{target_language}'
+        budget = getattr(settings, 'TRANSLATION_CHUNK_TOKENS', 500)
+        retries = getattr(settings, 'TRANSLATION_CHUNK_RETRIES', 2)
+        requests = []
+        for job in jobs.values():
+            requests.extend(job.plan(budget))
+        for language, job in jobs.items():
+            if not job.requests:
+                yield language, self._finish_language(cv, job, owned)
+        if not requests:
+            return
         
-        # Check if translation is cached
-        cached_translation = cache.get(cache_key)
-        if cached_translation:
-            return cached_translation
+        if max_workers == 1 or len(requests) == 1:
+            for request in requests:
+                while not request.completed(lambda: self._send_chunk(request), retries):
+                    pass
+                if request.job.request_finished(request):
+                    yield request.language, self._finish_language(cv, request.job, owned)
+            return
         
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(requests)))
         try:
-            # Prepare CV content for translation
-            cv_content = self._prepare_cv_content(cv)
-            
-            # Create translation prompt
-            prompt = self._create_translation_prompt(cv_content, target_language)
-            
-            # Call OpenAI API
+            futures = {executor.submit(self._send_chunk, request): request for request in requests}
+            while futures:
+                # Time spent waiting on OpenAI, measured in the request's thread
+                with span('external'):
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    request = futures.pop(future)
+                    if not request.completed(future.result, retries):
+                        # Retry only this request
+                        futures[executor.submit(self._send_chunk, request)] = request
+                        continue
+                    if request.job.request_finished(request):
+                        yield request.language, self._finish_language(cv, request.job, owned)
+        finally:
+            # Drop queued requests if the consumer stops early, e.g. a closed stream
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _send_chunk(self, request):
+        """Send one chunk request to OpenAI; runs in a worker thread."""
+        request.attempts += 1
+        return self._request_translation(request.payload(), request.language)
+    
+    def _finish_language(self, cv, job, owned):
+        """
+        Cache and store the new sections of a language and return its result.
+        
+        Fully translated sections are kept even if other requests failed, so
+        the next attempt only sends what is still missing. Sections the model
+        left out are reported as a partial failure rather than returned in
+        English.
+        """
+        translated = job.translated_sections()
+        job.result.update(translated)
+        job.new_sections.update(translated)
+        if job.new_sections:
+            self.cache.set_many(
+                {self._cache_key(job.hashes[section]): text for section, text in job.new_sections.items()},
+                getattr(settings, 'TRANSLATION_CACHE_TIMEOUT', None)
+            )
+            self._store_sections(cv, job.language, {
+                section: (job.hashes[section], text)
+                for section, text in job.new_sections.items() if job.hashes[section] not in owned
+            })
+        if job.error is not None:
+            return job.error
+        if job.left_out:
+            left_out = sorted(job.left_out)
+            return {
+                'error': f"Translation response left out: {', '.join(left_out)}",
+                'translated': False,
+                'partial': True,
+                'missing_sections': left_out,
+            }
+        
+        result = job.result
+        result['translated'] = True
+        result['language'] = self.LANGUAGES[job.language]
+        result['original_language'] = 'English'
+        return result
+    
+    @property
+    def model(self):
+        """OpenAI model used for translations."""
+        return getattr(settings, 'OPENAI_TRANSLATION_MODEL', 'gpt-3.5-turbo')
+    
+    @property
+    def cache(self):
+        """Cache holding translated sections."""
+        return caches[getattr(settings, 'TRANSLATION_CACHE_ALIAS', 'default')]
+    
+    def _section_hash(self, section, text, target_language):
+        """
+        Return the hash identifying one translated section.
+        
+        It covers the source text, section, language and model, so edited
+        text misses while identical text shared by several CVs is translated
+        once.
+        """
+        return hashlib.sha256('\0'.join((self.model, target_language, section, text)).encode('utf-8')).hexdigest()
+    
+    def _cache_key(self, source_hash):
+        return f'translation:{source_hash}'
+    
+    def _fetch_stored_sections(self, cv, source_hashes):
+        """
+        Look up translated sections in the translation table by source hash.
+        
+        Returns ({source_hash: translated_text}, hashes already stored for this CV).
+        """
+        stored = {}
+        owned = set()
+        rows = CVTranslation.objects.filter(source_hash__in=source_hashes).values_list(
+            'source_hash', 'translated_text', 'cv_id'
+        )
+        for source_hash, translated_text, cv_id in rows:
+            stored[source_hash] = translated_text
+            if cv_id == cv.pk:
+                owned.add(source_hash)
+        return stored, owned
+    
+    def _store_sections(self, cv, target_language, sections):
+        """Insert or replace this CV's rows for ``sections`` ({section: (source_hash, text)})."""
+        if not sections:
+            return
+        CVTranslation.objects.bulk_create(
+            [
+                CVTranslation(
+                    cv=cv, language=target_language, section=section,
+                    source_hash=source_hash, translated_text=text, model=self.model
+                )
+                for section, (source_hash, text) in sections.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['cv', 'language', 'section'],
+            update_fields=['source_hash', 'translated_text', 'model', 'updated_at'],
+        )
+    
+    def get_cv_translations(self, cv, languages=None):
+        """
+        Return the stored translations of a CV for several languages in one query.
+        
+        Only languages whose stored sections all match the CV's current text
+        are included, as {language: {section: translated_text}}.
+        """
+        cv_content = self._prepare_cv_content(cv)
+        rows = CVTranslation.objects.filter(cv_id=cv.pk).order_by()
+        if languages is not None:
+            rows = rows.filter(language__in=list(languages))
+        by_language = {}
+        for language, section, source_hash, translated_text in rows.values_list(
+            'language', 'section', 'source_hash', 'translated_text'
+        ):
+            text = cv_content.get(section)
+            if text and source_hash == self._section_hash(section, text, language):
+                by_language.setdefault(language, {})[section] = translated_text
+        
+        translations = {}
+        for language, sections in by_language.items():
+            if all(section in sections for section, text in cv_content.items() if text):
+                translations[language] = {
+                    section: sections.get(section, text) for section, text in cv_content.items()
+                }
+        return translations
+    
+    def _request_translation(self, cv_content, target_language):
+        """Send the sections in ``cv_content`` to OpenAI and return the raw response text."""
+        prompt = self._create_translation_prompt(cv_content, target_language)
+        with span('external'):
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=self.model,
                 messages=[
                     {
                         "role": "system",
@@ -154,35 +640,7 @@ class TranslationService:
                 max_tokens=2000,
                 temperature=0.3
             )
-            
-            # Parse the response
-            translated_content = response.choices[0].message.content
-            
-            # Parse the JSON response
-            try:
-                result = json.loads(translated_content)
-                result['translated'] = True
-                result['language'] = self.LANGUAGES[target_language]
-                result['original_language'] = 'English'
-                
-                # Cache the translation for 1 hour
-                cache.set(cache_key, result, 3600)
-                
-                return result
-                
-            except json.JSONDecodeError:
-                # If JSON parsing fails, return the raw text
-                return {
-                    'error': 'Failed to parse translation response',
-                    'raw_response': translated_content,
-                    'translated': False
-                }
-                
-        except Exception as e:
-            return {
-                'error': f'Translation failed: {str(e)}',
-                'translated': False
-            }
+        return response.choices[0].message.content
     
     def _prepare_cv_content(self, cv):
         """Prepare CV content for translation."""
@@ -195,27 +653,21 @@ class TranslationService:
         }
     
     def _create_translation_prompt(self, cv_content, target_language):
-        """Create the translation prompt for OpenAI."""
+        """Create the translation prompt for OpenAI; only the sections in ``cv_content`` are included."""
         language_name = self.LANGUAGES[target_language]
+        structure = ',\n'.join(f'    "{section}": "translated {section}"' for section in cv_content)
+        content = '\n'.join(f"{section.capitalize()}: {text}" for section, text in cv_content.items())
         
         return f"""
 Please translate the following CV content into {language_name}. 
 Return the result as a JSON object with the following structure:
 
 {{
-    "name": "translated name",
-    "bio": "translated bio",
-    "skills": "translated skills",
-    "projects": "translated projects", 
-    "contacts": "translated contacts"
+{structure}
 }}
 
 CV Content to translate:
-Name: {cv_content['name']}
-Bio: {cv_content['bio']}
-Skills: {cv_content['skills']}
-Projects: {cv_content['projects']}
-Contacts: {cv_content['contacts']}
+{content}
 
 Please ensure the translation maintains the professional tone and structure of the original CV.
-""" 
\ No newline at end of file
+"""
@@ -1,6 +1,6 @@
 from django.urls import path
-from .views import CVListView, CVDetailView, cv_pdf_download, RequestLogListView, settings_view, send_pdf_email_api, translate_cv_api, trigger_background_task, celery_tasks_view, health_check, root_view
-from .api_views import CVListCreateView, CVDetailView as CVDetailAPIView, cv_list_api, cv_detail_api
+from .views import CVListView, CVDetailView, cv_pdf_download, RequestLogListView, request_log_export, request_profile_download, settings_view, send_pdf_email_api, translate_cv_api, translate_cv_batch_api, trigger_background_task, celery_tasks_view, health_check, root_view, metrics_view
+from .api_views import CVListCreateView, CVDetailView as CVDetailAPIView, cv_list_api, cv_detail_api, request_stats_api, RequestLogListAPIView, cv_pdf_generate_api, pdf_task_status_api, cv_pdf_artifact_api, translation_job_create_api, translation_job_status_api
 
 app_name = 'main'
 
@@ -8,23 +8,38 @@ urlpatterns = [
     # Health check
     path('health/', health_check, name='health_check'),
     
+    # Prometheus metrics
+    path('metrics/', metrics_view, name='metrics'),
+    
     # Web URLs
     path('', CVListView.as_view(), name='cv_list'),
     path('cvs/', CVListView.as_view(), name='cv_list_alt'),
     path('cv/<int:pk>/', CVDetailView.as_view(), name='cv_detail'),
     path('cv/<int:pk>/pdf/', cv_pdf_download, name='cv_pdf_download'),
     path('logs/', RequestLogListView.as_view(), name='request_logs'),
+    path('logs/export/', request_log_export, name='request_log_export'),
+    path('logs/profiles/<int:pk>/<str:profile_format>/', request_profile_download, name='request_profile_download'),
     path('settings/', settings_view, name='settings'),
     path('api/send-pdf-email/', send_pdf_email_api, name='send_pdf_email'),
     path('api/translate-cv/', translate_cv_api, name='translate_cv'),
+    path('api/translate-cv/batch/', translate_cv_batch_api, name='translate_cv_batch'),
+    path('api/translate-cv/jobs/', translation_job_create_api, name='translation_job_create_api'),
+    path('api/translate-cv/jobs/<str:job_id>/', translation_job_status_api, name='translation_job_status_api'),
     path('trigger-task/', trigger_background_task, name='trigger_task'),
     path('celery-tasks/', celery_tasks_view, name='celery_tasks'),
     
     # API URLs
     path('api/cvs/', CVListCreateView.as_view(), name='cv_list_api'),
     path('api/cvs/<int:pk>/', CVDetailAPIView.as_view(), name='cv_detail_api'),
+    path('api/cvs/<int:pk>/pdf/', cv_pdf_generate_api, name='cv_pdf_generate_api'),
+    path('api/cvs/<int:pk>/pdf/download/', cv_pdf_artifact_api, name='cv_pdf_artifact_api'),
+    path('api/pdf-tasks/<str:task_id>/', pdf_task_status_api, name='pdf_task_status_api'),
     
     # Alternative function-based API URLs
     path('api/v1/cvs/', cv_list_api, name='cv_list_api_v1'),
     path('api/v1/cvs/<int:pk>/', cv_detail_api, name='cv_detail_api_v1'),
+    
+    # Request metrics API
+    path('api/stats/requests/', request_stats_api, name='request_stats_api'),
+    path('api/logs/', RequestLogListAPIView.as_view(), name='request_log_list_api'),
 ] 
\ No newline at end of file
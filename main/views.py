@@ -1,26 +1,29 @@
 from django.shortcuts import render, get_object_or_404
 from django.views.generic import ListView, DetailView
-from django.http import HttpResponse, JsonResponse
+from django.http import FileResponse, Http404, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.http import require_http_methods
 from django.template.loader import render_to_string
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.units import inch, cm
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY, TA_RIGHT
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from io import BytesIO
-from .models import CV, RequestLog
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from .models import CV, RequestLog, RequestProfile
 from .tasks import (
     send_email_task, send_cv_notification_task, generate_cv_pdf_task,
     cleanup_old_logs_task, send_daily_report_task, test_task, long_running_task
 )
 from .translation_service import TranslationService
+from .rollups import get_request_stats
+from .metrics import registry as metrics_registry, render_prometheus
+from .log_export import (
+    EXPORT_FORMATS, filter_request_logs, get_export_queryset, iter_export,
+    parse_log_filters, parse_log_sort
+)
+from .pagination import InvalidCursor, paginate_keyset
+from .profiling import collapsed_stacks, load_stats
+from .pdf import DEFAULT_LAYOUT, get_layout_choices
+from .pdf_cache import open_cv_pdf, pdf_etag
 import json
 from django.views.decorators.csrf import csrf_exempt
+from django.contrib.admin.views.decorators import staff_member_required
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
 
@@ -48,8 +51,9 @@ class CVDetailView(DetailView):
         return get_object_or_404(CV, pk=self.kwargs.get('pk'))
 
     def get_context_data(self, **kwargs):
-        """Add translation languages to context."""
+        """Add translation languages and PDF layouts to context."""
         context = super().get_context_data(**kwargs)
+        context['pdf_layouts'] = [choice for choice in get_layout_choices() if choice[0] != DEFAULT_LAYOUT]
         try:
             from .translation_service import TranslationService
             translation_service = TranslationService()
@@ -68,15 +72,88 @@ class CVDetailView(DetailView):
 
 
 class RequestLogListView(ListView):
-    """View to display recent request logs."""
+    """View to browse request logs with filters, sorting and keyset pagination."""
     model = RequestLog
     template_name = 'main/request_logs.html'
     context_object_name = 'logs'
-    paginate_by = 20
+    paginate_by = 10
 
     def get_queryset(self):
-        """Return the 10 most recent request logs."""
-        return RequestLog.objects.all().order_by('-timestamp')[:10]
+        """Return request logs matching the filters in the query string."""
+        try:
+            self.filters = parse_log_filters(self.request.GET)
+            self.sort = parse_log_sort(self.request.GET)
+            return filter_request_logs(RequestLog.objects.all(), **self.filters)
+        except ValueError as e:
+            raise Http404(str(e))
+
+    def paginate_queryset(self, queryset, page_size):
+        """Return the page after the ``cursor`` query parameter instead of an OFFSET page."""
+        try:
+            page = paginate_keyset(
+                queryset, page_size, cursor=self.request.GET.get('cursor'), order_field=self.sort
+            )
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return (None, page, page.object_list, page.has_next)
+
+    def get_context_data(self, **kwargs):
+        """Add filter values, the next page link and 24-hour request statistics."""
+        context = super().get_context_data(**kwargs)
+        page = context['page_obj']
+        if page.has_next:
+            params = self.request.GET.copy()
+            params['cursor'] = page.next_cursor
+            context['next_page_query'] = params.urlencode()
+        filters = self.request.GET.copy()
+        filters.pop('cursor', None)
+        context['filters'] = filters
+        context['filter_query'] = filters.urlencode()
+        context['sort'] = self.sort
+        context['stats'] = get_request_stats('hour')
+        return context
+
+
+@staff_member_required
+def request_log_export(request):
+    """Stream request logs as CSV or NDJSON, with the same filters as the logs page."""
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse({
+            'status': 'error',
+            'message': f'Unsupported format: {export_format}'
+        }, status=400)
+
+    try:
+        queryset = get_export_queryset(**parse_log_filters(request.GET))
+    except ValueError as e:
+        return JsonResponse({
+            'status': 'error',
+            'message': str(e)
+        }, status=400)
+
+    response = StreamingHttpResponse(iter_export(queryset, export_format),
+                                     content_type=EXPORT_FORMATS[export_format])
+    filename = f"request_logs_{timezone.now():%Y%m%d%H%M%S}.{export_format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@staff_member_required
+def request_profile_download(request, pk, profile_format):
+    """Download a stored request profile as pstats data or collapsed stacks."""
+    profile = get_object_or_404(RequestProfile, pk=pk)
+    if profile_format == 'pstats':
+        response = HttpResponse(bytes(profile.stats_data), content_type='application/octet-stream')
+        filename = f"request_profile_{profile.pk}.prof"
+    elif profile_format == 'collapsed':
+        response = HttpResponse(collapsed_stacks(load_stats(profile.stats_data)),
+                                content_type='text/plain; charset=utf-8')
+        filename = f"request_profile_{profile.pk}.folded"
+    else:
+        raise Http404(f"Unknown profile format: {profile_format}")
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
 
 
 def settings_view(request):
@@ -180,171 +257,40 @@ def celery_tasks_view(request):
     return render(request, 'main/celery_tasks.html')
 
 
-def generate_cv_pdf(cv):
-    """Generate modern, professional PDF for CV using ReportLab."""
-    # Create a file-like buffer to receive PDF data
-    buffer = BytesIO()
-
-    # Create the PDF object, using the file-like buffer as its "file."
-    doc = SimpleDocTemplate(buffer, pagesize=A4,
-                            leftMargin=1.8 * cm, rightMargin=1.8 * cm,
-                            topMargin=2 * cm, bottomMargin=1.5 * cm)
-
-    # Container for the 'Flowable' objects
-    story = []
-
-    # Get styles
-    styles = getSampleStyleSheet()
-
-    # Create modern custom styles with professional typography
-    name_style = ParagraphStyle(
-        'NameStyle',
-        parent=styles['Heading1'],
-        fontSize=28,
-        spaceAfter=5,
-        spaceBefore=0,
-        alignment=TA_LEFT,
-        textColor=colors.HexColor('#1a1a1a'),
-        fontName='Helvetica-Bold',
-        leading=32
-    )
-
-    title_style = ParagraphStyle(
-        'TitleStyle',
-        parent=styles['Normal'],
-        fontSize=14,
-        spaceAfter=20,
-        alignment=TA_LEFT,
-        textColor=colors.HexColor('#666666'),
-        fontName='Helvetica',
-        leading=16
-    )
-
-    contact_style = ParagraphStyle(
-        'ContactStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=3,
-        alignment=TA_RIGHT,
-        textColor=colors.HexColor('#333333'),
-        fontName='Helvetica',
-        leading=12
-    )
-
-    section_heading_style = ParagraphStyle(
-        'SectionHeading',
-        parent=styles['Heading2'],
-        fontSize=16,
-        spaceAfter=12,
-        spaceBefore=25,
-        textColor=colors.HexColor('#2c3e50'),
-        fontName='Helvetica-Bold',
-        leftIndent=0,
-        leading=18
-    )
-
-    content_style = ParagraphStyle(
-        'ContentStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=8,
-        alignment=TA_JUSTIFY,
-        textColor=colors.HexColor('#333333'),
-        fontName='Helvetica',
-        leading=14,
-        leftIndent=0
-    )
-
-    skills_style = ParagraphStyle(
-        'SkillsStyle',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=6,
-        alignment=TA_LEFT,
-        textColor=colors.HexColor('#34495e'),
-        fontName='Helvetica',
-        leading=14,
-        leftIndent=0
-    )
-
-    footer_style = ParagraphStyle(
-        'FooterStyle',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.HexColor('#95a5a6'),
-        alignment=TA_CENTER,
-        fontName='Helvetica',
-        leading=10
-    )
+def generate_cv_pdf(cv, layout=None):
+    """
+    Return the PDF download response for a CV, rendering it only on a cache miss.
 
-    # Header section with name, title, and contact info
-    # Create a table for the header layout
-    header_data = [
-        [
-            Paragraph(cv.get_full_name(), name_style),
-            Paragraph(cv.contacts.replace('\n', '<br/>'), contact_style)
-        ]
-    ]
-
-    header_table = Table(header_data, colWidths=[doc.width * 0.6, doc.width * 0.4])
-    header_table.setStyle(TableStyle([
-        ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-        ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-        ('RIGHTPADDING', (0, 0), (-1, -1), 0),
-        ('TOPPADDING', (0, 0), (-1, -1), 0),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-    ]))
-    story.append(header_table)
-
-    # Add professional title
-    story.append(Paragraph("Software Developer", title_style))
-
-    # Add decorative line
-    story.append(Spacer(1, 15))
-
-    # Professional Summary Section
-    story.append(Paragraph("Professional Summary", section_heading_style))
-    story.append(Paragraph(cv.bio.replace('\n', '<br/>'), content_style))
-
-    # Skills & Expertise Section
-    story.append(Paragraph("Technical Skills", section_heading_style))
-
-    # Format skills with bullet points for better readability
-    skills_list = [skill.strip() for skill in cv.skills.split(',')]
-    skills_text = " • ".join(skills_list)
-    story.append(Paragraph(skills_text, skills_style))
-
-    # Projects & Achievements Section
-    story.append(Paragraph("Projects & Achievements", section_heading_style))
-    story.append(Paragraph(cv.projects.replace('\n', '<br/>'), content_style))
-
-    # Add footer with metadata
-    story.append(Spacer(1, 20))
-    footer_text = f"Generated on {cv.updated_at.strftime('%B %d, %Y')} at {cv.updated_at.strftime('%H:%M')}"
-    story.append(Paragraph(footer_text, footer_style))
-
-    metadata_text = f"CV ID: {cv.pk} | Created: {cv.created_at.strftime('%b %d, %Y')} | Updated: {cv.updated_at.strftime('%b %d, %Y')}"
-    story.append(Paragraph(metadata_text, footer_style))
-
-    # Build PDF
-    doc.build(story)
-
-    # Get the value of the BytesIO buffer and write it to the response
-    pdf = buffer.getvalue()
-    buffer.close()
-
-    # Create HTTP response with PDF
-    response = HttpResponse(pdf, content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{cv.get_full_name()}_CV.pdf"'
-    return response
+    The PDF is streamed from the cached file or a spooled temporary file, and
+    FileResponse sets Content-Length from the file size.
+    """
+    return FileResponse(open_cv_pdf(cv, layout), as_attachment=True, filename=f"{cv.get_full_name()}_CV.pdf",
+                        content_type='application/pdf')
 
 
 def cv_pdf_download(request, pk):
-    """View to download CV as PDF."""
+    """
+    View to download CV as PDF.
+
+    Sends ETag and Last-Modified headers derived from the CV's updated_at, so
+    browsers revalidate with a conditional request and get a 304 without the
+    PDF being read or rendered. The ``layout`` query parameter picks one of
+    the registered PDF layouts.
+    """
     cv = get_object_or_404(CV, pk=pk)
-    return generate_cv_pdf(cv)
+    layout = request.GET.get('layout') or None
+    try:
+        etag = pdf_etag(cv, layout)
+    except ValueError as e:
+        raise Http404(str(e))
+    last_modified = int(cv.updated_at.timestamp())
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = generate_cv_pdf(cv, layout)
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
 
 
 @csrf_exempt
@@ -464,6 +410,75 @@ def translate_cv_api(request):
         })
 
 
+def _translation_line(language, result):
+    if result.get('translated') is True:
+        line = {
+            'language': language,
+            'status': 'success',
+            'message': f'CV translated to {result["language"]}',
+            'translation': result
+        }
+    else:
+        line = {
+            'language': language,
+            'status': 'error',
+            'message': result.get('error', 'Translation failed'),
+            'details': result
+        }
+    return json.dumps(line) + '\n'
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+def translate_cv_batch_api(request):
+    """
+    API endpoint to translate CV content into several languages concurrently.
+
+    Takes ``cv_id`` and ``languages`` (a list of codes, or "all") and streams
+    one NDJSON line per language, in the order the translations finish.
+    """
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'Invalid JSON data'
+        }, status=400)
+
+    cv_id = data.get('cv_id')
+    languages = data.get('languages')
+    if not cv_id or not languages:
+        return JsonResponse({
+            'status': 'error',
+            'message': 'CV ID and languages are required'
+        }, status=400)
+    if languages == 'all':
+        languages = list(TranslationService.LANGUAGES)
+    if not isinstance(languages, list) or not all(isinstance(language, str) for language in languages):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'languages must be a list of language codes or "all"'
+        }, status=400)
+
+    try:
+        cv = CV.objects.get(id=cv_id)
+    except (CV.DoesNotExist, ValueError, TypeError):
+        return JsonResponse({
+            'status': 'error',
+            'message': 'CV not found'
+        }, status=404)
+
+    translation_service = TranslationService()
+    lines = (
+        _translation_line(language, result)
+        for language, result in translation_service.translate_cv_languages(cv, languages)
+    )
+    response = StreamingHttpResponse(lines, content_type='application/x-ndjson')
+    # Let proxies pass each line through as soon as it is written
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 def health_check(request):
     """Simple health check endpoint for Railway."""
     return JsonResponse({
@@ -478,3 +493,11 @@ def root_view(request):
         'status': 'ok',
         'message': 'Django CV Project is running'
     })
+
+
+def metrics_view(request):
+    """Expose request counters and latency histograms in Prometheus text format."""
+    return HttpResponse(
+        render_prometheus(metrics_registry.collect()),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -2,6 +2,7 @@
 """
 Comprehensive Railway startup script with error handling
 """
+import glob
 import os
 import sys
 import subprocess
@@ -66,6 +67,12 @@ def main():
         print("❌ Migrations failed - stopping startup")
         sys.exit(1)
     
+    # Step 5b: Migrations for the separate request log database
+    if os.environ.get('LOGS_DATABASE_URL'):
+        if not run_command("python manage.py migrate --noinput --database logs", "Log Database Migrations"):
+            print("❌ Log database migrations failed - stopping startup")
+            sys.exit(1)
+    
     # Step 6: Setup database with sample data
     if not run_command("python manage.py setup_railway", "Database Setup"):
         print("⚠️ Database setup failed, but continuing...")
@@ -74,6 +81,21 @@ def main():
     if not run_command("python manage.py collectstatic --noinput", "Collect Static"):
         print("⚠️ Collect static failed, but continuing...")
     
+    # Step 7b: Empty the shared metrics directory, so snapshots written by
+    # workers of a previous run are not summed into the new counters
+    metrics_dir = os.environ.get('METRICS_MULTIPROCESS_DIR')
+    if metrics_dir:
+        print("\n=== Clearing Metrics Directory ===")
+        removed = 0
+        for pattern in ('metrics_*.json', '*.tmp'):
+            for path in glob.glob(os.path.join(metrics_dir, pattern)):
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError as e:
+                    print(f"⚠️ Could not remove {path}: {e}")
+        print(f"✅ Removed {removed} metrics snapshots from {metrics_dir}")
+    
     # Step 8: Start Gunicorn
     print("\n=== STARTING GUNICORN ===")
     port = os.environ.get('PORT', '8000')